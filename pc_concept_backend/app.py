@@ -3,8 +3,11 @@ from flask_cors import CORS
 from dotenv import load_dotenv
 import os
 import cloudinary
-from extensions import db, migrate
+from extensions import db, migrate, cache, metrics, replicas, init_statement_timeout
 from config import Config
+from serialization import init_json
+from replicas import READ_PRIMARY_HEADER, READ_PRIMARY_FOR_HEADER
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeout
 
 # Load environment variables from .env file
 load_dotenv()
@@ -16,20 +19,21 @@ def create_app():
     
     # Initialize database and migrations
     db.init_app(app)
+    init_statement_timeout(app)
     migrate.init_app(app, db)
+    replicas.init_app(app, db)  # GET requests read from REPLICA_DATABASE_URLS when set
+    cache.init_app(app)
+    init_json(app)
+    metrics.init_app(app)  # Server-Timing, request logs and GET /metrics
     
     # Configure CORS (allow frontend to access backend)
     CORS(app, resources={
      r"/*": {
-        "origins": [
-            "http://localhost:5173", 
-            "http://localhost:3000",
-            "http://127.0.0.1:5173",  # ✅ ADD THIS
-            "http://127.0.0.1:3000",
-            os.getenv('FRONTEND_URL', 'http://localhost:5173')   # ✅ ADD THIS
-        ],
+        "origins": app.config['CORS_ORIGINS'],
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"]
+            # Read-your-writes hint for cross-origin clients, see replicas.py
+            "allow_headers": ["Content-Type", "Authorization", READ_PRIMARY_HEADER],
+            "expose_headers": [READ_PRIMARY_FOR_HEADER]
         }
     })
     
@@ -51,12 +55,22 @@ def create_app():
     from routes.specifications import specs_bp
     from routes.reviews import reviews_bp
     from routes.blogs import blogs_bp
+    from routes.health import health_bp
     
     app.register_blueprint(products_bp, url_prefix='/products')
     app.register_blueprint(specs_bp, url_prefix='/specs')
     app.register_blueprint(reviews_bp, url_prefix='/reviews')
     app.register_blueprint(blogs_bp, url_prefix='/blogs')
     
+    # Health checks: /health (database round-trip + pool stats) and /health/ready
+    app.register_blueprint(health_bp, url_prefix='/health')
+    
+    # CLI: flask import-catalog, flask rebuild-review-stats
+    from catalog_import import import_catalog_command
+    from review_stats import rebuild_review_stats_command
+    app.cli.add_command(import_catalog_command)
+    app.cli.add_command(rebuild_review_stats_command)
+    
     # Root endpoint
     @app.route('/')
     def home():
@@ -71,10 +85,24 @@ def create_app():
             }
         }
     
-    # Health check endpoint (useful for deployment)
-    @app.route('/health')
-    def health():
-        return {"status": "healthy", "database": "connected"}, 200
+    # Shed load with a 503 instead of a 500 when the pool is exhausted
+    # (DB_POOL_TIMEOUT) or a query hits DB_STATEMENT_TIMEOUT_MS
+    @app.errorhandler(PoolTimeout)
+    def database_busy(e):
+        db.session.rollback()
+        return {"error": "Database busy, please retry"}, 503, {"Retry-After": "1"}
+    
+    @app.errorhandler(OperationalError)
+    def database_error(e):
+        db.session.rollback()
+        if getattr(e.orig, 'pgcode', None) == '57014':  # query_canceled (statement_timeout)
+            return {"error": "Query timed out"}, 503, {"Retry-After": "1"}
+        return {"error": "Database error"}, 500
+    
+    # Catalog cache hit/miss counters
+    @app.route('/cache/stats')
+    def cache_stats():
+        return cache.stats(), 200
     
     return app
 
@@ -0,0 +1,97 @@
+"""ASGI entry point: async catalog reads, everything else served by create_app()
+
+    uvicorn --factory asgi:create_asgi_app --host 0.0.0.0 --port 5000 --workers 4
+
+GET/HEAD requests to the read routes of products, specs, reviews and blogs
+are answered by a Quart app whose queries run on an async SQLAlchemy engine
+(asyncpg by default, see ASYNC_DATABASE_URL). A worker can therefore keep as
+many queries in flight as its pool allows, instead of one per thread. Every
+other request goes to the unchanged Flask app through a WSGI thread pool:
+writes, export, health, metrics and cache stats. URLs, JSON bodies, ETags
+and cache keys are the same either way.
+
+The async routes read from ASYNC_DATABASE_URL only (the primary unless it is
+pointed elsewhere). Read-replica routing and /metrics cover the Flask side.
+"""
+from a2wsgi import WSGIMiddleware
+from quart import Quart, request
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeout
+from werkzeug.exceptions import HTTPException
+from app import create_app
+from async_db import async_db
+from config import Config
+from serialization import init_json
+
+ASYNC_METHODS = ('GET', 'HEAD')
+
+
+class ReadPathDispatcher:
+    """Send requests for endpoints the async app implements to Quart, the rest to the WSGI app
+
+    Routing is decided by the Flask app's URL map, so a URL always resolves to
+    the same endpoint (e.g. /products/export stays an export, not a product
+    ID), and Quart only serves endpoints it has a view with the same name for.
+    """
+
+    def __init__(self, async_app, wsgi_app):
+        self.async_app = async_app
+        self.wsgi_app = WSGIMiddleware(wsgi_app)
+        self.routes = wsgi_app.url_map.bind('localhost')
+
+    def handles(self, scope):
+        if scope['method'] not in ASYNC_METHODS:
+            return False
+        try:
+            endpoint, _ = self.routes.match(scope['path'], scope['method'])
+        except HTTPException:
+            return False  # 404, 405 or a trailing-slash redirect: let Flask answer as it always has
+        return endpoint in self.async_app.view_functions
+
+    async def __call__(self, scope, receive, send):
+        # Lifespan events go to Quart, which disposes the async engine on shutdown
+        if scope['type'] == 'http' and not self.handles(scope):
+            await self.wsgi_app(scope, receive, send)
+        else:
+            await self.async_app(scope, receive, send)
+
+
+def create_asgi_app():
+    wsgi_app = create_app()
+
+    app = Quart(__name__, static_folder=None)
+    app.config.from_object(Config)
+    init_json(app)
+    async_db.init_app(app)
+
+    from routes.async_products import products_bp
+    from routes.async_specifications import specs_bp
+    from routes.async_reviews import reviews_bp
+    from routes.async_blogs import blogs_bp
+
+    app.register_blueprint(products_bp, url_prefix='/products')
+    app.register_blueprint(specs_bp, url_prefix='/specs')
+    app.register_blueprint(reviews_bp, url_prefix='/reviews')
+    app.register_blueprint(blogs_bp, url_prefix='/blogs')
+
+    # Same CORS answer flask-cors gives the Flask routes (preflights are still served by Flask)
+    @app.after_request
+    async def allow_origin(response):
+        origin = request.headers.get('Origin')
+        if origin and origin in app.config['CORS_ORIGINS']:
+            response.headers['Access-Control-Allow-Origin'] = origin
+            response.vary.add('Origin')
+        return response
+
+    # Same load-shedding responses as create_app()
+    @app.errorhandler(PoolTimeout)
+    async def database_busy(e):
+        return {"error": "Database busy, please retry"}, 503, {"Retry-After": "1"}
+
+    # asyncpg errors other than connection failures arrive as plain DBAPIError
+    @app.errorhandler(DBAPIError)
+    async def database_error(e):
+        if getattr(e.orig, 'pgcode', None) == '57014':  # query_canceled (statement_timeout)
+            return {"error": "Query timed out"}, 503, {"Retry-After": "1"}
+        return {"error": "Database error"}, 500
+
+    return ReadPathDispatcher(app, wsgi_app)
@@ -0,0 +1,115 @@
+"""Async SQLAlchemy engine and per-request sessions for the ASGI read paths
+
+The counterpart of extensions.db for asgi.py: async_db.session is an
+AsyncSession opened on first use in a request and closed at teardown, and
+async_db.paginate() / keyset_paginate() return the same shapes as
+Flask-SQLAlchemy's paginate() and pagination.keyset_paginate(), so the async
+views build identical responses. Statements are plain select()s over the
+same models. Nothing here is imported by the WSGI app, which therefore
+doesn't need Quart or an async driver installed.
+"""
+from math import ceil
+from quart import g
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from extensions import per_transaction_statement_timeout
+from pagination import keyset_condition, keyset_order, keyset_page
+
+
+class AsyncPagination:
+    """items / total / pages, as read from Flask-SQLAlchemy's Pagination"""
+
+    def __init__(self, items, total, per_page):
+        self.items = items
+        self.total = total
+        self.per_page = per_page
+
+    @property
+    def pages(self):
+        if not self.total:
+            return 0
+        return ceil(self.total / self.per_page)
+
+
+def returns_entities(stmt):
+    """True for select(Model), whose rows are unwrapped to instances like Model.query"""
+    descriptions = stmt.column_descriptions
+    return len(descriptions) == 1 and descriptions[0]['expr'] is descriptions[0]['entity']
+
+
+class AsyncDatabase:
+    """Async engine built from ASYNC_DATABASE_URL and ASYNC_ENGINE_OPTIONS"""
+
+    def __init__(self):
+        self.engine = None
+        self._sessions = None
+
+    def init_app(self, app):
+        url = app.config.get('ASYNC_DATABASE_URL')
+        if not url:
+            raise RuntimeError("The ASGI app needs DATABASE_URL or ASYNC_DATABASE_URL")
+        self.engine = create_async_engine(url, **app.config.get('ASYNC_ENGINE_OPTIONS', {}))
+        self._sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        # Same per-transaction statement_timeout as the sync engine behind PgBouncer
+        timeout = app.config.get('DB_STATEMENT_TIMEOUT_MS')
+        if app.config.get('DB_PGBOUNCER') and timeout:
+            per_transaction_statement_timeout(self.engine.sync_engine, timeout)
+
+        app.teardown_appcontext(self._close_session)
+        app.after_serving(self.engine.dispose)
+        app.extensions['async_db'] = self
+
+    @property
+    def is_postgres(self):
+        return self.engine.dialect.name == 'postgresql'
+
+    @property
+    def session(self):
+        """AsyncSession for the current request"""
+        if 'async_session' not in g:
+            g.async_session = self._sessions()
+        return g.async_session
+
+    async def _close_session(self, exc):
+        session = g.pop('async_session', None)
+        if session is not None:
+            await session.close()
+
+    async def fetch_all(self, stmt):
+        result = await self.session.execute(stmt)
+        if returns_entities(stmt):
+            return result.unique().scalars().all()
+        return result.all()
+
+    async def fetch_first(self, stmt):
+        rows = await self.fetch_all(stmt.limit(1))
+        return rows[0] if rows else None
+
+    async def count(self, stmt):
+        """COUNT(*) over stmt, as Query.count() does"""
+        subquery = stmt.order_by(None).subquery()
+        return (await self.session.execute(select(func.count()).select_from(subquery))).scalar()
+
+    async def paginate(self, stmt, page, per_page, count=True):
+        """LIMIT/OFFSET page of stmt plus (optionally) its total, like Query.paginate(error_out=False)"""
+        items = await self.fetch_all(stmt.limit(per_page).offset((page - 1) * per_page))
+        total = await self.count(stmt) if count else None
+        return AsyncPagination(items, total, per_page)
+
+    async def keyset_paginate(self, stmt, columns, cursor, per_page, descending=False, include_total=False):
+        """pagination.keyset_paginate() for select() statements; raises InvalidCursor the same way"""
+        result = {}
+        if include_total:
+            result['total'] = await self.count(stmt)
+
+        condition = keyset_condition(columns, cursor, descending)
+        if condition is not None:
+            stmt = stmt.where(condition)
+
+        rows = await self.fetch_all(stmt.order_by(*keyset_order(columns, descending)).limit(per_page + 1))
+        result['items'], result['next_cursor'] = keyset_page(rows, columns, per_page)
+        return result
+
+
+async_db = AsyncDatabase()
@@ -0,0 +1,63 @@
+"""Response cache and ETag decorators for the async read paths (asgi.py)
+
+Same behaviour as cache.cached() and etags.conditional(), but for Quart
+views. The cache is the WSGI app's ResponseCache, with the same keys, so the
+write routes' invalidations apply to both entry points.
+"""
+import asyncio
+from functools import wraps
+from quart import current_app, request
+from async_db import async_db
+from cache import MemoryBackend
+from etags import compute_etag, ordered_versions, table_versions_select
+from extensions import cache
+
+
+async def _cache_call(func, *args):
+    # Redis calls are blocking; keep them off the event loop
+    if isinstance(cache.backend, MemoryBackend):
+        return func(*args)
+    return await asyncio.to_thread(func, *args)
+
+
+def cached(key_func):
+    """Cache an async view's 200 JSON response under key_func(**view_kwargs)"""
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            key = key_func(**kwargs)
+            hit, body = await _cache_call(cache.get, key)
+            if hit:
+                return current_app.response_class(body, status=200, mimetype='application/json')
+
+            response = await current_app.make_response(await view(*args, **kwargs))
+            if response.status_code == 200:
+                await _cache_call(cache.set, key, await response.get_data())
+            return response
+        return wrapper
+    return decorator
+
+
+def conditional(*tables):
+    """Strong ETag + If-None-Match for an async view (tags match etags.conditional)"""
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            if not async_db.is_postgres:
+                return await view(*args, **kwargs)
+
+            rows = (await async_db.session.execute(table_versions_select(tables))).all()
+            etag = compute_etag(request.full_path, ordered_versions(rows, tables))
+
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = await current_app.make_response(await view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,110 @@
+# Requests/sec for the catalog read paths at 200 concurrent clients, WSGI
+# (create_app under gunicorn threads) vs ASGI (create_asgi_app under uvicorn).
+# Start both servers against the same database, then point this at them:
+#
+#   gunicorn -w 4 -k gthread --threads 32 -b 127.0.0.1:5000 'app:create_app()'
+#   uvicorn --factory asgi:create_asgi_app --workers 4 --port 5001
+#   python bench_asgi.py --target wsgi=http://127.0.0.1:5000 --target asgi=http://127.0.0.1:5001
+#
+# Each client is a keep-alive connection driven from one asyncio loop, so the
+# load generator itself isn't limited by threads. Set CACHE_TTL=0 on both
+# servers to measure the database path rather than the response cache.
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = [
+    '/products/?per_page=24&card_mode=true',
+    '/products/category/Laptops?card_mode=true',
+    '/products/filter?category=Components&card_mode=true',
+    '/reviews/?per_page=20',
+    '/reviews/filter?category=Laptops',
+    '/blogs/?per_page=10',
+    '/blogs/latest',
+    '/specs/?per_page=50',
+]
+
+
+async def read_response(reader):
+    """(status, keep_alive) after consuming one HTTP/1.1 response with a Content-Length body"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers.get('connection', '').lower() != 'close'
+
+
+async def client(host, port, paths, offset, deadline, results):
+    reader = writer = None
+    i = offset
+    while time.monotonic() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n'.encode())
+            status, keep_alive = await read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            status, keep_alive = 'error', False
+        results.append((status, time.perf_counter() - started))
+        if not keep_alive and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def run(url, paths, concurrency, duration):
+    parts = urlsplit(url)
+    results = []
+    deadline = time.monotonic() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        client(parts.hostname, parts.port or 80, paths, n, deadline, results) for n in range(concurrency)
+    ])
+    return results, time.perf_counter() - started
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare WSGI and ASGI throughput on the read paths')
+    parser.add_argument('--target', action='append', required=True, help='name=base_url (repeatable)')
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=20, help='Seconds per target')
+    parser.add_argument('--warmup', type=float, default=3, help='Seconds of unmeasured load per target')
+    parser.add_argument('--path', action='append', help='Endpoint to hit (repeatable)')
+    args = parser.parse_args()
+
+    paths = args.path or DEFAULT_PATHS
+    print(f'{args.concurrency} concurrent clients, {args.duration:g}s per target, {len(paths)} endpoints\n')
+    print(f'{"target":<10} {"req/s":>9} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}  statuses')
+    for target in args.target:
+        name, url = target.split('=', 1)
+        if args.warmup:
+            asyncio.run(run(url, paths, args.concurrency, args.warmup))
+        results, elapsed = asyncio.run(run(url, paths, args.concurrency, args.duration))
+        latencies = sorted(e for s, e in results if s == 200)
+        statuses = Counter(s for s, _ in results)
+        print(f'{name:<10} {statuses.get(200, 0) / elapsed:9,.1f} '
+              f'{percentile(latencies, 0.50) * 1000:8.1f} {percentile(latencies, 0.95) * 1000:8.1f} '
+              f'{percentile(latencies, 0.99) * 1000:8.1f}  '
+              + ' '.join(f'{k}={v}' for k, v in sorted(statuses.items(), key=str)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# Per-row serialization cost for a 100-item listing page, before and after
+# the orjson provider + row serializers. No database needed: rows are built
+# in memory, so this measures only dict building and JSON encoding.
+#
+#   python bench_serialization.py
+#   python bench_serialization.py --rows 100 --repeat 2000
+
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+from flask import Flask
+from models import Product, ProductSpecification, Review
+from routes.products import serialize_product
+from routes.reviews import REVIEW_COLUMNS, serialize_review, serialize_review_row
+from serialization import OrjsonProvider, StdlibProvider
+
+
+def make_reviews(n):
+    started = datetime(2025, 1, 1, 12, 0, 0, 123456)
+    return [
+        Review(review_id=i, product_id=f'P{i:03d}', user_alias=f'user{i}',
+               review_text='Solid build quality, fast shipping and the fans stay quiet under load. ' * 3,
+               category='Laptops', subcategory=None, brand='ACER',
+               date_posted=started + timedelta(minutes=i))
+        for i in range(n)
+    ]
+
+
+def make_products(n):
+    products = []
+    for i in range(n):
+        product = Product(product_id=f'P{i:03d}', name=f'Gaming Laptop {i}', brand='ASUS',
+                          category='Laptops', subcategory=None, price=Decimal('1299.99'),
+                          image_url=f'https://res.cloudinary.com/demo/image/upload/v1/products/p{i}.jpg')
+        product.specifications = [
+            ProductSpecification(product_id=product.product_id, spec_name=f'spec{j}', spec_value=f'value {j}')
+            for j in range(8)
+        ]
+        products.append(product)
+    return products
+
+
+def per_row_us(func, rows, repeat):
+    seconds = min(timeit.repeat(func, number=repeat, repeat=5))
+    return seconds / repeat / rows * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark listing serialization')
+    parser.add_argument('--rows', type=int, default=100, help='Items per page')
+    parser.add_argument('--repeat', type=int, default=1000, help='Pages encoded per timing run')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    stdlib, fast = StdlibProvider(app), OrjsonProvider(app)
+
+    reviews = make_reviews(args.rows)
+    review_tuples = [tuple(getattr(r, c.key) for c in REVIEW_COLUMNS) for r in reviews]
+    products = make_products(args.rows)
+
+    cases = [
+        ('reviews: ORM + strftime + stdlib json',
+         lambda: stdlib.dumps({'reviews': [serialize_review(r) for r in reviews]})),
+        ('reviews: row tuples + orjson',
+         lambda: fast.dumps({'reviews': [serialize_review_row(r) for r in review_tuples]})),
+        ('products (full): stdlib json',
+         lambda: stdlib.dumps({'products': [serialize_product(p) for p in products]})),
+        ('products (full): orjson',
+         lambda: fast.dumps({'products': [serialize_product(p) for p in products]})),
+    ]
+
+    # Both paths must produce the same document
+    assert json.loads(cases[0][1]()) == json.loads(cases[1][1]())
+
+    print(f'{args.rows} rows per page, best of 5 x {args.repeat} pages\n')
+    for label, func in cases:
+        print(f'{label:<42} {per_row_us(func, args.rows, args.repeat):8.2f} µs/row')
+
+
+if __name__ == '__main__':
+    main()
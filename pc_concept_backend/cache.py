@@ -0,0 +1,223 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """Per-process size-bounded (LRU) TTL store"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the stored value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisBackend:
+    """Store shared by every worker through a Redis-protocol server
+
+    Entry count is bounded by the server's maxmemory / eviction policy
+    (allkeys-lru is recommended), not by CACHE_MAX_ENTRIES. Connection errors
+    are logged and treated as misses so an unavailable cache never fails a request.
+    """
+
+    def __init__(self, url=None, client=None, namespace='pcconcept:'):
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("CACHE_BACKEND='redis' requires the 'redis' package")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.namespace = namespace
+
+    def get(self, key):
+        try:
+            return self.client.get(self.namespace + key)
+        except Exception as e:
+            logger.warning("Cache get failed: %s", e)
+            return None
+
+    def set(self, key, value, ttl):
+        try:
+            self.client.set(self.namespace + key, value, ex=ttl)
+        except Exception as e:
+            logger.warning("Cache set failed: %s", e)
+
+    def delete(self, *keys):
+        try:
+            self.client.delete(*[self.namespace + k for k in keys])
+        except Exception as e:
+            logger.warning("Cache delete failed: %s", e)
+
+    def delete_prefix(self, prefix):
+        try:
+            keys = list(self.client.scan_iter(match=self._escape(self.namespace + prefix) + '*', count=500))
+            if keys:
+                self.client.delete(*keys)
+        except Exception as e:
+            logger.warning("Cache delete_prefix failed: %s", e)
+
+    def clear(self):
+        self.delete_prefix('')
+
+    def size(self):
+        return None  # Counting a shared namespace would need a full SCAN
+
+    @staticmethod
+    def _escape(pattern):
+        """Escape glob metacharacters so the prefix is matched literally"""
+        for ch in '\\*?[]':
+            pattern = pattern.replace(ch, '\\' + ch)
+        return pattern
+
+
+class ResponseCache:
+    """TTL cache for serialized JSON responses with a pluggable backend
+
+    Stores the encoded body of 200 responses so a hit skips both the database
+    and serialization. Write routes invalidate the keys they affect. The
+    backend is chosen by CACHE_BACKEND: 'memory' (per process) or 'redis'
+    (shared across gunicorn workers, so invalidations reach all of them).
+    """
+
+    def __init__(self, app=None, backend=None, ttl=60):
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('CACHE_TTL', self.ttl)
+        backend = app.config.get('CACHE_BACKEND', 'memory')
+        if backend == 'redis':
+            self.backend = RedisBackend(
+                url=app.config.get('CACHE_REDIS_URL'),
+                namespace=app.config.get('CACHE_KEY_PREFIX', 'pcconcept:')
+            )
+        elif backend == 'memory':
+            self.backend = MemoryBackend(app.config.get('CACHE_MAX_ENTRIES', 1024))
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+        app.extensions['response_cache'] = self
+
+    def get(self, key):
+        """Return (hit, value)"""
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, value
+
+    def set(self, key, value):
+        if self.ttl <= 0:
+            return
+        self.backend.set(key, value, self.ttl)
+
+    def delete(self, *keys):
+        self.backend.delete(*keys)
+
+    def delete_prefix(self, prefix):
+        self.backend.delete_prefix(prefix)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        """Hit/miss counters for this worker plus backend details"""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": self.backend.size(),
+            "ttl": self.ttl
+        }
+
+    def cached(self, key_func):
+        """Cache a view's 200 JSON response under key_func(**view_kwargs)
+
+        With read replicas (replicas.py), a client that just wrote skips the
+        cache in both directions, so it can't be served a response from before
+        its write; and a response read from a replica, which may lag, is not
+        stored for everyone else.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                router = current_app.extensions.get('replica_router')
+                if router is not None and router.read_primary_requested():
+                    return view(*args, **kwargs)
+
+                key = key_func(**kwargs)
+                hit, body = self.get(key)
+                if hit:
+                    return current_app.response_class(body, status=200, mimetype='application/json')
+
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not (router is not None and router.serving_from_replica()):
+                    self.set(key, response.get_data())
+                return response
+            return wrapper
+        return decorator
+
+
+def request_key(prefix, args=None):
+    """Cache key for the current request: prefix plus its sorted query arguments
+
+    Args:
+        args: Query arguments to use instead of flask.request.args (the ASGI read paths pass Quart's)
+    """
+    if args is None:
+        args = request.args
+    args = '&'.join(f'{k}={v}' for k, v in sorted(args.items(multi=True)))
+    return f'{prefix}?{args}'
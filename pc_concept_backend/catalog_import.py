@@ -0,0 +1,414 @@
+"""Bulk catalog import: `flask import-catalog`
+
+Replaces the old populate_db.py / populate_reviews.py / populate_blogs.py
+scripts. CSVs are streamed in chunks, every row is validated with the same
+rules as the API, valid rows are loaded with COPY into a temporary staging
+table and merged with INSERT ... ON CONFLICT. Rejected rows are reported
+(and optionally written to a CSV) instead of aborting the import.
+"""
+import csv
+import io
+import json
+import math
+import time
+from datetime import datetime
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import text
+from extensions import db, cache, is_postgres, lift_statement_timeout
+from routes.products import validate_positive_number
+from taxonomy import current_taxonomy
+from review_stats import rebuild_review_stats
+
+
+# products.price is NUMERIC(10, 2)
+MAX_PRICE = 10 ** 8
+
+
+class RowRejected(ValueError):
+    """Raised by a row validator; the message is reported as the reject reason"""
+
+
+class RejectLog:
+    """Counts rejected rows, keeps a few for the summary and streams all of them to a CSV"""
+
+    def __init__(self, path=None, keep=10):
+        self.count = 0
+        self.sample = []
+        self.keep = keep
+        self._file = open(path, 'w', newline='', encoding='utf-8') if path else None
+        if self._file:
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(['entity', 'file', 'line', 'reason', 'row'])
+
+    def add(self, entity, path, line, reason, row):
+        self.count += 1
+        if len(self.sample) < self.keep:
+            self.sample.append((entity, path, line, reason))
+        if self._file:
+            self._writer.writerow([entity, path, line, reason, json.dumps(row, default=str)])
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+def required(row, field, max_length=None):
+    value = (row.get(field) or '').strip()
+    if not value:
+        raise RowRejected(f'Missing required field: {field}')
+    if max_length and len(value) > max_length:
+        raise RowRejected(f'{field} must not exceed {max_length} characters')
+    return value
+
+
+def optional(row, field):
+    value = (row.get(field) or '').strip()
+    return value or None
+
+
+def optional_id(row, field):
+    value = optional(row, field)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise RowRejected(f'{field} must be an integer')
+
+
+def parse_timestamp(value, formats):
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise RowRejected(f'Invalid date: {value}')
+
+
+def validate_product(row):
+    product_id = required(row, 'product_id', 10)
+    name = required(row, 'name', 100)
+    category = required(row, 'category')
+    image_url = required(row, 'image_url', 255)
+
+    is_valid, price = validate_positive_number(row.get('price'), 'Price')
+    if not is_valid:
+        raise RowRejected(price)
+    # float() accepts nan/inf, and COPY would fail the whole chunk on them or on an overflow
+    if not math.isfinite(price):
+        raise RowRejected('Price must be a finite number')
+    if round(price, 2) >= MAX_PRICE:
+        raise RowRejected(f'Price must be less than {MAX_PRICE:,}')
+
+    error, brand, subcategory = current_taxonomy().apply_category_rules(
+        category, optional(row, 'brand'), optional(row, 'subcategory')
+    )
+    if error:
+        raise RowRejected(error)
+
+    return (product_id, name, brand, category, subcategory, f'{price:.2f}', image_url)
+
+
+def validate_spec(row):
+    return (
+        required(row, 'product_id', 10),
+        required(row, 'spec_name', 100),
+        required(row, 'spec_value', 255)
+    )
+
+
+def validate_review(row):
+    product_id = required(row, 'product_id', 10)
+    user_alias = required(row, 'user_alias', 50)
+    if len(user_alias) < 2:
+        raise RowRejected('User alias must be at least 2 characters long')
+    review_text = required(row, 'review_text')
+    if len(review_text) < 10:
+        raise RowRejected('Review text must be at least 10 characters long')
+
+    # Reviews store brands uppercase, like add_review
+    category = required(row, 'category')
+    error, brand, subcategory = current_taxonomy().apply_category_rules(
+        category, optional(row, 'brand'), optional(row, 'subcategory'), fold_case=True
+    )
+    if error:
+        raise RowRejected(error)
+
+    date_posted = optional(row, 'date_posted')
+    date_posted = parse_timestamp(date_posted, ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d')) \
+        if date_posted else datetime.utcnow()
+
+    return (optional_id(row, 'review_id'), product_id, user_alias, review_text,
+            category, subcategory, brand, date_posted.isoformat(sep=' '))
+
+
+def validate_blog(row):
+    title = required(row, 'title', 200)
+    introduction = required(row, 'introduction')
+    body = required(row, 'body')
+    conclusion = required(row, 'conclusion')
+    author = required(row, 'author', 100)
+    image_url = required(row, 'image_url', 255)
+    if not image_url.startswith('http'):
+        raise RowRejected('Image URL must be a valid URL (http/https)')
+
+    date_published = optional(row, 'date_published')
+    date_published = parse_timestamp(date_published, ('%Y-%m-%d',)).date() \
+        if date_published else datetime.utcnow().date()
+
+    return (optional_id(row, 'blog_id'), title, introduction, body, conclusion,
+            image_url, author, date_published.isoformat())
+
+
+# Staging table definitions, merge statements and FK checks per entity.
+# Merges are idempotent: re-running an import updates rows instead of failing.
+# Reviews and blogs without an ID are matched on a natural key instead:
+# (product_id, user_alias, date_posted) and (title, date_published). A row
+# without a date gets the import time, so only dated rows can be re-imported
+# without being duplicated.
+ENTITIES = {
+    'products': {
+        'validate': validate_product,
+        'key': lambda r: r[0],
+        'stage': """CREATE TEMP TABLE import_products (
+            product_id VARCHAR(10), name VARCHAR(100), brand VARCHAR(50), category VARCHAR(50),
+            subcategory VARCHAR(50), price NUMERIC(10, 2), image_url VARCHAR(255))""",
+        'columns': 'product_id, name, brand, category, subcategory, price, image_url',
+        'merge': ["""
+            INSERT INTO products (product_id, name, brand, category, subcategory, price, image_url)
+            SELECT product_id, name, brand, category, subcategory, price, image_url FROM import_products
+            ON CONFLICT (product_id) DO UPDATE SET
+                name = EXCLUDED.name, brand = EXCLUDED.brand, category = EXCLUDED.category,
+                subcategory = EXCLUDED.subcategory, price = EXCLUDED.price, image_url = EXCLUDED.image_url
+        """],
+    },
+    'specs': {
+        'validate': validate_spec,
+        'key': lambda r: (r[0], r[1]),
+        'stage': """CREATE TEMP TABLE import_specs (
+            product_id VARCHAR(10), spec_name VARCHAR(100), spec_value VARCHAR(255))""",
+        'columns': 'product_id, spec_name, spec_value',
+        'orphans': """
+            SELECT s.product_id, s.spec_name FROM import_specs s
+            LEFT JOIN products p ON p.product_id = s.product_id WHERE p.product_id IS NULL
+        """,
+        'merge': ["""
+            INSERT INTO product_specifications (product_id, spec_name, spec_value)
+            SELECT s.product_id, s.spec_name, s.spec_value FROM import_specs s
+            JOIN products p ON p.product_id = s.product_id
+            ON CONFLICT ON CONSTRAINT uq_product_spec_name DO UPDATE SET spec_value = EXCLUDED.spec_value
+        """],
+    },
+    'reviews': {
+        'validate': validate_review,
+        'key': lambda r: r[0] if r[0] is not None else (r[1], r[2], r[7]),
+        'stage': """CREATE TEMP TABLE import_reviews (
+            review_id INTEGER, product_id VARCHAR(10), user_alias VARCHAR(50), review_text TEXT,
+            category VARCHAR(50), subcategory VARCHAR(50), brand VARCHAR(50), date_posted TIMESTAMP)""",
+        'columns': 'review_id, product_id, user_alias, review_text, category, subcategory, brand, date_posted',
+        'orphans': """
+            SELECT s.product_id, s.user_alias FROM import_reviews s
+            LEFT JOIN products p ON p.product_id = s.product_id WHERE p.product_id IS NULL
+        """,
+        'merge': [
+            """
+            INSERT INTO reviews (review_id, product_id, user_alias, review_text, category, subcategory, brand, date_posted)
+            SELECT s.review_id, s.product_id, s.user_alias, s.review_text, s.category, s.subcategory, s.brand, s.date_posted
+            FROM import_reviews s JOIN products p ON p.product_id = s.product_id
+            WHERE s.review_id IS NOT NULL
+            ON CONFLICT (review_id) DO UPDATE SET
+                product_id = EXCLUDED.product_id, user_alias = EXCLUDED.user_alias,
+                review_text = EXCLUDED.review_text, category = EXCLUDED.category,
+                subcategory = EXCLUDED.subcategory, brand = EXCLUDED.brand, date_posted = EXCLUDED.date_posted
+            """,
+            """
+            UPDATE reviews r SET
+                review_text = s.review_text, category = s.category,
+                subcategory = s.subcategory, brand = s.brand
+            FROM import_reviews s
+            WHERE s.review_id IS NULL AND r.product_id = s.product_id
+                AND r.user_alias = s.user_alias AND r.date_posted = s.date_posted
+            """,
+            """
+            INSERT INTO reviews (product_id, user_alias, review_text, category, subcategory, brand, date_posted)
+            SELECT s.product_id, s.user_alias, s.review_text, s.category, s.subcategory, s.brand, s.date_posted
+            FROM import_reviews s JOIN products p ON p.product_id = s.product_id
+            WHERE s.review_id IS NULL AND NOT EXISTS (
+                SELECT 1 FROM reviews r WHERE r.product_id = s.product_id
+                    AND r.user_alias = s.user_alias AND r.date_posted = s.date_posted
+            )
+            """,
+        ],
+        'sequence': ('reviews', 'review_id'),
+    },
+    'blogs': {
+        'validate': validate_blog,
+        'key': lambda r: r[0] if r[0] is not None else (r[1], r[7]),
+        'stage': """CREATE TEMP TABLE import_blogs (
+            blog_id INTEGER, title VARCHAR(255), introduction TEXT, body TEXT, conclusion TEXT,
+            image_url VARCHAR(255), author VARCHAR(100), date_published DATE)""",
+        'columns': 'blog_id, title, introduction, body, conclusion, image_url, author, date_published',
+        'merge': [
+            """
+            INSERT INTO blogs (blog_id, title, introduction, body, conclusion, image_url, author, date_published)
+            SELECT blog_id, title, introduction, body, conclusion, image_url, author, date_published
+            FROM import_blogs WHERE blog_id IS NOT NULL
+            ON CONFLICT (blog_id) DO UPDATE SET
+                title = EXCLUDED.title, introduction = EXCLUDED.introduction, body = EXCLUDED.body,
+                conclusion = EXCLUDED.conclusion, image_url = EXCLUDED.image_url,
+                author = EXCLUDED.author, date_published = EXCLUDED.date_published
+            """,
+            """
+            UPDATE blogs b SET
+                introduction = s.introduction, body = s.body, conclusion = s.conclusion,
+                image_url = s.image_url, author = s.author
+            FROM import_blogs s
+            WHERE s.blog_id IS NULL AND b.title = s.title AND b.date_published = s.date_published
+            """,
+            """
+            INSERT INTO blogs (title, introduction, body, conclusion, image_url, author, date_published)
+            SELECT title, introduction, body, conclusion, image_url, author, date_published
+            FROM import_blogs s WHERE blog_id IS NULL AND NOT EXISTS (
+                SELECT 1 FROM blogs b WHERE b.title = s.title AND b.date_published = s.date_published
+            )
+            """,
+        ],
+        'sequence': ('blogs', 'blog_id'),
+    },
+}
+
+
+def read_chunks(path, chunk_size):
+    """Yield lists of (line_number, row dict) without loading the whole file"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        chunk = []
+        for row in reader:
+            chunk.append((reader.line_num, row))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def import_file(conn, entity, path, chunk_size, rejects):
+    """Stream one CSV through staging into its table; returns (read, loaded, rejected)"""
+    spec = ENTITIES[entity]
+    staging = f'import_{entity}'
+    conn.execute(text(spec['stage']))
+    cursor = conn.connection.dbapi_connection.cursor()
+    read = loaded = rejected = 0
+
+    for chunk in read_chunks(path, chunk_size):
+        read += len(chunk)
+
+        # Validate and de-duplicate in Python (last row for a key wins)
+        valid = {}
+        for line, row in chunk:
+            try:
+                values = spec['validate'](row)
+            except RowRejected as e:
+                rejects.add(entity, path, line, str(e), row)
+                rejected += 1
+                continue
+            valid[spec['key'](values)] = values
+
+        if not valid:
+            continue
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(valid.values())
+        buffer.seek(0)
+        if not conn.in_transaction():
+            conn.begin()  # So transaction-start hooks also cover the raw COPY below
+        cursor.copy_expert(f"COPY {staging} ({spec['columns']}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+        if 'orphans' in spec:
+            for orphan in conn.execute(text(spec['orphans'])):
+                rejects.add(entity, path, None, f'Product {orphan[0]} not found', dict(orphan._mapping))
+                rejected += 1
+
+        for statement in spec['merge']:
+            loaded += conn.execute(text(statement)).rowcount
+
+        conn.execute(text(f'TRUNCATE {staging}'))
+        conn.commit()
+
+    if 'sequence' in spec:
+        table, column = spec['sequence']
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+            f"COALESCE((SELECT MAX({column}) FROM {table}), 1))"
+        ))
+    conn.execute(text(f'DROP TABLE {staging}'))
+    conn.commit()
+    return read, loaded, rejected
+
+
+@click.command('import-catalog')
+@click.option('--products', type=click.Path(exists=True, dir_okay=False), help='Products CSV')
+@click.option('--specs', type=click.Path(exists=True, dir_okay=False), help='Product specifications CSV')
+@click.option('--reviews', type=click.Path(exists=True, dir_okay=False), help='Reviews CSV')
+@click.option('--blogs', type=click.Path(exists=True, dir_okay=False), help='Blogs CSV')
+@click.option('--chunk-size', default=20000, show_default=True, help='Rows per COPY/merge batch')
+@click.option('--rejects', 'rejects_path', type=click.Path(dir_okay=False, writable=True),
+              help='Write rejected rows with their reasons to this CSV')
+@with_appcontext
+def import_catalog_command(products, specs, reviews, blogs, chunk_size, rejects_path):
+    """Bulk-load catalog CSVs with validation, COPY and upsert
+
+    Re-running a file updates rows in place. Reviews and blogs without an ID
+    are matched on (product_id, user_alias, date_posted) and
+    (title, date_published); give them a date to re-import them safely.
+
+    With CACHE_BACKEND=redis the shared response cache is cleared afterwards.
+    The memory backend lives inside each web worker and can't be reached from
+    here: running workers serve cached catalog responses until CACHE_TTL
+    expires, or until they are restarted.
+    """
+    if not is_postgres():
+        raise click.ClickException('import-catalog requires PostgreSQL (COPY and ON CONFLICT)')
+
+    files = [(entity, path) for entity, path in
+             (('products', products), ('specs', specs), ('reviews', reviews), ('blogs', blogs)) if path]
+    if not files:
+        raise click.UsageError('Pass at least one of --products, --specs, --reviews, --blogs')
+
+    rejects = RejectLog(rejects_path)
+    try:
+        with db.engine.connect() as conn:
+            # Merges of large chunks can outlast the per-request statement_timeout
+            lift_statement_timeout(conn)
+            for entity, path in files:
+                started = time.perf_counter()
+                read, loaded, rejected = import_file(conn, entity, path, chunk_size, rejects)
+                elapsed = time.perf_counter() - started
+                rate = read / elapsed if elapsed else 0
+                click.echo(f'{entity:<8} read={read} loaded={loaded} rejected={rejected} '
+                           f'time={elapsed:.2f}s ({rate:,.0f} rows/s)')
+    finally:
+        rejects.close()
+
+    # Review aggregates are recomputed once rather than per merged row
+    if products or reviews:
+        rebuild_review_stats()
+
+    # Cached catalog responses are stale now, but only a shared cache can be cleared from this process
+    backend = current_app.config.get('CACHE_BACKEND', 'memory')
+    if backend == 'redis':
+        cache.clear()
+        click.echo('Cleared the shared response cache')
+    else:
+        click.echo(f"Warning: CACHE_BACKEND is '{backend}', so running web workers keep serving cached "
+                   f"catalog responses for up to CACHE_TTL ({cache.ttl}s) or until restarted", err=True)
+
+    for entity, path, line, reason in rejects.sample:
+        location = f'{path}:{line}' if line else path
+        click.echo(f'  rejected {entity} {location}: {reason}', err=True)
+    if rejects.count > len(rejects.sample):
+        click.echo(f'  ... and {rejects.count - len(rejects.sample)} more', err=True)
+    if rejects_path and rejects.count:
+        click.echo(f'Rejected rows written to {rejects_path}')
@@ -1,8 +1,140 @@
 import os
+from uuid import uuid4
 from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
 
 load_dotenv()
 
+
+def env_bool(name, default):
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
+# Connection pool and timeouts (per worker process; size for gunicorn threads per worker)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))          # seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))          # replace connections older than this
+DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)              # test connections on checkout
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", 5))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 15000))  # 0 disables
+# PgBouncer (transaction pooling): no startup options or server-side prepared
+# statements; statement_timeout is applied per transaction instead
+DB_PGBOUNCER = env_bool("DB_PGBOUNCER", False)
+
+
+def build_engine_options(url):
+    """SQLAlchemy engine options for url from the DB_* settings above"""
+    options = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+    if not url or url.startswith("sqlite"):
+        return options  # SQLite picks its own pool class
+
+    options.update({
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    })
+    if url.startswith("postgresql"):
+        connect_args = {"connect_timeout": DB_CONNECT_TIMEOUT}
+        if DB_STATEMENT_TIMEOUT_MS and not DB_PGBOUNCER:
+            # Session default set at connection startup: no extra round trip per request
+            connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+        options["connect_args"] = connect_args
+    return options
+
+
+# asyncio drivers for the ASGI read paths (asgi.py), keyed by the sync URL's backend
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(url):
+    """url with an asyncio driver; an explicit async driver (e.g. postgresql+psycopg) is kept"""
+    if not url:
+        return url
+    parsed = make_url(url)
+    if "+" not in parsed.drivername or parsed.drivername == "postgresql+psycopg2":
+        parsed = parsed.set(drivername=ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername))
+    if parsed.drivername == "postgresql+asyncpg" and DB_PGBOUNCER:
+        # SQLAlchemy's own prepared statement cache, on top of asyncpg's
+        parsed = parsed.update_query_dict({"prepared_statement_cache_size": "0"})
+    return parsed.render_as_string(hide_password=False)
+
+
+def build_async_engine_options(url):
+    """create_async_engine options for url: the DB_* pool settings plus driver connect args
+
+    Server-side prepared statements are disabled in PgBouncer mode, since the
+    next transaction may run on a server connection that never prepared them.
+    """
+    options = build_engine_options(url)
+    driver = make_url(url).drivername if url else None
+    if driver == "postgresql+asyncpg":
+        connect_args = {"timeout": DB_CONNECT_TIMEOUT}
+        if DB_PGBOUNCER:
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        elif DB_STATEMENT_TIMEOUT_MS:
+            connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+        options["connect_args"] = connect_args
+    elif driver == "postgresql+psycopg":
+        if DB_PGBOUNCER:
+            options["connect_args"] = {"connect_timeout": DB_CONNECT_TIMEOUT, "prepare_threshold": None}
+    return options
+
+
+# Read replicas (comma separated URLs); GET requests read from them, see replicas.py
+REPLICA_DATABASE_URLS = [url.strip() for url in os.getenv("REPLICA_DATABASE_URLS", "").split(",") if url.strip()]
+
+
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options(SQLALCHEMY_DATABASE_URI)
+    DB_STATEMENT_TIMEOUT_MS = DB_STATEMENT_TIMEOUT_MS
+    DB_PGBOUNCER = DB_PGBOUNCER
+
+    # Replica engines are binds named replica_0, replica_1, ... with the same pool settings
+    SQLALCHEMY_BINDS = {
+        f"replica_{i}": {"url": url, **build_engine_options(url)}
+        for i, url in enumerate(REPLICA_DATABASE_URLS)
+    }
+    REPLICA_CHECK_SECONDS = int(os.getenv("REPLICA_CHECK_SECONDS", 5))        # how often to measure replica lag
+    REPLICA_MAX_LAG_SECONDS = int(os.getenv("REPLICA_MAX_LAG_SECONDS", 10))   # lagging replicas fall back to the primary
+    REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 10))     # read from the primary after a write
+
+    # ASGI entry point (asgi.py): async engine for the read paths, DATABASE_URL with an asyncio driver by default
+    ASYNC_DATABASE_URL = async_database_url(os.getenv("ASYNC_DATABASE_URL") or SQLALCHEMY_DATABASE_URI)
+    ASYNC_ENGINE_OPTIONS = build_async_engine_options(ASYNC_DATABASE_URL)
+
+    # Origins allowed to call the API from a browser
+    CORS_ORIGINS = [
+        "http://localhost:5173",
+        "http://localhost:3000",
+        "http://127.0.0.1:5173",
+        "http://127.0.0.1:3000",
+        os.getenv("FRONTEND_URL", "http://localhost:5173")
+    ]
+
+    # Catalog response cache: "memory" (per process, LRU + TTL) or "redis" (shared by all workers)
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "pcconcept:")
+    CACHE_TTL = int(os.getenv("CACHE_TTL", 60))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+
+    # JSON encoder for API responses: "orjson" (fast) or "stdlib" (Flask's json module)
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson")
+
+    # Per-request SQL/latency instrumentation: Server-Timing header, JSON log lines, GET /metrics
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "true").lower() == "true"
+
+    # /health: seconds allowed for the SELECT 1 probe; /health/ready fails at this pool utilization
+    HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", 2.0))
+    HEALTH_POOL_SATURATION = float(os.getenv("HEALTH_POOL_SATURATION", 0.9))
+
+    # How often (seconds) to check taxonomy_terms' version stamp for edits
+    TAXONOMY_REFRESH_SECONDS = int(os.getenv("TAXONOMY_REFRESH_SECONDS", 30))
@@ -0,0 +1,58 @@
+import hashlib
+from functools import wraps
+from flask import current_app, request
+from sqlalchemy import select
+from extensions import db, is_postgres
+from models import TableVersion
+
+
+def table_versions_select(tables):
+    return select(TableVersion.table_name, TableVersion.current_version).where(TableVersion.table_name.in_(tables))
+
+
+def ordered_versions(rows, tables):
+    """(table_name, version) rows as a list in the order of tables; missing tables count as 0"""
+    versions = dict(rows)
+    return [versions.get(t, 0) for t in tables]
+
+
+def table_versions(tables):
+    """Current change counters for the given tables, in one primary-key lookup"""
+    return ordered_versions(db.session.execute(table_versions_select(tables)).all(), tables)
+
+
+def compute_etag(full_path, versions):
+    """Strong validator for a response: the request path plus the counters it depends on"""
+    tag_source = f"{full_path}|{'.'.join(str(v) for v in versions)}"
+    return hashlib.sha1(tag_source.encode('utf-8')).hexdigest()
+
+
+def conditional(*tables):
+    """Strong ETag + If-None-Match support for a read-only view
+
+    The tag is derived from the request path and the change counters of every
+    table the response reads, so a match is answered with 304 before the view
+    queries or serializes anything. The counters are maintained by Postgres
+    triggers (see TableVersion); on other engines the view runs unconditionally.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not is_postgres():
+                return view(*args, **kwargs)
+
+            etag = compute_etag(request.full_path, table_versions(tables))
+
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            # Let browsers keep the body but revalidate on every navigation
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -1,5 +1,63 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import event
+from cache import ResponseCache
+from metrics import RequestMetrics
+from replicas import ReplicaRouter, RoutingSession
 
-db = SQLAlchemy()
-migrate = Migrate()
\ No newline at end of file
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+migrate = Migrate()
+cache = ResponseCache()
+metrics = RequestMetrics()
+replicas = ReplicaRouter()
+
+
+def is_postgres():
+    """Search indexes and change-counter triggers only exist on Postgres"""
+    return db.engine.dialect.name == 'postgresql'
+
+
+def init_statement_timeout(app):
+    """Per-transaction statement_timeout for PgBouncer mode
+
+    Without PgBouncer the timeout is a connection startup option (see
+    build_engine_options). PgBouncer in transaction mode rejects startup
+    options and hands each transaction to any server connection, so the
+    timeout is set with SET LOCAL at the start of every transaction instead.
+    """
+    timeout = app.config.get('DB_STATEMENT_TIMEOUT_MS')
+    if not (app.config.get('DB_PGBOUNCER') and timeout):
+        return
+    with app.app_context():
+        engines = list(db.engines.values())  # primary and any read replicas
+    for engine in engines:
+        per_transaction_statement_timeout(engine, timeout)
+
+
+def per_transaction_statement_timeout(engine, timeout):
+    """SET LOCAL statement_timeout = timeout (ms) at the start of each transaction on a Postgres engine"""
+    if engine.dialect.name != 'postgresql':
+        return
+    engine.update_execution_options(statement_timeout_ms=int(timeout))
+    event.listen(engine, 'begin', _apply_statement_timeout)
+
+
+def lift_statement_timeout(conn):
+    """Disable statement_timeout for every transaction on a maintenance connection
+
+    For bulk imports, migrations and stats rebuilds, which can outlast the
+    per-request limit. A transaction already open on conn is covered too.
+    """
+    if conn.dialect.name != 'postgresql':
+        return
+    conn.execution_options(statement_timeout_ms=0)
+    if not event.contains(conn.engine, 'begin', _apply_statement_timeout):
+        event.listen(conn, 'begin', _apply_statement_timeout)
+    if conn.in_transaction():
+        _apply_statement_timeout(conn)
+
+
+def _apply_statement_timeout(conn):
+    timeout = conn.get_execution_options().get('statement_timeout_ms')
+    if timeout is not None:
+        conn.exec_driver_sql(f'SET LOCAL statement_timeout = {int(timeout)}')
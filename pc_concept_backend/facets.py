@@ -0,0 +1,43 @@
+from sqlalchemy import func, select
+from extensions import db
+from models import ReviewFacetStats
+
+
+def facet_select(model):
+    """One GROUP BY over (category, subcategory, brand) of a model's rows"""
+    return select(
+        model.category, model.subcategory, model.brand, func.count()
+    ).group_by(model.category, model.subcategory, model.brand)
+
+
+def review_facet_select():
+    """facet_select(Review) rows read from review_facet_stats instead of grouping reviews"""
+    return select(
+        ReviewFacetStats.category, ReviewFacetStats.subcategory, ReviewFacetStats.brand,
+        ReviewFacetStats.review_count
+    ).where(ReviewFacetStats.review_count > 0)
+
+
+def facet_counts(model):
+    """Category / subcategory / brand counts of a model's rows in one GROUP BY
+
+    Returns:
+        {"total": n, "categories": {category: {"count": n, "subcategories": {...}, "brands": {...}}}}
+    """
+    return build_facets(db.session.execute(facet_select(model)).all())
+
+
+def build_facets(rows):
+    """Nest facet_select() or review_facet_select() rows into the facet_counts() response shape"""
+    total = 0
+    categories = {}
+    for category, subcategory, brand, count in rows:
+        total += count
+        facet = categories.setdefault(category, {"count": 0, "subcategories": {}, "brands": {}})
+        facet["count"] += count
+        if subcategory:
+            facet["subcategories"][subcategory] = facet["subcategories"].get(subcategory, 0) + count
+        if brand:
+            facet["brands"][brand] = facet["brands"].get(brand, 0) + count
+
+    return {"total": total, "categories": categories}
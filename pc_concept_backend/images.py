@@ -0,0 +1,40 @@
+# Responsive image URLs built from Cloudinary delivery transformations.
+# Cloudinary resizes, converts (f_auto -> WebP/AVIF where supported) and caches
+# each variant on its CDN, so no image processing runs on our workers.
+
+CLOUDINARY_UPLOAD_MARKER = '/image/upload/'
+
+# Named variants: width in pixels. Detail pages show the original upload.
+IMAGE_VARIANTS = {
+    'card': 400
+}
+
+# Widths offered to the browser for card-sized slots (1x/2x displays)
+SRCSET_WIDTHS = (200, 400, 800)
+
+
+def is_cloudinary_url(url):
+    return bool(url) and 'res.cloudinary.com' in url and CLOUDINARY_UPLOAD_MARKER in url
+
+
+def resized_url(url, width):
+    """Insert a resize + auto format/quality transformation into a Cloudinary URL
+
+    Non-Cloudinary URLs are returned unchanged.
+    """
+    if not is_cloudinary_url(url):
+        return url
+    prefix, rest = url.split(CLOUDINARY_UPLOAD_MARKER, 1)
+    return f'{prefix}{CLOUDINARY_UPLOAD_MARKER}c_limit,w_{width},f_auto,q_auto/{rest}'
+
+
+def variant_url(url, variant):
+    """URL of a named variant from IMAGE_VARIANTS"""
+    return resized_url(url, IMAGE_VARIANTS[variant])
+
+
+def srcset(url, widths=SRCSET_WIDTHS):
+    """srcset attribute value for the URL, or None when it can't be resized"""
+    if not is_cloudinary_url(url):
+        return None
+    return ', '.join(f'{resized_url(url, w)} {w}w' for w in widths)
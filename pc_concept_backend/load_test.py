@@ -0,0 +1,116 @@
+# Load test for pool sizing and timeouts. Runs N concurrent clients against a
+# running server for a fixed time, samples /health/ready for pool utilization
+# and reports throughput, latency percentiles and status codes.
+#
+# To see saturation, give the server fewer connections than request threads:
+#
+#   DB_POOL_SIZE=2 DB_MAX_OVERFLOW=0 DB_POOL_TIMEOUT=1 \
+#       gunicorn -w 1 --threads 32 -b 127.0.0.1:5000 'app:create_app()'
+#   python load_test.py --concurrency 32 --duration 20
+#
+# With a right-sized pool (DB_POOL_SIZE >= threads per worker) the same run
+# shows no 503s and lower tail latency.
+
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PATHS = [
+    '/products/?per_page=24&card_mode=true',
+    '/products/category/Laptops?card_mode=true',
+    '/products/filter?category=Components&card_mode=true',
+    '/products/search?q=gaming',
+    '/reviews/?per_page=20',
+    '/blogs/?per_page=10',
+]
+
+
+def fetch(url, timeout):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = 'error'
+    return status, time.perf_counter() - started
+
+
+def client(base_url, paths, deadline, timeout, results, lock):
+    i = 0
+    while time.monotonic() < deadline:
+        status, elapsed = fetch(base_url + paths[i % len(paths)], timeout)
+        i += 1
+        with lock:
+            results.append((status, elapsed))
+
+
+def sample_pool(base_url, deadline, interval, samples):
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + '/health/ready', timeout=5) as response:
+                payload = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            payload = json.loads(e.read() or b'{}')
+        except Exception:
+            payload = {}
+        samples.append(payload.get('pool', {}))
+        time.sleep(interval)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent load test for the catalog API')
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=20, help='Seconds')
+    parser.add_argument('--timeout', type=float, default=30, help='Client timeout per request')
+    parser.add_argument('--path', action='append', help='Endpoint to hit (repeatable)')
+    args = parser.parse_args()
+
+    paths = args.path or DEFAULT_PATHS
+    results, samples, lock = [], [], threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    sampler = threading.Thread(target=sample_pool, args=(args.url, deadline, 1.0, samples), daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.concurrency):
+            pool.submit(client, args.url, paths, deadline, args.timeout, results, lock)
+    elapsed = time.perf_counter() - started
+    sampler.join(timeout=5)
+
+    latencies = sorted(e for _, e in results)
+    statuses = Counter(s for s, _ in results)
+    ok = statuses.get(200, 0)
+
+    print(f'{args.concurrency} clients, {elapsed:.1f}s, {len(paths)} endpoints\n')
+    print(f'requests    {len(results)}  ({len(results) / elapsed:,.1f} req/s, {ok / elapsed:,.1f} ok/s)')
+    print(f'latency ms  p50={percentile(latencies, 0.50) * 1000:.1f}  '
+          f'p95={percentile(latencies, 0.95) * 1000:.1f}  p99={percentile(latencies, 0.99) * 1000:.1f}  '
+          f'max={(latencies[-1] if latencies else 0) * 1000:.1f}')
+    print('statuses    ' + '  '.join(f'{k}={v}' for k, v in sorted(statuses.items(), key=str)))
+
+    pool_samples = [s for s in samples if 'checked_out' in s]
+    if pool_samples:
+        peak = max(s['checked_out'] for s in pool_samples)
+        saturated = sum(1 for s in pool_samples if s.get('capacity') and s['checked_out'] >= s['capacity'])
+        print(f"pool        capacity={pool_samples[-1].get('capacity')}  peak checked_out={peak}  "
+              f'saturated in {saturated}/{len(pool_samples)} samples')
+
+
+if __name__ == '__main__':
+    main()
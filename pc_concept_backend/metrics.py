@@ -0,0 +1,186 @@
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('request_metrics')
+
+# Histogram bucket upper bounds (Prometheus "le" labels)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, rendered in Prometheus text format"""
+
+    def __init__(self, name, help_text, buckets, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.label_names = label_names
+        self._series = {}  # labels tuple -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self._series.items()):
+            label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {series[-1]}')
+            lines.append(f'{self.name}_count{{{label_text}}} {cumulative}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter per label set"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series = {}
+
+    def inc(self, labels, amount=1):
+        self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(self._series.items()):
+            label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in zip(self.label_names, labels))
+            lines.append(f'{self.name}{{{label_text}}} {value}')
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RequestMetrics:
+    """Per-request SQL and latency instrumentation
+
+    Every request records wall time, SQL statement count, SQL time, rows
+    returned by the driver (cursor.rowcount; SQLite reports none for SELECTs)
+    and response bytes. Each request gets a Server-Timing header and a JSON
+    log line on the 'request_metrics' logger. The numbers are aggregated per
+    endpoint for GET /metrics (Prometheus text format). Aggregates are
+    per process: scrape each gunicorn worker, or sum them in the dashboard.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self.duration = Histogram(
+            'http_request_duration_seconds', 'Request wall time',
+            LATENCY_BUCKETS, ('endpoint', 'method')
+        )
+        self.db_duration = Histogram(
+            'db_query_duration_seconds_per_request', 'Total SQL time per request',
+            LATENCY_BUCKETS, ('endpoint', 'method')
+        )
+        self.statements = Histogram(
+            'db_statements_per_request', 'SQL statements executed per request',
+            STATEMENT_BUCKETS, ('endpoint', 'method')
+        )
+        self.requests = Counter('http_requests_total', 'Requests by status', ('endpoint', 'method', 'status'))
+        self.rows = Counter('db_rows_total', 'Rows returned by the database driver', ('endpoint', 'method'))
+        self.response_bytes = Counter('http_response_bytes_total', 'Response body bytes', ('endpoint', 'method'))
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+        self.server_timing = app.config.get('METRICS_SERVER_TIMING', True)
+
+        # Listening on the Engine class covers every engine the app creates
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+        app.extensions['request_metrics'] = self
+
+    def _start(self):
+        g.request_metrics = {'started': time.perf_counter(), 'statements': 0, 'sql_time': 0.0, 'rows': 0}
+
+    def _finish(self, response):
+        stats = g.pop('request_metrics', None)
+        if stats is None:
+            return response
+
+        duration = time.perf_counter() - stats['started']
+        endpoint = request.endpoint or 'unmatched'
+        method = request.method
+        size = response.calculate_content_length() or 0  # None for streamed bodies
+
+        labels = (endpoint, method)
+        with self._lock:
+            self.duration.observe(labels, duration)
+            self.db_duration.observe(labels, stats['sql_time'])
+            self.statements.observe(labels, stats['statements'])
+            self.requests.inc((endpoint, method, str(response.status_code)))
+            self.rows.inc(labels, stats['rows'])
+            self.response_bytes.inc(labels, size)
+
+        if self.server_timing:
+            response.headers.add(
+                'Server-Timing',
+                f'app;dur={duration * 1000:.1f}, '
+                f'db;desc="{stats["statements"]} queries";dur={stats["sql_time"] * 1000:.1f}'
+            )
+
+        logger.info(json.dumps({
+            'method': method,
+            'path': request.path,
+            'endpoint': endpoint,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'sql_statements': stats['statements'],
+            'sql_ms': round(stats['sql_time'] * 1000, 2),
+            'rows': stats['rows'],
+            'bytes': size
+        }))
+        return response
+
+    def render(self):
+        with self._lock:
+            lines = []
+            for metric in (self.requests, self.duration, self.db_duration,
+                           self.statements, self.rows, self.response_bytes):
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        return self.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info['query_started'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop('query_started', None)
+    if started is None or not has_request_context():
+        return
+    stats = g.get('request_metrics')
+    if stats is None:
+        return
+    stats['statements'] += 1
+    stats['sql_time'] += time.perf_counter() - started
+    # Only statements that return rows (SELECT, RETURNING); not rows affected by writes
+    if cursor.description is not None and cursor.rowcount > 0:
+        stats['rows'] += cursor.rowcount
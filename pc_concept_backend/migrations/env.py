@@ -5,6 +5,8 @@ from flask import current_app
 
 from alembic import context
 
+from extensions import lift_statement_timeout
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -97,6 +99,8 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # Index builds and table rewrites can outlast the app's statement_timeout
+        lift_statement_timeout(connection)
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
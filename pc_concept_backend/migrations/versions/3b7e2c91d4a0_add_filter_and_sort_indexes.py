@@ -0,0 +1,58 @@
+"""Add indexes for filter and sort paths
+
+Revision ID: 3b7e2c91d4a0
+Revises: 9cf998d2d9bc
+Create Date: 2026-10-18 09:12:44.210391
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7e2c91d4a0'
+down_revision = '9cf998d2d9bc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        # /products/category/<c>, /category/<c>/subcategory/<s>, /filter?category=&subcategory=
+        batch_op.create_index('ix_products_category_subcategory', ['category', 'subcategory'], unique=False)
+        # /products/category/Laptops/brand/<b>, /filter?category=Laptops&brand=
+        batch_op.create_index('ix_products_category_brand', ['category', 'brand'], unique=False)
+        # /filter?brand= without a category
+        batch_op.create_index('ix_products_brand', ['brand'], unique=False)
+
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        # /reviews/product/<id> ORDER BY date_posted DESC
+        batch_op.create_index('ix_reviews_product_id_date_posted', ['product_id', 'date_posted'], unique=False)
+        # /reviews/ ORDER BY date_posted DESC (offset and keyset modes)
+        batch_op.create_index('ix_reviews_date_posted_review_id', ['date_posted', 'review_id'], unique=False)
+        # /reviews/filter?category=&subcategory=|brand=
+        batch_op.create_index('ix_reviews_category_subcategory_brand', ['category', 'subcategory', 'brand'], unique=False)
+        # /reviews/filter?brand= without a category
+        batch_op.create_index('ix_reviews_brand', ['brand'], unique=False)
+
+    with op.batch_alter_table('blogs', schema=None) as batch_op:
+        # /blogs/, /blogs/latest ORDER BY date_published DESC (offset and keyset modes)
+        batch_op.create_index('ix_blogs_date_published_blog_id', ['date_published', 'blog_id'], unique=False)
+        # /blogs/author/<a> ORDER BY date_published DESC
+        batch_op.create_index('ix_blogs_author_date_published', ['author', 'date_published'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('blogs', schema=None) as batch_op:
+        batch_op.drop_index('ix_blogs_author_date_published')
+        batch_op.drop_index('ix_blogs_date_published_blog_id')
+
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index('ix_reviews_brand')
+        batch_op.drop_index('ix_reviews_category_subcategory_brand')
+        batch_op.drop_index('ix_reviews_date_posted_review_id')
+        batch_op.drop_index('ix_reviews_product_id_date_posted')
+
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index('ix_products_brand')
+        batch_op.drop_index('ix_products_category_brand')
+        batch_op.drop_index('ix_products_category_subcategory')
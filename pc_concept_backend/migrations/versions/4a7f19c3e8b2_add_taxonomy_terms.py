@@ -0,0 +1,57 @@
+"""Add taxonomy_terms
+
+Revision ID: 4a7f19c3e8b2
+Revises: e92b4d7a0c15
+Create Date: 2026-10-18 15:36:20.904417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4a7f19c3e8b2'
+down_revision = 'e92b4d7a0c15'
+branch_labels = None
+depends_on = None
+
+
+CATEGORIES = ['Laptops', 'Desktop/PCs', 'Components', 'Accessories', 'Speakers']
+BRANDS = {'Laptops': ['ACER', 'ASUS', 'LENOVO', 'NINGMEI']}
+SUBCATEGORIES = {
+    'Desktop/PCs': ['PC Bundles', 'PC Monitors', 'System Units'],
+    'Components': ['Cooling Systems', 'PC Cases'],
+    'Accessories': ['Headset', 'Keyboard', 'Mouse']
+}
+
+
+def upgrade():
+    taxonomy_terms = op.create_table('taxonomy_terms',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.String(length=50), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kind', 'category', 'value', name='uq_taxonomy_term')
+    )
+
+    rows = [{'kind': 'category', 'category': c, 'value': c, 'position': i} for i, c in enumerate(CATEGORIES)]
+    for kind, terms in (('brand', BRANDS), ('subcategory', SUBCATEGORIES)):
+        for category, values in terms.items():
+            rows += [{'kind': kind, 'category': category, 'value': v, 'position': i} for i, v in enumerate(values)]
+    op.bulk_insert(taxonomy_terms, rows)
+
+    # Version stamp: edits to the taxonomy bump table_versions like the catalog tables
+    op.execute("INSERT INTO table_versions (table_name, version) VALUES ('taxonomy_terms', 0)")
+    op.execute("""
+        CREATE TRIGGER trg_taxonomy_terms_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON taxonomy_terms
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()
+    """)
+
+
+def downgrade():
+    op.execute('DROP TRIGGER IF EXISTS trg_taxonomy_terms_version ON taxonomy_terms')
+    op.execute("DELETE FROM table_versions WHERE table_name = 'taxonomy_terms'")
+    op.drop_table('taxonomy_terms')
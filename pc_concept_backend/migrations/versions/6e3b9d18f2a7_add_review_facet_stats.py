@@ -0,0 +1,38 @@
+"""Add review_facet_stats
+
+Revision ID: 6e3b9d18f2a7
+Revises: d2f7a4c81b30
+Create Date: 2026-10-18 19:12:08.551930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e3b9d18f2a7'
+down_revision = 'd2f7a4c81b30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('review_facet_stats',
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('subcategory', sa.String(length=50), nullable=False),
+    sa.Column('brand', sa.String(length=50), nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.Column('last_posted', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('category', 'subcategory', 'brand')
+    )
+
+    # Backfill from existing reviews
+    op.execute("""
+        INSERT INTO review_facet_stats (category, subcategory, brand, review_count, last_posted)
+        SELECT category, COALESCE(subcategory, ''), COALESCE(brand, ''), COUNT(*), MAX(date_posted)
+        FROM reviews GROUP BY category, COALESCE(subcategory, ''), COALESCE(brand, '')
+    """)
+
+
+def downgrade():
+    op.drop_table('review_facet_stats')
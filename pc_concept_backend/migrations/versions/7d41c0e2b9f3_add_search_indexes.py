@@ -0,0 +1,47 @@
+"""Add trigram and full-text search indexes
+
+Revision ID: 7d41c0e2b9f3
+Revises: 3b7e2c91d4a0
+Create Date: 2026-10-18 10:03:17.582046
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7d41c0e2b9f3'
+down_revision = '3b7e2c91d4a0'
+branch_labels = None
+depends_on = None
+
+
+BLOG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(introduction, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(body, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(conclusion, '')), 'C')"
+)
+
+
+def upgrade():
+    # Trigram index so Product.name ILIKE '%term%' no longer scans the table
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_products_name_trgm', 'products', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+
+    # Generated column: Postgres keeps it current on every INSERT/UPDATE
+    op.add_column('blogs', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(BLOG_SEARCH_VECTOR, persisted=True), nullable=True
+    ))
+    op.create_index('ix_blogs_search_vector', 'blogs', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_blogs_search_vector', table_name='blogs')
+    op.drop_column('blogs', 'search_vector')
+    op.drop_index('ix_products_name_trgm', table_name='products')
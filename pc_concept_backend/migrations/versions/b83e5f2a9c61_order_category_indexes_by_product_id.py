@@ -0,0 +1,41 @@
+"""Add product_id to the category indexes for ORDER BY product_id
+
+Revision ID: b83e5f2a9c61
+Revises: 4a7f19c3e8b2
+Create Date: 2026-10-18 16:40:12.518204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b83e5f2a9c61'
+down_revision = '4a7f19c3e8b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The category listings page in product_id order; with product_id last the
+    # index returns rows already sorted instead of the planner walking the
+    # primary key and filtering every product
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        # /products/category/<c>, /filter?category=
+        batch_op.create_index('ix_products_category_product_id', ['category', 'product_id'], unique=False)
+        # /products/category/<c>/subcategory/<s>, /filter?category=&subcategory=
+        batch_op.create_index('ix_products_category_subcategory_product_id',
+                              ['category', 'subcategory', 'product_id'], unique=False)
+        # /products/category/Laptops/brand/<b>, /filter?category=Laptops&brand=
+        batch_op.create_index('ix_products_category_brand_product_id',
+                              ['category', 'brand', 'product_id'], unique=False)
+        batch_op.drop_index('ix_products_category_subcategory')
+        batch_op.drop_index('ix_products_category_brand')
+
+
+def downgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.create_index('ix_products_category_brand', ['category', 'brand'], unique=False)
+        batch_op.create_index('ix_products_category_subcategory', ['category', 'subcategory'], unique=False)
+        batch_op.drop_index('ix_products_category_brand_product_id')
+        batch_op.drop_index('ix_products_category_subcategory_product_id')
+        batch_op.drop_index('ix_products_category_product_id')
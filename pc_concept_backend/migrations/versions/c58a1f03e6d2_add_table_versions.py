@@ -0,0 +1,51 @@
+"""Add table_versions change counters
+
+Revision ID: c58a1f03e6d2
+Revises: 7d41c0e2b9f3
+Create Date: 2026-10-18 11:27:09.764130
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c58a1f03e6d2'
+down_revision = '7d41c0e2b9f3'
+branch_labels = None
+depends_on = None
+
+
+TRACKED_TABLES = ['products', 'product_specifications', 'reviews', 'blogs']
+
+
+def upgrade():
+    table_versions = op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    op.bulk_insert(table_versions, [{'table_name': t, 'version': 0} for t in TRACKED_TABLES])
+
+    # Statement-level triggers so every writer (routes, imports, psql) bumps the counter
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in TRACKED_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()
+        """)
+
+
+def downgrade():
+    for table in TRACKED_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS trg_{table}_version ON {table}')
+    op.execute('DROP FUNCTION IF EXISTS bump_table_version()')
+    op.drop_table('table_versions')
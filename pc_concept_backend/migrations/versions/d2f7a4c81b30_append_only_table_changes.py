@@ -0,0 +1,61 @@
+"""Count table changes in an append-only log instead of one hot row per table
+
+Revision ID: d2f7a4c81b30
+Revises: b83e5f2a9c61
+Create Date: 2026-10-18 18:05:31.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f7a4c81b30'
+down_revision = 'b83e5f2a9c61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('table_changes',
+    sa.Column('change_id', sa.BigInteger(), sa.Identity(), nullable=False),
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.PrimaryKeyConstraint('change_id')
+    )
+    op.create_index('ix_table_changes_table_name', 'table_changes', ['table_name'], unique=False)
+
+    # A table's version is table_versions.version plus its rows in table_changes.
+    # Writers only append, so they never queue on (or deadlock over) a shared
+    # row. Whichever writer gets the table's advisory lock without waiting also
+    # folds the log into table_versions; the lock is held until it commits, so
+    # nobody else can be holding that row.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_changes (table_name) VALUES (TG_TABLE_NAME);
+            IF pg_try_advisory_xact_lock(hashtext('table_versions:' || TG_TABLE_NAME)) THEN
+                WITH folded AS (DELETE FROM table_changes WHERE table_name = TG_TABLE_NAME RETURNING 1)
+                UPDATE table_versions SET version = version + (SELECT count(*) FROM folded)
+                WHERE table_name = TG_TABLE_NAME;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+
+def downgrade():
+    op.execute("""
+        UPDATE table_versions v SET version = version +
+            (SELECT count(*) FROM table_changes c WHERE c.table_name = v.table_name)
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.drop_index('ix_table_changes_table_name', table_name='table_changes')
+    op.drop_table('table_changes')
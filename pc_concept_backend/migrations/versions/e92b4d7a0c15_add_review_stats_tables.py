@@ -0,0 +1,49 @@
+"""Add product_review_stats and category_review_stats
+
+Revision ID: e92b4d7a0c15
+Revises: c58a1f03e6d2
+Create Date: 2026-10-18 14:41:52.318807
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e92b4d7a0c15'
+down_revision = 'c58a1f03e6d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('product_review_stats',
+    sa.Column('product_id', sa.String(length=10), nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.Column('last_posted', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], name='fk_review_stats_product', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    op.create_table('category_review_stats',
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.Column('last_posted', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('category')
+    )
+
+    # Backfill from existing reviews (every product gets a row, even with zero reviews)
+    op.execute("""
+        INSERT INTO product_review_stats (product_id, review_count, last_posted)
+        SELECT p.product_id, COUNT(r.review_id), MAX(r.date_posted)
+        FROM products p LEFT JOIN reviews r ON r.product_id = p.product_id
+        GROUP BY p.product_id
+    """)
+    op.execute("""
+        INSERT INTO category_review_stats (category, review_count, last_posted)
+        SELECT category, COUNT(*), MAX(date_posted) FROM reviews GROUP BY category
+    """)
+
+
+def downgrade():
+    op.drop_table('category_review_stats')
+    op.drop_table('product_review_stats')
@@ -18,6 +18,16 @@ class Product(db.Model):
     specifications = db.relationship('ProductSpecification', backref='product', cascade="all, delete-orphan")
     reviews = db.relationship('Review', backref='product', cascade="all, delete-orphan")
 
+    # Indexes matching the filter paths (in product_id order) in routes/products.py
+    __table_args__ = (
+        db.Index('ix_products_category_product_id', 'category', 'product_id'),
+        db.Index('ix_products_category_subcategory_product_id', 'category', 'subcategory', 'product_id'),
+        db.Index('ix_products_category_brand_product_id', 'category', 'brand', 'product_id'),
+        db.Index('ix_products_brand', 'brand'),
+        db.Index('ix_products_name_trgm', 'name', postgresql_using='gin',
+                 postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
+
 
 
 class ProductSpecification(db.Model):
@@ -54,6 +64,47 @@ class Review(db.Model):
     brand = db.Column(db.String(50), nullable=True)
     date_posted = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
+    # Indexes matching the filter and sort paths in routes/reviews.py
+    __table_args__ = (
+        db.Index('ix_reviews_product_id_date_posted', 'product_id', 'date_posted'),
+        db.Index('ix_reviews_date_posted_review_id', 'date_posted', 'review_id'),
+        db.Index('ix_reviews_category_subcategory_brand', 'category', 'subcategory', 'brand'),
+        db.Index('ix_reviews_brand', 'brand'),
+    )
+
+
+
+class ProductReviewStats(db.Model):
+    __tablename__ = 'product_review_stats'
+
+    # Maintained by review_stats.py in the same transaction as each review write
+    product_id = db.Column(
+        db.String(10),
+        db.ForeignKey('products.product_id', ondelete='CASCADE', name='fk_review_stats_product'),
+        primary_key=True
+    )
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    last_posted = db.Column(db.DateTime, nullable=True)
+
+
+class CategoryReviewStats(db.Model):
+    __tablename__ = 'category_review_stats'
+
+    category = db.Column(db.String(50), primary_key=True)
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    last_posted = db.Column(db.DateTime, nullable=True)
+
+
+class ReviewFacetStats(db.Model):
+    __tablename__ = 'review_facet_stats'
+
+    # Review counts at the /reviews/facets grain; '' stands for no subcategory
+    # or brand so every key column can be part of the primary key
+    category = db.Column(db.String(50), primary_key=True)
+    subcategory = db.Column(db.String(50), primary_key=True, default='')
+    brand = db.Column(db.String(50), primary_key=True, default='')
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    last_posted = db.Column(db.DateTime, nullable=True)
 
 
 class Blog(db.Model):
@@ -67,3 +118,49 @@ class Blog(db.Model):
     image_url = db.Column(db.String(255), nullable=True)
     author = db.Column(db.String(100), nullable=False)
     date_published = db.Column(db.Date, nullable=False)
+    # search_vector (generated tsvector, Postgres only) is added by migration
+    # 7d41c0e2b9f3 and queried through search.py; it is not mapped here.
+
+    # Indexes matching the sort paths in routes/blogs.py
+    __table_args__ = (
+        db.Index('ix_blogs_date_published_blog_id', 'date_published', 'blog_id'),
+        db.Index('ix_blogs_author_date_published', 'author', 'date_published'),
+    )
+
+
+class TableChange(db.Model):
+    __tablename__ = 'table_changes'
+
+    # Appended by a statement-level trigger on every write to table_name and
+    # folded into table_versions (see migration d2f7a4c81b30)
+    change_id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), db.Identity(), primary_key=True)
+    table_name = db.Column(db.String(64), nullable=False, index=True)
+
+
+class TableVersion(db.Model):
+    __tablename__ = 'table_versions'
+
+    table_name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+    # What readers compare: the folded count plus changes not folded yet
+    current_version = db.column_property(
+        version + db.select(db.func.count()).where(TableChange.table_name == table_name)
+        .correlate_except(TableChange).scalar_subquery()
+    )
+
+
+class TaxonomyTerm(db.Model):
+    __tablename__ = 'taxonomy_terms'
+
+    # kind is 'category', 'subcategory' or 'brand'; subcategories and brands name
+    # the category they belong to. Loaded by taxonomy.py (version in table_versions).
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    value = db.Column(db.String(50), nullable=False)
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('kind', 'category', 'value', name='uq_taxonomy_term'),
+    )
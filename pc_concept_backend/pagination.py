@@ -0,0 +1,99 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from sqlalchemy import tuple_
+
+
+class InvalidCursor(ValueError):
+    """Raised when a ?cursor= value cannot be decoded"""
+
+
+def cursor_requested(args):
+    """Cursor mode is opt-in: any ?cursor= parameter (even empty) enables it"""
+    return 'cursor' in args
+
+
+def encode_cursor(values):
+    """Encode the sort key of the last row into an opaque URL-safe token"""
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, columns):
+    """Decode a token produced by encode_cursor back into typed key values"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise InvalidCursor('Invalid cursor')
+
+    if not isinstance(payload, list) or len(payload) != len(columns):
+        raise InvalidCursor('Invalid cursor')
+
+    values = []
+    for column, value in zip(columns, payload):
+        python_type = column.type.python_type
+        try:
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            else:
+                value = python_type(value)
+        except (TypeError, ValueError):
+            raise InvalidCursor('Invalid cursor')
+        values.append(value)
+    return values
+
+
+def keyset_condition(columns, cursor, descending=False):
+    """WHERE clause selecting rows after the cursor's key, or None for the first page"""
+    if not cursor:
+        return None
+    key = tuple_(*columns) if len(columns) > 1 else columns[0]
+    values = decode_cursor(cursor, columns)
+    last = tuple_(*values) if len(values) > 1 else values[0]
+    return key < last if descending else key > last
+
+
+def keyset_order(columns, descending=False):
+    return [c.desc() if descending else c.asc() for c in columns]
+
+
+def keyset_page(rows, columns, per_page):
+    """Split per_page + 1 fetched rows into (items, next_cursor)"""
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last_row = items[-1]
+        next_cursor = encode_cursor([getattr(last_row, c.key) for c in columns])
+    return items, next_cursor
+
+
+def keyset_paginate(query, columns, cursor, per_page, descending=False, include_total=False):
+    """Paginate with WHERE (key) > (last key) instead of OFFSET
+
+    Args:
+        query: Unordered base query
+        columns: Sort key columns; the last one must be unique (primary key)
+        cursor: Token from a previous page's next_cursor, or empty for the first page
+        per_page: Page size
+        descending: Walk the key from newest to oldest
+        include_total: Also run COUNT(*) over the filtered query
+
+    Returns:
+        dict with items, next_cursor (None on the last page) and, if asked, total
+    """
+    result = {}
+    if include_total:
+        result['total'] = query.order_by(None).count()
+
+    condition = keyset_condition(columns, cursor, descending)
+    if condition is not None:
+        query = query.filter(condition)
+
+    rows = query.order_by(*keyset_order(columns, descending)).limit(per_page + 1).all()
+    result['items'], result['next_cursor'] = keyset_page(rows, columns, per_page)
+    return result
@@ -0,0 +1,217 @@
+"""Read-replica routing
+
+Replicas are configured with REPLICA_DATABASE_URLS (comma separated) and
+become SQLALCHEMY_BINDS 'replica_0', 'replica_1', ... GET/HEAD requests
+read from a healthy replica. These always use the primary:
+- writes (flushes and INSERT/UPDATE/DELETE statements);
+- every read after the first write in the same request;
+- requests from clients that wrote within REPLICA_STICKY_SECONDS
+  (read-your-writes). Write responses set a cookie for same-origin clients
+  and an X-Read-Primary-For header (seconds) for cross-origin ones, whose
+  requests don't carry the cookie; those send X-Read-Primary until then;
+- CLI commands and anything else outside a request.
+
+Staleness is measured with the table_versions change counters. Every
+REPLICA_CHECK_SECONDS a background thread samples the primary's counters
+and compares each replica with that history. A replica's lag is the age of
+the newest primary sample it has caught up with. A replica that lags more
+than REPLICA_MAX_LAG_SECONDS, or can't be reached, is skipped until a later
+check passes; with no healthy replica, reads fall back to the primary.
+Requests only read the last verdicts, so a dead replica never adds
+connect timeouts to live traffic.
+
+Responses read from a replica, and requests carrying the read-your-writes
+cookie, bypass the response cache (see ResponseCache.cached).
+"""
+import logging
+import random
+import threading
+import time
+from collections import deque
+from flask import current_app, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Delete, Insert, Update, event, select
+from sqlalchemy.exc import SQLAlchemyError
+
+logger = logging.getLogger(__name__)
+
+READ_PRIMARY_COOKIE = 'read_primary'
+READ_PRIMARY_HEADER = 'X-Read-Primary'
+READ_PRIMARY_FOR_HEADER = 'X-Read-Primary-For'
+READ_METHODS = ('GET', 'HEAD')
+
+
+class RoutingSession(Session):
+    """Session that sends reads to session.info['replica'] when one is set
+
+    Writes always go to the primary, and the first one drops the replica for
+    the rest of the session, so a request reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and 'replica' in self.info:
+            if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+                del self.info['replica']
+            else:
+                return self.info['replica']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _versions(conn):
+    from models import TableVersion
+    return dict(conn.execute(select(TableVersion.table_name, TableVersion.current_version)).all())
+
+
+class ReplicaRouter:
+    """Picks a replica engine for read-only requests and tracks replica health"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._db = None
+        self._primary = None
+        self._replicas = {}     # bind key -> engine
+        self._status = {}       # bind key -> {"healthy", "lag_seconds" | "error"}; replaced, never mutated
+        self._history = deque()  # (monotonic time, primary versions)
+        self._interval = 5
+        self._max_lag = 10
+        self._checker = None    # background thread running check()
+        self._stop = threading.Event()
+
+    def init_app(self, app, db):
+        self.reset()
+        bind_keys = sorted(k for k in app.config.get('SQLALCHEMY_BINDS') or {} if k.startswith('replica_'))
+        if not bind_keys:
+            return
+        self._db = db
+        self._interval = app.config.get('REPLICA_CHECK_SECONDS', 5)
+        self._max_lag = app.config.get('REPLICA_MAX_LAG_SECONDS', 10)
+        with app.app_context():
+            self._primary = db.engine
+            self._replicas = {key: db.engines[key] for key in bind_keys}
+        for key, engine in self._replicas.items():
+            event.listen(engine, 'handle_error', self._disconnect_handler(key))
+
+        app.before_request(self._route_request)
+        app.after_request(self._remember_write)
+        app.extensions['replica_router'] = self
+
+    def reset(self):
+        """Stop the checker and forget the replicas (create_app() called again, e.g. in tests)"""
+        self._stop.set()
+        with self._lock:
+            self._replicas = {}
+            self._status = {}
+            self._history.clear()
+            self._checker = None
+
+    @property
+    def enabled(self):
+        return bool(self._replicas)
+
+    def read_primary_requested(self):
+        """Whether the current request carries the read-your-writes cookie or header"""
+        return bool(request.cookies.get(READ_PRIMARY_COOKIE) or request.headers.get(READ_PRIMARY_HEADER))
+
+    def serving_from_replica(self):
+        """Whether the current request's reads are going to a replica"""
+        return 'replica' in self._db.session.info
+
+    def _disconnect_handler(self, key):
+        def handle_error(context):
+            # Stop routing to a replica that dropped its connection; the next check can restore it
+            if context.is_disconnect:
+                with self._lock:
+                    self._status = {**self._status, key: {"healthy": False, "error": "Connection lost"}}
+        return handle_error
+
+    def _route_request(self):
+        if request.method not in READ_METHODS or self.read_primary_requested():
+            return
+        key = self.choose()
+        if key is not None:
+            self._db.session.info['replica'] = self._replicas[key]
+
+    def _remember_write(self, response):
+        if request.method not in READ_METHODS and request.method != 'OPTIONS' and response.status_code < 400:
+            sticky = current_app.config.get('REPLICA_STICKY_SECONDS', 10)
+            response.set_cookie(READ_PRIMARY_COOKIE, '1', max_age=sticky, httponly=True, samesite='Lax')
+            response.headers[READ_PRIMARY_FOR_HEADER] = str(sticky)
+        return response
+
+    def choose(self):
+        """Bind key of a healthy replica, or None to use the primary
+
+        Only reads the background checker's last verdicts; until its first
+        check has finished, reads go to the primary.
+        """
+        self._ensure_checker()
+        healthy = [key for key, status in self._status.items() if status["healthy"]]
+        return random.choice(healthy) if healthy else None
+
+    def _ensure_checker(self):
+        # Started on first use rather than in init_app: threads don't survive gunicorn's fork
+        if self._checker is not None and self._checker.is_alive():
+            return
+        with self._lock:
+            if self._checker is not None and self._checker.is_alive():
+                return
+            self._stop = threading.Event()
+            self._checker = threading.Thread(
+                target=self._run_checks, args=(self._stop,), name='replica-check', daemon=True
+            )
+            self._checker.start()
+
+    def _run_checks(self, stop):
+        while not stop.is_set():
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Replica check failed")
+            stop.wait(self._interval)
+
+    def check(self):
+        """Sample the primary's counters and measure every replica's health and lag against them
+
+        Connections are made without holding the lock, so status() and
+        request routing never wait on a slow or unreachable database.
+        """
+        now = time.monotonic()
+        try:
+            with self._primary.connect() as conn:
+                primary = _versions(conn)
+        except SQLAlchemyError as e:
+            # Without the primary's counters there's nothing to compare; keep the last verdicts
+            logger.warning("Replica check skipped, primary unavailable: %s", e)
+            return
+
+        with self._lock:
+            self._history.append((now, primary))
+            # Keep enough samples to tell whether a replica is within max_lag
+            while len(self._history) > 1 and now - self._history[1][0] > self._max_lag:
+                self._history.popleft()
+            history = list(self._history)
+
+        statuses = {key: self._replica_status(engine, history, now) for key, engine in self._replicas.items()}
+        with self._lock:
+            # Replaced, not updated in place, so choose() can iterate it without the lock
+            self._status = {**self._status, **statuses}
+
+    def _replica_status(self, engine, history, now):
+        try:
+            with engine.connect() as conn:
+                versions = _versions(conn)
+        except SQLAlchemyError as e:
+            logger.warning("Replica %s unavailable: %s", engine.url.render_as_string(), e)
+            return {"healthy": False, "error": "Unavailable"}
+
+        for sampled_at, primary in reversed(history):
+            if all(versions.get(table, 0) >= version for table, version in primary.items()):
+                lag = now - sampled_at
+                return {"healthy": lag <= self._max_lag, "lag_seconds": round(lag, 1)}
+        # Behind even the oldest sample we kept
+        return {"healthy": False, "error": "Not caught up with the primary"}
+
+    def status(self):
+        """Last known health of each replica, for /health"""
+        with self._lock:
+            return {key: dict(status) for key, status in self._status.items()}
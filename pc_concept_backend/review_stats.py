@@ -0,0 +1,173 @@
+"""Review aggregates maintained incrementally on write
+
+product_review_stats holds one row per product (review count and newest
+review date), category_review_stats one row per category and
+review_facet_stats one row per (category, subcategory, brand). The review
+routes update them in the same transaction as the review itself, so readers
+get a primary-key lookup (or, for /reviews/facets, a scan of a few rows)
+instead of COUNT(*) over reviews.
+`flask rebuild-review-stats` recomputes the tables if they ever drift
+(e.g. after editing reviews directly in the database).
+"""
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from extensions import db, is_postgres, lift_statement_timeout
+from models import Product, Review, ProductReviewStats, CategoryReviewStats, ReviewFacetStats
+
+
+def _newest(model, posted):
+    """SET expression keeping the later of the stored and the new date"""
+    return case(
+        (or_(model.last_posted.is_(None), model.last_posted < posted), posted),
+        else_=model.last_posted
+    )
+
+
+def _facet_key(category, subcategory, brand):
+    """review_facet_stats primary key of a review ('' for no subcategory/brand)"""
+    return {'category': category, 'subcategory': subcategory or '', 'brand': brand or ''}
+
+
+def _reviews_matching(key):
+    """WHERE clause selecting the reviews counted by the stats row with this key"""
+    clauses = []
+    for name, value in key.items():
+        column = getattr(Review, name)
+        clauses.append(or_(column.is_(None), column == '') if value == '' else column == value)
+    return and_(*clauses)
+
+
+def _apply(model, key, delta, posted=None):
+    """Adjust one stats row by delta (atomic UPDATE); create it from reviews if missing
+
+    The create is an upsert: when a concurrent first review for the same key
+    commits the row first, the INSERT conflicts and applies delta to it
+    instead, so neither write fails or counts the other's review twice.
+
+    key: {column: value} of the row's primary key
+    posted: date of an added review, or None to recompute last_posted
+    (needed after a removal, when the newest review may be gone).
+    """
+    if posted is not None:
+        last_posted = _newest(model, posted)
+    else:
+        last_posted = select(func.max(Review.date_posted)).where(_reviews_matching(key)).scalar_subquery()
+
+    row = and_(*(getattr(model, name) == value for name, value in key.items()))
+    updated = db.session.execute(
+        update(model).where(row).values(
+            review_count=model.review_count + delta,
+            last_posted=last_posted
+        )
+    ).rowcount
+    if not updated:
+        count, newest = db.session.execute(
+            select(func.count(Review.review_id), func.max(Review.date_posted)).where(_reviews_matching(key))
+        ).one()
+        dialect_insert = pg_insert if is_postgres() else sqlite_insert
+        db.session.execute(
+            dialect_insert(model)
+            .values({**key, 'review_count': count, 'last_posted': newest})
+            .on_conflict_do_update(
+                index_elements=list(key),
+                set_={'review_count': model.review_count + delta, 'last_posted': last_posted}
+            )
+        )
+
+
+def record_review_added(review):
+    """Count a new review; call after it is added to the session, before commit"""
+    db.session.flush()
+    _apply(ProductReviewStats, {'product_id': review.product_id}, 1, review.date_posted)
+    _apply(CategoryReviewStats, {'category': review.category}, 1, review.date_posted)
+    _apply(ReviewFacetStats, _facet_key(review.category, review.subcategory, review.brand), 1, review.date_posted)
+
+
+def record_review_removed(review):
+    """Uncount a deleted review; call after session.delete(review), before commit"""
+    db.session.flush()
+    _apply(ProductReviewStats, {'product_id': review.product_id}, -1)
+    _apply(CategoryReviewStats, {'category': review.category}, -1)
+    _apply(ReviewFacetStats, _facet_key(review.category, review.subcategory, review.brand), -1)
+
+
+def record_review_recategorized(review, previous_category, previous_subcategory, previous_brand):
+    """Move a review between category and facet rollups; call before commit"""
+    previous_key = _facet_key(previous_category, previous_subcategory, previous_brand)
+    key = _facet_key(review.category, review.subcategory, review.brand)
+    if key == previous_key:
+        return
+    db.session.flush()
+    if review.category != previous_category:
+        _apply(CategoryReviewStats, {'category': previous_category}, -1)
+        _apply(CategoryReviewStats, {'category': review.category}, 1, review.date_posted)
+    _apply(ReviewFacetStats, previous_key, -1)
+    _apply(ReviewFacetStats, key, 1, review.date_posted)
+
+
+def create_product_stats(product_id):
+    """Start a product at zero reviews so later writes are plain UPDATEs"""
+    db.session.add(ProductReviewStats(product_id=product_id, review_count=0))
+
+
+def product_review_count(product_id):
+    """Review count for one product from its stats row (falls back to COUNT if missing)"""
+    count = db.session.query(ProductReviewStats.review_count).filter(
+        ProductReviewStats.product_id == product_id
+    ).scalar()
+    if count is None:
+        count = db.session.query(func.count(Review.review_id)).filter(
+            Review.product_id == product_id
+        ).scalar()
+    return count
+
+
+def rebuild_review_stats():
+    """Recompute the stats tables from reviews; returns (products, categories) row counts"""
+    # Aggregates over every review can outlast the per-request statement_timeout
+    lift_statement_timeout(db.session.connection())
+    db.session.execute(delete(ProductReviewStats))
+    db.session.execute(delete(CategoryReviewStats))
+    db.session.execute(delete(ReviewFacetStats))
+
+    product_rows = select(
+        Product.product_id,
+        func.count(Review.review_id),
+        func.max(Review.date_posted)
+    ).outerjoin(Review, Review.product_id == Product.product_id).group_by(Product.product_id)
+    products = db.session.execute(insert(ProductReviewStats).from_select(
+        ['product_id', 'review_count', 'last_posted'], product_rows
+    )).rowcount
+
+    category_rows = select(
+        Review.category,
+        func.count(Review.review_id),
+        func.max(Review.date_posted)
+    ).group_by(Review.category)
+    categories = db.session.execute(insert(CategoryReviewStats).from_select(
+        ['category', 'review_count', 'last_posted'], category_rows
+    )).rowcount
+
+    subcategory, brand = func.coalesce(Review.subcategory, ''), func.coalesce(Review.brand, '')
+    facet_rows = select(
+        Review.category, subcategory, brand,
+        func.count(Review.review_id),
+        func.max(Review.date_posted)
+    ).group_by(Review.category, subcategory, brand)
+    db.session.execute(insert(ReviewFacetStats).from_select(
+        ['category', 'subcategory', 'brand', 'review_count', 'last_posted'], facet_rows
+    ))
+
+    db.session.commit()
+    return products, categories
+
+
+@click.command('rebuild-review-stats')
+@with_appcontext
+def rebuild_review_stats_command():
+    """Recompute product_review_stats, category_review_stats and review_facet_stats from reviews"""
+    products, categories = rebuild_review_stats()
+    click.echo(f'Rebuilt review stats for {products} product(s) and {categories} categor(ies)')
@@ -0,0 +1,118 @@
+from quart import Blueprint, request, jsonify
+from sqlalchemy import select
+from models import Blog
+from async_db import async_db
+from async_views import cached, conditional
+from cache import request_key
+from pagination import cursor_requested, InvalidCursor
+from search import empty_tsquery_select, search_blogs_query
+from routes.blogs import BLOG_SUMMARY_COLUMNS, serialize_blog, validate_positive_int
+
+# Read-only blog routes for the ASGI app; same URLs and responses as routes/blogs.py
+blogs_bp = Blueprint('blogs', __name__)
+
+def blog_listing_select(full_content=False):
+    """select() counterpart of routes.blogs.blog_listing_query()"""
+    if full_content:
+        return select(Blog)
+    return select(*BLOG_SUMMARY_COLUMNS)
+
+def listing_args():
+    page = validate_positive_int(request.args.get('page', 1), 1)
+    per_page = validate_positive_int(request.args.get('per_page', 10), 10)
+    per_page = min(per_page, 50)
+    return page, per_page
+
+def listing_response(paginated, page, per_page, **extra):
+    return jsonify({
+        "blogs": [serialize_blog(b, include_full_content=False) for b in paginated.items],
+        "page": page,
+        "per_page": per_page,
+        "total": paginated.total,
+        "pages": paginated.pages,
+        **extra
+    }), 200
+
+@blogs_bp.route('/', methods=['GET'])
+@cached(lambda: request_key('blogs:list', request.args))
+async def get_blogs():
+    page, per_page = listing_args()
+    full_content = request.args.get('full_content', 'false').lower() == 'true'
+
+    # Opt-in keyset pagination (newest first) for infinite scroll
+    if cursor_requested(request.args):
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        try:
+            keyset = await async_db.keyset_paginate(
+                blog_listing_select(full_content), [Blog.date_published, Blog.blog_id],
+                request.args.get('cursor', ''), per_page,
+                descending=True, include_total=include_total
+            )
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+
+        result = {
+            "blogs": [serialize_blog(b, include_full_content=full_content) for b in keyset['items']],
+            "per_page": per_page,
+            "next_cursor": keyset['next_cursor']
+        }
+        if include_total:
+            result["total"] = keyset['total']
+        return jsonify(result), 200
+
+    stmt = blog_listing_select(full_content).order_by(Blog.date_published.desc())
+    paginated = await async_db.paginate(stmt, page, per_page)
+    return jsonify({
+        "blogs": [serialize_blog(b, include_full_content=full_content) for b in paginated.items],
+        "page": page,
+        "per_page": per_page,
+        "total": paginated.total,
+        "pages": paginated.pages
+    }), 200
+
+@blogs_bp.route('/latest', methods=['GET'])
+@conditional('blogs')
+@cached(lambda: request_key('blogs:latest', request.args))
+async def get_latest_blogs():
+    limit = validate_positive_int(request.args.get('limit', 5), 5)
+    limit = min(limit, 20)
+
+    blogs = await async_db.fetch_all(blog_listing_select().order_by(Blog.date_published.desc()).limit(limit))
+    return jsonify([serialize_blog(b, include_full_content=False, image_variant='card') for b in blogs]), 200
+
+@blogs_bp.route('/<int:blog_id>', methods=['GET'])
+@conditional('blogs')
+@cached(lambda blog_id: f'blog:{blog_id}')
+async def get_blog_by_id(blog_id):
+    blog = await async_db.session.get(Blog, blog_id)
+    if not blog:
+        return jsonify({'error': 'Blog not found'}), 404
+    return jsonify(serialize_blog(blog, include_full_content=True)), 200
+
+@blogs_bp.route('/search', methods=['GET'])
+async def search_blogs():
+    search_term = request.args.get('q', '').strip()
+
+    if not search_term:
+        return jsonify({'error': 'Search term is required (use ?q=search_term)'}), 400
+
+    if len(search_term) < 2:
+        return jsonify({'error': 'Search term must be at least 2 characters'}), 400
+
+    page, per_page = listing_args()
+    empty_tsquery = None
+    if async_db.is_postgres:
+        empty_tsquery = (await async_db.session.execute(empty_tsquery_select(search_term))).scalar()
+    stmt = search_blogs_query(
+        blog_listing_select(), search_term, postgres=async_db.is_postgres, empty_tsquery=empty_tsquery
+    )
+    paginated = await async_db.paginate(stmt, page, per_page)
+    return listing_response(paginated, page, per_page, search_term=search_term)
+
+@blogs_bp.route('/author/<string:author>', methods=['GET'])
+@cached(lambda author: request_key(f'blogs:author:{author}', request.args))
+async def get_blogs_by_author(author):
+    page, per_page = listing_args()
+    stmt = blog_listing_select().where(Blog.author == author).order_by(Blog.date_published.desc())
+    paginated = await async_db.paginate(stmt, page, per_page)
+    return listing_response(paginated, page, per_page, author=author)
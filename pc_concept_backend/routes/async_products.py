@@ -0,0 +1,214 @@
+from quart import Blueprint, current_app, request, jsonify
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+from models import Product, Review
+from async_db import async_db
+from async_views import cached, conditional
+from cache import request_key
+from facets import build_facets, facet_select
+from pagination import cursor_requested, InvalidCursor
+from search import search_products_query
+from taxonomy import current_taxonomy_async
+from routes.products import PRODUCT_CARD_COLUMNS, serialize_product, validate_positive_int
+from routes.async_reviews import product_review_count
+from routes.reviews import REVIEW_COLUMNS, serialize_reviews
+
+# Read-only product routes for the ASGI app; same URLs and responses as routes/products.py
+products_bp = Blueprint('products', __name__)
+
+def product_select(card_mode=False):
+    """select() counterpart of routes.products.product_query()"""
+    if card_mode:
+        return select(*PRODUCT_CARD_COLUMNS)
+    return select(Product).options(selectinload(Product.specifications))
+
+def taxonomy():
+    return current_taxonomy_async(async_db.engine, current_app.config.get('TAXONOMY_REFRESH_SECONDS', 30))
+
+def listing_args():
+    """(page, per_page, card_mode) with the sync listings' defaults and bounds"""
+    page = validate_positive_int(request.args.get('page', 1), 1)
+    per_page = validate_positive_int(request.args.get('per_page', 24), 24)
+    per_page = min(per_page, 100)
+    card_mode = request.args.get('card_mode', 'false').lower() == 'true'
+    return page, per_page, card_mode
+
+async def paginated_products_response(stmt, page, per_page, card_mode, **extra):
+    """routes.products.paginated_products_response() for select() statements"""
+    if cursor_requested(request.args):
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        try:
+            keyset = await async_db.keyset_paginate(
+                stmt, [Product.product_id],
+                request.args.get('cursor', ''), per_page, include_total=include_total
+            )
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+
+        result = {
+            "products": [serialize_product(p, card_mode=card_mode) for p in keyset['items']],
+            "per_page": per_page,
+            "next_cursor": keyset['next_cursor'],
+            **extra
+        }
+        if include_total:
+            result["total"] = keyset['total']
+        return jsonify(result), 200
+
+    paginated = await async_db.paginate(stmt.order_by(Product.product_id), page, per_page)
+    return listing_response(paginated, page, per_page, card_mode, **extra)
+
+def listing_response(paginated, page, per_page, card_mode, **extra):
+    return jsonify({
+        "products": [serialize_product(p, card_mode=card_mode) for p in paginated.items],
+        "page": page,
+        "per_page": per_page,
+        "total": paginated.total,
+        "pages": paginated.pages,
+        **extra
+    }), 200
+
+# GET all products (with pagination)
+@products_bp.route('/', methods=['GET'])
+@cached(lambda: request_key('products:list', request.args))
+async def get_products():
+    page, per_page, card_mode = listing_args()
+    return await paginated_products_response(product_select(card_mode), page, per_page, card_mode)
+
+# GET product by ID
+@products_bp.route('/<string:product_id>', methods=['GET'])
+@conditional('products', 'product_specifications')
+@cached(lambda product_id: f'product:{product_id}')
+async def get_product(product_id):
+    product = await async_db.fetch_first(product_select().where(Product.product_id == product_id))
+    if not product:
+        return jsonify({'error': 'Product not found'}), 404
+    return jsonify(serialize_product(product, card_mode=False)), 200
+
+# GET product detail bundle (product + specs + review summary)
+@products_bp.route('/<string:product_id>/detail', methods=['GET'])
+@conditional('products', 'product_specifications', 'reviews')
+async def get_product_detail(product_id):
+    reviews_limit = validate_positive_int(request.args.get('reviews_limit', 5), 5)
+    reviews_limit = min(reviews_limit, 20)
+
+    product = await async_db.fetch_first(
+        select(Product).options(joinedload(Product.specifications)).where(Product.product_id == product_id)
+    )
+    if not product:
+        return jsonify({'error': 'Product not found'}), 404
+
+    review_count = await product_review_count(product_id)
+
+    latest_reviews = []
+    if review_count:
+        latest_reviews = await async_db.fetch_all(
+            select(*REVIEW_COLUMNS).where(Review.product_id == product_id).order_by(
+                Review.date_posted.desc(), Review.review_id.desc()
+            ).limit(reviews_limit)
+        )
+
+    return jsonify({
+        "product": serialize_product(product, card_mode=False),
+        "review_count": review_count,
+        "reviews": serialize_reviews(latest_reviews, True, {product.product_id: product.name})
+    }), 200
+
+# GET products by category
+@products_bp.route('/category/<string:category>', methods=['GET'])
+@conditional('products', 'product_specifications')
+@cached(lambda category: request_key(f'products:category:{category}:', request.args))
+async def get_products_by_category(category):
+    rules = await taxonomy()
+    if category not in rules.categories:
+        return jsonify({'error': rules.invalid_category}), 400
+
+    page, per_page, card_mode = listing_args()
+    stmt = product_select(card_mode).where(Product.category == category).order_by(Product.product_id)
+    paginated = await async_db.paginate(stmt, page, per_page)
+    return listing_response(paginated, page, per_page, card_mode, category=category)
+
+# GET products by category and subcategory
+@products_bp.route('/category/<string:category>/subcategory/<string:subcategory>', methods=['GET'])
+@conditional('products', 'product_specifications')
+@cached(lambda category, subcategory: request_key(
+    f'products:category:{category}:subcategory:{subcategory}', request.args
+))
+async def get_products_by_category_subcategory(category, subcategory):
+    rules = await taxonomy()
+    if category not in rules.categories:
+        return jsonify({'error': rules.invalid_category}), 400
+    if not rules.subcategories[category]:
+        return jsonify({'error': rules.no_subcategories[category]}), 400
+    if subcategory not in rules.subcategories[category]:
+        return jsonify({'error': rules.invalid_subcategory[category]}), 400
+
+    page, per_page, card_mode = listing_args()
+    stmt = product_select(card_mode).where(
+        Product.category == category, Product.subcategory == subcategory
+    ).order_by(Product.product_id)
+    paginated = await async_db.paginate(stmt, page, per_page)
+    return listing_response(paginated, page, per_page, card_mode, category=category, subcategory=subcategory)
+
+# GET laptops by brand
+@products_bp.route('/category/Laptops/brand/<string:brand>', methods=['GET'])
+@conditional('products', 'product_specifications')
+@cached(lambda brand: request_key(f'products:category:Laptops:brand:{brand}', request.args))
+async def get_laptops_by_brand(brand):
+    rules = await taxonomy()
+    if brand not in rules.brands:
+        return jsonify({'error': rules.invalid_brand}), 400
+
+    page, per_page, card_mode = listing_args()
+    stmt = product_select(card_mode).where(Product.category == 'Laptops', Product.brand == brand).order_by(Product.product_id)
+    paginated = await async_db.paginate(stmt, page, per_page)
+    return listing_response(paginated, page, per_page, card_mode, category="Laptops", brand=brand)
+
+# FILTER products by category, subcategory, or brand
+@products_bp.route('/filter', methods=['GET'])
+async def filter_products():
+    category = request.args.get('category')
+    subcategory = request.args.get('subcategory')
+    brand = request.args.get('brand')
+    page, per_page, card_mode = listing_args()
+
+    error, brand, subcategory = (await taxonomy()).filter_rules(category, subcategory, brand)
+    if error:
+        return jsonify({"error": error}), 400
+
+    stmt = product_select(card_mode)
+    if category:
+        stmt = stmt.where(Product.category == category)
+        if subcategory:
+            stmt = stmt.where(Product.subcategory == subcategory)
+    if brand:
+        stmt = stmt.where(Product.brand == brand)
+
+    return await paginated_products_response(
+        stmt, page, per_page, card_mode,
+        category=category, subcategory=subcategory, brand=brand
+    )
+
+# GET product counts per category / subcategory / brand
+@products_bp.route('/facets', methods=['GET'])
+@conditional('products')
+@cached(lambda: 'products:facets')
+async def get_product_facets():
+    rows = await async_db.fetch_all(facet_select(Product))
+    return jsonify(build_facets(rows)), 200
+
+# SEARCH products by name
+@products_bp.route('/search', methods=['GET'])
+async def search_products():
+    search_term = request.args.get('q', '').strip()
+
+    if not search_term:
+        return jsonify({'error': 'Search term is required (use ?q=search_term)'}), 400
+
+    if len(search_term) < 2:
+        return jsonify({'error': 'Search term must be at least 2 characters'}), 400
+
+    page, per_page, card_mode = listing_args()
+    stmt = search_products_query(product_select(card_mode), search_term, postgres=async_db.is_postgres)
+    paginated = await async_db.paginate(stmt, page, per_page)
+    return listing_response(paginated, page, per_page, card_mode, search_term=search_term)
@@ -0,0 +1,150 @@
+from quart import Blueprint, current_app, request, jsonify
+from sqlalchemy import func, select
+from models import Product, Review, ProductReviewStats
+from async_db import async_db
+from async_views import cached, conditional
+from facets import build_facets, review_facet_select
+from pagination import cursor_requested, InvalidCursor
+from taxonomy import current_taxonomy_async
+from routes.reviews import REVIEW_COLUMNS, serialize_reviews, validate_positive_int
+
+# Read-only review routes for the ASGI app; same URLs and responses as routes/reviews.py
+reviews_bp = Blueprint('reviews', __name__)
+
+async def product_review_count(product_id):
+    """review_stats.product_review_count() on the async engine"""
+    count = (await async_db.session.execute(
+        select(ProductReviewStats.review_count).where(ProductReviewStats.product_id == product_id)
+    )).scalar()
+    if count is None:
+        count = (await async_db.session.execute(
+            select(func.count(Review.review_id)).where(Review.product_id == product_id)
+        )).scalar()
+    return count
+
+async def product_names_for(rows):
+    """{product_id: name} for a page of REVIEW_COLUMNS rows, in one IN lookup"""
+    product_ids = {row.product_id for row in rows}
+    if not product_ids:
+        return {}
+    name_rows = await async_db.fetch_all(
+        select(Product.product_id, Product.name).where(Product.product_id.in_(product_ids))
+    )
+    return {product_id: name for product_id, name in name_rows}
+
+async def reviews_payload(rows, include_product_name):
+    product_names = await product_names_for(rows) if include_product_name else None
+    return serialize_reviews(rows, include_product_name, product_names)
+
+def listing_args():
+    page = validate_positive_int(request.args.get('page', 1), 1)
+    per_page = validate_positive_int(request.args.get('per_page', 20), 20)
+    per_page = min(per_page, 100)
+    include_product_name = request.args.get('include_product_name', 'false').lower() == 'true'
+    return page, per_page, include_product_name
+
+# GET All Reviews (with pagination)
+@reviews_bp.route('/', methods=['GET'])
+async def get_reviews():
+    page, per_page, include_product_name = listing_args()
+
+    # Opt-in keyset pagination (newest first) for infinite scroll
+    if cursor_requested(request.args):
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        try:
+            keyset = await async_db.keyset_paginate(
+                select(*REVIEW_COLUMNS), [Review.date_posted, Review.review_id],
+                request.args.get('cursor', ''), per_page,
+                descending=True, include_total=include_total
+            )
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        result = {
+            "reviews": await reviews_payload(keyset['items'], include_product_name),
+            "per_page": per_page,
+            "next_cursor": keyset['next_cursor']
+        }
+        if include_total:
+            result["total"] = keyset['total']
+        return jsonify(result), 200
+
+    paginated = await async_db.paginate(
+        select(*REVIEW_COLUMNS).order_by(Review.date_posted.desc()), page, per_page
+    )
+    return jsonify({
+        "reviews": await reviews_payload(paginated.items, include_product_name),
+        "page": page,
+        "per_page": per_page,
+        "total": paginated.total,
+        "pages": paginated.pages
+    }), 200
+
+# GET Review by ID
+@reviews_bp.route('/<int:review_id>', methods=['GET'])
+async def get_review_by_id(review_id):
+    row = await async_db.fetch_first(select(*REVIEW_COLUMNS).where(Review.review_id == review_id))
+    if not row:
+        return jsonify({'error': 'Review not found'}), 404
+    return jsonify((await reviews_payload([row], True))[0]), 200
+
+# GET Reviews by Product ID
+@reviews_bp.route('/product/<string:product_id>', methods=['GET'])
+@conditional('reviews', 'products')
+async def get_reviews_by_product(product_id):
+    product = await async_db.fetch_first(
+        select(Product.product_id, Product.name).where(Product.product_id == product_id)
+    )
+    if not product:
+        return jsonify({'error': 'Product not found'}), 404
+    page, per_page, include_product_name = listing_args()
+    stmt = select(*REVIEW_COLUMNS).where(Review.product_id == product_id).order_by(Review.date_posted.desc())
+    # Total comes from the product's stats row rather than a COUNT over reviews
+    paginated = await async_db.paginate(stmt, page, per_page, count=False)
+    total = await product_review_count(product_id)
+    reviews = serialize_reviews(paginated.items, include_product_name, {product.product_id: product.name})
+    return jsonify({
+        "reviews": reviews,
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "pages": -(-total // per_page),
+        "product_id": product_id,
+        "product_name": product.name
+    }), 200
+
+# FILTER Reviews by Category, Subcategory, or Brand
+@reviews_bp.route('/filter', methods=['GET'])
+async def filter_reviews():
+    category = request.args.get('category')
+    subcategory = request.args.get('subcategory')
+    brand = request.args.get('brand')
+    page, per_page, include_product_name = listing_args()
+    taxonomy = await current_taxonomy_async(async_db.engine, current_app.config.get('TAXONOMY_REFRESH_SECONDS', 30))
+    error, brand, subcategory = taxonomy.filter_rules(category, subcategory, brand, fold_case=True)
+    if error:
+        return jsonify({"error": error}), 400
+
+    stmt = select(*REVIEW_COLUMNS)
+    if category:
+        stmt = stmt.where(Review.category == category)
+        if subcategory:
+            stmt = stmt.where(Review.subcategory == subcategory)
+    if brand:
+        stmt = stmt.where(Review.brand == brand)
+
+    paginated = await async_db.paginate(stmt.order_by(Review.date_posted.desc()), page, per_page)
+    return jsonify({
+        "reviews": await reviews_payload(paginated.items, include_product_name),
+        "page": page,
+        "per_page": per_page,
+        "total": paginated.total,
+        "pages": paginated.pages
+    }), 200
+
+# GET Review counts per Category, Subcategory and Brand
+@reviews_bp.route('/facets', methods=['GET'])
+@conditional('reviews')
+@cached(lambda: 'reviews:facets')
+async def get_review_facets():
+    rows = await async_db.fetch_all(review_facet_select())
+    return jsonify(build_facets(rows)), 200
@@ -0,0 +1,57 @@
+from quart import Blueprint, request, jsonify
+from sqlalchemy import select
+from models import ProductSpecification, Product
+from async_db import async_db
+from async_views import cached
+from routes.specifications import validate_positive_int
+
+# Read-only specification routes for the ASGI app; same URLs and responses as routes/specifications.py
+specs_bp = Blueprint('specs', __name__)
+
+SPEC_COLUMNS = (
+    ProductSpecification.spec_id, ProductSpecification.product_id,
+    ProductSpecification.spec_name, ProductSpecification.spec_value
+)
+
+def serialize_spec(row):
+    return {
+        "spec_id": row.spec_id,
+        "product_id": row.product_id,
+        "spec_name": row.spec_name,
+        "spec_value": row.spec_value
+    }
+
+# GET all product specifications (with pagination)
+@specs_bp.route('/', methods=['GET'])
+async def get_specs():
+    page = validate_positive_int(request.args.get('page', 1), 1)
+    per_page = validate_positive_int(request.args.get('per_page', 50), 50)
+    per_page = min(per_page, 200)
+
+    paginated = await async_db.paginate(select(*SPEC_COLUMNS), page, per_page)
+    return jsonify({
+        "specifications": [serialize_spec(s) for s in paginated.items],
+        "page": page,
+        "per_page": per_page,
+        "total": paginated.total,
+        "pages": paginated.pages
+    }), 200
+
+# GET specs by specification ID
+@specs_bp.route('/<int:spec_id>', methods=['GET'])
+async def get_spec_by_id(spec_id):
+    spec = await async_db.fetch_first(select(*SPEC_COLUMNS).where(ProductSpecification.spec_id == spec_id))
+    if not spec:
+        return jsonify({'error': 'Specification not found'}), 404
+    return jsonify(serialize_spec(spec)), 200
+
+# GET all specs for a specific product
+@specs_bp.route('/product/<string:product_id>', methods=['GET'])
+@cached(lambda product_id: f'specs:product:{product_id}')
+async def get_specs_by_product(product_id):
+    product = await async_db.fetch_first(select(Product.product_id).where(Product.product_id == product_id))
+    if not product:
+        return jsonify({'error': 'Product not found'}), 404
+
+    specs = await async_db.fetch_all(select(*SPEC_COLUMNS).where(ProductSpecification.product_id == product_id))
+    return jsonify([serialize_spec(s) for s in specs]), 200
@@ -1,10 +1,20 @@
 from flask import Blueprint, request, jsonify
 from models import Blog
 from datetime import datetime
-from extensions import db
+from extensions import db, cache
+from cache import request_key
+from pagination import cursor_requested, keyset_paginate, InvalidCursor
+from search import search_blogs_query
+from etags import conditional
+from images import variant_url, srcset
 
 blogs_bp = Blueprint('blogs', __name__)
 
+# Columns a summary needs; listings without full content never read body/conclusion
+BLOG_SUMMARY_COLUMNS = (
+    Blog.blog_id, Blog.title, Blog.author, Blog.date_published, Blog.image_url, Blog.introduction
+)
+
 def validate_positive_int(value, default):
     """Validate and return positive integer or default"""
     try:
@@ -24,8 +34,25 @@ def validate_date(date_string):
     except ValueError:
         return False, "Invalid date format. Use YYYY-MM-DD"
 
-def serialize_blog(blog, include_full_content=True):
-    """Serialize blog to dictionary"""
+def blog_listing_query(full_content=False):
+    """Blog entities when body/conclusion are returned, otherwise BLOG_SUMMARY_COLUMNS row tuples"""
+    if full_content:
+        return Blog.query
+    return db.session.query(*BLOG_SUMMARY_COLUMNS)
+
+def invalidate_blog_cache(blog_id=None):
+    """Drop cached responses that can contain this blog: its own and every listing"""
+    if blog_id is not None:
+        cache.delete(f'blog:{blog_id}')
+    cache.delete_prefix('blogs:')
+
+def serialize_blog(blog, include_full_content=True, image_variant=None):
+    """Serialize blog to dictionary
+
+    Args:
+        blog: Blog model instance (or a BLOG_SUMMARY_COLUMNS row without full content)
+        image_variant: Return a resized image (see images.IMAGE_VARIANTS) plus srcset
+    """
     result = {
         "blog_id": blog.blog_id,
         "title": blog.title,
@@ -35,6 +62,10 @@ def serialize_blog(blog, include_full_content=True):
         "introduction": blog.introduction
     }
     
+    if image_variant:
+        result["image_url"] = variant_url(blog.image_url, image_variant)
+        result["image_srcset"] = srcset(blog.image_url)
+    
     if include_full_content:
         result["body"] = blog.body
         result["conclusion"] = blog.conclusion
@@ -43,6 +74,7 @@ def serialize_blog(blog, include_full_content=True):
     return result
 
 @blogs_bp.route('/', methods=['GET'])
+@cache.cached(lambda: request_key('blogs:list'))
 def get_blogs():
     """Get all blogs with pagination"""
     page = validate_positive_int(request.args.get('page', 1), 1)
@@ -51,7 +83,28 @@ def get_blogs():
     
     full_content = request.args.get('full_content', 'false').lower() == 'true'
     
-    query = Blog.query.order_by(Blog.date_published.desc())
+    # Opt-in keyset pagination (newest first) for infinite scroll
+    if cursor_requested(request.args):
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        try:
+            keyset = keyset_paginate(
+                blog_listing_query(full_content), [Blog.date_published, Blog.blog_id],
+                request.args.get('cursor', ''), per_page,
+                descending=True, include_total=include_total
+            )
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        
+        result = {
+            "blogs": [serialize_blog(b, include_full_content=full_content) for b in keyset['items']],
+            "per_page": per_page,
+            "next_cursor": keyset['next_cursor']
+        }
+        if include_total:
+            result["total"] = keyset['total']
+        return jsonify(result), 200
+    
+    query = blog_listing_query(full_content).order_by(Blog.date_published.desc())
     paginated = query.paginate(page=page, per_page=per_page, error_out=False)
     
     output = []
@@ -67,20 +120,24 @@ def get_blogs():
     }), 200
 
 @blogs_bp.route('/latest', methods=['GET'])
+@conditional('blogs')
+@cache.cached(lambda: request_key('blogs:latest'))
 def get_latest_blogs():
     """Get the most recent blogs (default 5)"""
     limit = validate_positive_int(request.args.get('limit', 5), 5)
     limit = min(limit, 20)
     
-    blogs = Blog.query.order_by(Blog.date_published.desc()).limit(limit).all()
+    blogs = blog_listing_query().order_by(Blog.date_published.desc()).limit(limit).all()
     
     output = []
     for b in blogs:
-        output.append(serialize_blog(b, include_full_content=False))
+        output.append(serialize_blog(b, include_full_content=False, image_variant='card'))
     
     return jsonify(output), 200
 
 @blogs_bp.route('/<int:blog_id>', methods=['GET'])
+@conditional('blogs')
+@cache.cached(lambda blog_id: f'blog:{blog_id}')
 def get_blog_by_id(blog_id):
     """Get a single blog by ID with full content"""
     blog = Blog.query.get(blog_id)
@@ -105,14 +162,9 @@ def search_blogs():
     per_page = validate_positive_int(request.args.get('per_page', 10), 10)
     per_page = min(per_page, 50)
     
-    query = Blog.query.filter(
-        db.or_(
-            Blog.title.ilike(f'%{search_term}%'),
-            Blog.introduction.ilike(f'%{search_term}%'),
-            Blog.body.ilike(f'%{search_term}%'),
-            Blog.conclusion.ilike(f'%{search_term}%')
-        )
-    ).order_by(Blog.date_published.desc())
+    # Full-text search over title and content (GIN-indexed tsvector on Postgres), ranked by relevance;
+    # ILIKE when every word is a stopword
+    query = search_blogs_query(blog_listing_query(), search_term)
     
     paginated = query.paginate(page=page, per_page=per_page, error_out=False)
     
@@ -130,13 +182,14 @@ def search_blogs():
     }), 200
 
 @blogs_bp.route('/author/<string:author>', methods=['GET'])
+@cache.cached(lambda author: request_key(f'blogs:author:{author}'))
 def get_blogs_by_author(author):
     """Get all blogs by a specific author"""
     page = validate_positive_int(request.args.get('page', 1), 1)
     per_page = validate_positive_int(request.args.get('per_page', 10), 10)
     per_page = min(per_page, 50)
     
-    query = Blog.query.filter_by(author=author).order_by(Blog.date_published.desc())
+    query = blog_listing_query().filter(Blog.author == author).order_by(Blog.date_published.desc())
     paginated = query.paginate(page=page, per_page=per_page, error_out=False)
     
     output = []
@@ -218,6 +271,7 @@ def add_blog():
         
         db.session.add(new_blog)
         db.session.commit()
+        invalidate_blog_cache()
         
         return jsonify({
             "message": "Blog added successfully!",
@@ -297,6 +351,7 @@ def update_blog(blog_id):
                 blog.date_published = date_result
         
         db.session.commit()
+        invalidate_blog_cache(blog_id)
         return jsonify({"message": "Blog updated successfully!"}), 200
     
     except Exception as e:
@@ -314,6 +369,7 @@ def delete_blog(blog_id):
     try:
         db.session.delete(blog)
         db.session.commit()
+        invalidate_blog_cache(blog_id)
         return jsonify({"message": "Blog deleted successfully!"}), 200
     
     except Exception as e:
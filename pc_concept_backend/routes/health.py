@@ -0,0 +1,115 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from flask import Blueprint, current_app, jsonify
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+from extensions import db, replicas
+
+health_bp = Blueprint('health', __name__)
+
+# Probes run here so a hung database or an exhausted pool can't hang the check itself
+_probe_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='health-probe')
+
+def pool_status(engine):
+    """Connection pool counters from the engine
+
+    For QueuePool: size (persistent connections), checked_in, checked_out,
+    overflow (connections opened beyond size), max_overflow and capacity
+    (None when overflow is unlimited). Other pools report only their class.
+    """
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        size = pool.size()
+        max_overflow = pool._max_overflow
+        capacity = size + max_overflow if max_overflow >= 0 else None
+        checked_out = pool.checkedout()
+        status.update({
+            "size": size,
+            "checked_in": pool.checkedin(),
+            "checked_out": checked_out,
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": max_overflow,
+            "capacity": capacity,
+            "utilization": round(checked_out / capacity, 3) if capacity else None,
+            "timeout": pool.timeout()
+        })
+    return status
+
+def _probe(engine, timeout):
+    """Check out a connection and run SELECT 1; returns (checkout seconds, total seconds)"""
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        checked_out = time.perf_counter()
+        if conn.dialect.name == 'postgresql':
+            # Bounds the query on the server too; reset when the transaction ends
+            conn.execute(text(f'SET LOCAL statement_timeout = {int(timeout * 1000)}'))
+        conn.execute(text('SELECT 1'))
+        conn.rollback()
+    return checked_out - started, time.perf_counter() - started
+
+def database_check(engine, timeout):
+    """Round-trip to the database bounded by timeout seconds"""
+    future = _probe_executor.submit(_probe, engine, timeout)
+    try:
+        checkout, total = future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        return {"ok": False, "error": f"No response within {timeout}s"}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+    return {
+        "ok": True,
+        "latency_ms": round(total * 1000, 2),
+        "checkout_wait_ms": round(checkout * 1000, 2)
+    }
+
+def health_payload():
+    engine = db.engine
+    # Pool counters first, so the probe's own checkout isn't counted
+    pool = pool_status(engine)
+    if pool.get("capacity") and pool["checked_out"] >= pool["capacity"]:
+        # A probe would only queue behind the request threads for pool.timeout seconds
+        check = {"ok": False, "error": f"Connection pool exhausted ({pool['checked_out']} checked out)"}
+    else:
+        check = database_check(engine, current_app.config.get('HEALTH_CHECK_TIMEOUT', 2.0))
+    payload = {
+        "status": "healthy" if check["ok"] else "unhealthy",
+        "database": "connected" if check["ok"] else "unavailable",
+        "pool": pool
+    }
+    if replicas.enabled:
+        payload["replicas"] = replicas.status()
+    if check["ok"]:
+        payload["latency_ms"] = check["latency_ms"]
+        payload["checkout_wait_ms"] = check["checkout_wait_ms"]
+    else:
+        payload["error"] = check["error"]
+    return payload
+
+# GET Health: database round-trip + pool stats (503 if the database is unreachable)
+@health_bp.route('', methods=['GET'])
+def health():
+    """Check the database with a bounded SELECT 1 and report pool stats"""
+    payload = health_payload()
+    return jsonify(payload), 200 if payload["status"] == "healthy" else 503
+
+# GET Readiness: also fails when the pool is close to exhausted
+@health_bp.route('/ready', methods=['GET'])
+def readiness():
+    """Like /health, but 503 once pool utilization reaches HEALTH_POOL_SATURATION
+
+    Lets the load balancer take a saturated worker out of rotation before
+    requests start queueing for connections.
+    """
+    payload = health_payload()
+    ready = payload["status"] == "healthy"
+
+    utilization = payload["pool"].get("utilization")
+    threshold = current_app.config.get('HEALTH_POOL_SATURATION', 0.9)
+    if ready and utilization is not None and utilization >= threshold:
+        ready = False
+        payload["error"] = f"Connection pool saturated ({utilization:.0%} checked out)"
+
+    payload["ready"] = ready
+    return jsonify(payload), 200 if ready else 503
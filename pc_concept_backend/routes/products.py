@@ -1,19 +1,23 @@
-from flask import Blueprint, request, jsonify
-from models import Product, ProductSpecification, Review
+import csv
+import io
+import json
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from models import Product, ProductSpecification, Review, ProductReviewStats
 from sqlalchemy.exc import IntegrityError
-from extensions import db
+from sqlalchemy.orm import selectinload, joinedload
+from extensions import db, cache
+from cache import request_key
+from etags import conditional
+from routes.reviews import review_rows, serialize_reviews
+from images import variant_url, srcset
+from facets import facet_counts
+from pagination import cursor_requested, keyset_paginate, InvalidCursor
+from search import search_products_query
+from review_stats import create_product_stats, product_review_count
+from taxonomy import current_taxonomy
 
 products_bp = Blueprint('products', __name__)
 
-# Constants for validation
-VALID_CATEGORIES = ['Laptops', 'Desktop/PCs', 'Components', 'Accessories', 'Speakers']
-VALID_BRANDS = ['ACER', 'ASUS', 'LENOVO', 'NINGMEI']
-VALID_SUBCATEGORIES = {
-    'Desktop/PCs': ['PC Bundles', 'PC Monitors', 'System Units'],
-    'Components': ['Cooling Systems', 'PC Cases'],
-    'Accessories': ['Headset', 'Keyboard', 'Mouse']
-}
-
 # Server-side validation & sanitization
 def validate_positive_int(value, default):
     """Validate and return positive integer or default"""
@@ -37,17 +41,18 @@ def serialize_product(product, include_specs=False, card_mode=False):
     """Serialize product to dictionary
     
     Args:
-        product: Product model instance
+        product: Product model instance (or a PRODUCT_CARD_COLUMNS row in card mode)
         include_specs: Include product specifications (DEPRECATED - always include when card_mode=False)
         card_mode: Return minimal data for product cards (default: False)
     """
     if card_mode:
-        # ✅ Minimal data for product cards: id, name, price, image_url only
+        # ✅ Minimal data for product cards: id, name, price, card-sized image + srcset
         return {
             "product_id": product.product_id,
             "name": product.name,
             "price": float(product.price),
-            "image_url": product.image_url
+            "image_url": variant_url(product.image_url, 'card'),
+            "image_srcset": srcset(product.image_url)
         }
     
     # ✅ FIXED: Full product data - ALWAYS include specifications when card_mode=False
@@ -68,18 +73,64 @@ def serialize_product(product, include_specs=False, card_mode=False):
     
     return result
 
-# GET all products (with pagination)
-@products_bp.route('/', methods=['GET'])
-def get_products():
-    """Get all products with pagination"""
-    page = validate_positive_int(request.args.get('page', 1), 1)
-    per_page = validate_positive_int(request.args.get('per_page', 24), 24)
-    per_page = min(per_page, 100)  # Max 100 items per page
-    
-    # ✅ REMOVED include_specs parameter - always included when card_mode=False
-    card_mode = request.args.get('card_mode', 'false').lower() == 'true'
+# Columns serialize_product reads in card mode
+PRODUCT_CARD_COLUMNS = (Product.product_id, Product.name, Product.price, Product.image_url)
+
+def product_query(card_mode=False):
+    """Base product query for listings
+
+    Card mode selects only PRODUCT_CARD_COLUMNS as plain row tuples: no
+    brand/category columns, no ORM entities or identity map.
+    Full-mode serialization touches product.specifications on every row, so
+    specs are loaded for the whole page in one extra IN query instead of one
+    SELECT per product.
+    """
+    if card_mode:
+        return db.session.query(*PRODUCT_CARD_COLUMNS)
+    return Product.query.options(selectinload(Product.specifications))
+
+def invalidate_product_cache(product_id, *categories):
+    """Drop cached responses that can contain this product
+
+    Args:
+        product_id: Product whose detail and spec responses are dropped
+        categories: Categories whose listings may include it (old and new on update)
+    """
+    cache.delete(f'product:{product_id}', f'specs:product:{product_id}', 'products:facets')
+    cache.delete_prefix('products:list')
+    for category in set(categories):
+        if category:
+            cache.delete_prefix(f'products:category:{category}:')
+
+def paginated_products_response(query, page, per_page, card_mode, **extra):
+    """Page a product query, by page number or (with ?cursor=) by product_id keyset
+
+    Args:
+        query: Unordered product query
+        extra: Additional fields echoed in the response (e.g. the active filters)
+    """
+    # Opt-in keyset pagination: cost stays flat no matter how deep the page is
+    if cursor_requested(request.args):
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        try:
+            keyset = keyset_paginate(
+                query, [Product.product_id],
+                request.args.get('cursor', ''), per_page, include_total=include_total
+            )
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        
+        result = {
+            "products": [serialize_product(p, card_mode=card_mode) for p in keyset['items']],
+            "per_page": per_page,
+            "next_cursor": keyset['next_cursor'],
+            **extra
+        }
+        if include_total:
+            result["total"] = keyset['total']
+        return jsonify(result), 200
     
-    paginated = Product.query.paginate(page=page, per_page=per_page, error_out=False)
+    paginated = query.order_by(Product.product_id).paginate(page=page, per_page=per_page, error_out=False)
     
     # ✅ FIXED: Simplified - specifications automatically included based on card_mode
     products = [serialize_product(p, card_mode=card_mode) for p in paginated.items]
@@ -89,11 +140,28 @@ def get_products():
         "page": page,
         "per_page": per_page,
         "total": paginated.total,
-        "pages": paginated.pages
+        "pages": paginated.pages,
+        **extra
     }), 200
 
+# GET all products (with pagination)
+@products_bp.route('/', methods=['GET'])
+@cache.cached(lambda: request_key('products:list'))
+def get_products():
+    """Get all products with pagination"""
+    page = validate_positive_int(request.args.get('page', 1), 1)
+    per_page = validate_positive_int(request.args.get('per_page', 24), 24)
+    per_page = min(per_page, 100)  # Max 100 items per page
+    
+    # ✅ REMOVED include_specs parameter - always included when card_mode=False
+    card_mode = request.args.get('card_mode', 'false').lower() == 'true'
+    
+    return paginated_products_response(product_query(card_mode), page, per_page, card_mode)
+
 # GET product by ID
 @products_bp.route('/<string:product_id>', methods=['GET'])
+@conditional('products', 'product_specifications')
+@cache.cached(lambda product_id: f'product:{product_id}')
 def get_product(product_id):
     """Get a single product by ID with specifications"""
     product = Product.query.filter_by(product_id=product_id).first()
@@ -106,6 +174,38 @@ def get_product(product_id):
     
     return jsonify(result), 200
 
+# GET product detail bundle (product + specs + review summary)
+@products_bp.route('/<string:product_id>/detail', methods=['GET'])
+@conditional('products', 'product_specifications', 'reviews')
+def get_product_detail(product_id):
+    """Get a product with its specifications, review count and latest reviews
+
+    Replaces separate calls to /products/<id>, /specs/product/<id> and
+    /reviews/product/<id> with three queries: product + specs (joined),
+    review count (from product_review_stats), latest reviews.
+    """
+    reviews_limit = validate_positive_int(request.args.get('reviews_limit', 5), 5)
+    reviews_limit = min(reviews_limit, 20)
+    
+    product = Product.query.options(joinedload(Product.specifications)).filter_by(product_id=product_id).first()
+    
+    if not product:
+        return jsonify({'error': 'Product not found'}), 404
+    
+    review_count = product_review_count(product_id)
+    
+    latest_reviews = []
+    if review_count:
+        latest_reviews = review_rows().filter(Review.product_id == product_id).order_by(
+            Review.date_posted.desc(), Review.review_id.desc()
+        ).limit(reviews_limit).all()
+    
+    return jsonify({
+        "product": serialize_product(product, card_mode=False),
+        "review_count": review_count,
+        "reviews": serialize_reviews(latest_reviews, True, {product.product_id: product.name})
+    }), 200
+
 # ADD new product (CREATE)
 @products_bp.route('/', methods=['POST'])
 def add_product():
@@ -122,43 +222,20 @@ def add_product():
             return jsonify({'error': f'Missing required field: {field}'}), 400
     
     # Validate category
+    taxonomy = current_taxonomy()
     category = data['category']
-    if category not in VALID_CATEGORIES:
-        return jsonify({'error': f'Invalid category. Must be one of: {VALID_CATEGORIES}'}), 400
+    if category not in taxonomy.categories:
+        return jsonify({'error': taxonomy.invalid_category}), 400
     
     # Validate price
     is_valid, price_result = validate_positive_number(data['price'], 'Price')
     if not is_valid:
         return jsonify({'error': price_result}), 400
     
-    # Get optional fields
-    brand = data.get('brand')
-    subcategory = data.get('subcategory')
-    
-    # Validate brand if provided
-    if brand and brand not in VALID_BRANDS:
-        return jsonify({'error': f'Invalid brand. Must be one of: {VALID_BRANDS}'}), 400
-    
-    # Validate subcategory if provided
-    if subcategory:
-        valid_subs = VALID_SUBCATEGORIES.get(category, [])
-        if subcategory not in valid_subs:
-            return jsonify({'error': f'Invalid subcategory for {category}. Must be one of: {valid_subs}'}), 400
-    
-    # Apply category-specific rules
-    if category == 'Laptops':
-        if not brand:
-            return jsonify({'error': 'Laptops must have a brand'}), 400
-        subcategory = None  # Laptops don't have subcategories
-    
-    elif category in ['Desktop/PCs', 'Components', 'Accessories']:
-        if not subcategory:
-            return jsonify({'error': f'{category} must have a subcategory'}), 400
-        brand = None  # These categories don't use brands
-    
-    elif category == 'Speakers':
-        subcategory = None
-        brand = None
+    # Validate brand/subcategory and apply category-specific rules
+    error, brand, subcategory = taxonomy.apply_category_rules(category, data.get('brand'), data.get('subcategory'))
+    if error:
+        return jsonify({'error': error}), 400
     
     # Check if product_id already exists
     existing = Product.query.filter_by(product_id=data['product_id']).first()
@@ -177,7 +254,9 @@ def add_product():
         )
         
         db.session.add(new_product)
+        create_product_stats(new_product.product_id)
         db.session.commit()
+        invalidate_product_cache(new_product.product_id, category)
         
         return jsonify({
             "message": "Product added successfully!",
@@ -205,11 +284,13 @@ def update_product(product_id):
     if not data:
         return jsonify({'error': 'No data provided'}), 400
     
+    taxonomy = current_taxonomy()
+    
     # Validate category if provided
     if 'category' in data:
         category = data['category']
-        if category not in VALID_CATEGORIES:
-            return jsonify({'error': f'Invalid category. Must be one of: {VALID_CATEGORIES}'}), 400
+        if category not in taxonomy.categories:
+            return jsonify({'error': taxonomy.invalid_category}), 400
     else:
         category = product.category
     
@@ -221,26 +302,22 @@ def update_product(product_id):
     
     # Validate brand if provided
     if 'brand' in data and data['brand']:
-        if data['brand'] not in VALID_BRANDS:
-            return jsonify({'error': f'Invalid brand. Must be one of: {VALID_BRANDS}'}), 400
+        if data['brand'] not in taxonomy.brands:
+            return jsonify({'error': taxonomy.invalid_brand}), 400
     
     # Validate subcategory if provided
     if 'subcategory' in data and data['subcategory']:
-        valid_subs = VALID_SUBCATEGORIES.get(category, [])
-        if data['subcategory'] not in valid_subs:
-            return jsonify({'error': f'Invalid subcategory for {category}. Must be one of: {valid_subs}'}), 400
+        if data['subcategory'] not in taxonomy.subcategories[category]:
+            return jsonify({'error': taxonomy.invalid_subcategory[category]}), 400
     
-    # Apply category-specific rules
-    brand = data.get('brand', product.brand)
-    subcategory = data.get('subcategory', product.subcategory)
+    previous_category = product.category
     
-    if category == 'Laptops':
-        subcategory = None
-    elif category in ['Desktop/PCs', 'Components', 'Accessories']:
-        brand = None
-    elif category == 'Speakers':
-        subcategory = None
-        brand = None
+    # Apply category-specific rules
+    brand, subcategory = taxonomy.clear_unused_fields(
+        category,
+        data.get('brand', product.brand),
+        data.get('subcategory', product.subcategory)
+    )
     
     try:
         product.name = data.get('name', product.name).strip() if 'name' in data else product.name
@@ -251,6 +328,7 @@ def update_product(product_id):
         product.image_url = data.get('image_url', product.image_url).strip() if 'image_url' in data else product.image_url
         
         db.session.commit()
+        invalidate_product_cache(product_id, previous_category, category)
         return jsonify({"message": "Product updated successfully!"}), 200
     
     except Exception as e:
@@ -267,7 +345,7 @@ def delete_product(product_id):
         return jsonify({'error': 'Product not found'}), 404
     
     # Check if product has reviews
-    review_count = Review.query.filter_by(product_id=product_id).count()
+    review_count = product_review_count(product_id)
     if review_count > 0:
         return jsonify({
             'error': f'Cannot delete product. It has {review_count} review(s). Delete reviews first.'
@@ -276,9 +354,12 @@ def delete_product(product_id):
     try:
         # Delete associated specifications first
         ProductSpecification.query.filter_by(product_id=product_id).delete()
+        ProductReviewStats.query.filter_by(product_id=product_id).delete()
         
+        category = product.category
         db.session.delete(product)
         db.session.commit()
+        invalidate_product_cache(product_id, category)
         return jsonify({"message": "Product deleted successfully!"}), 200
     
     except Exception as e:
@@ -289,11 +370,14 @@ def delete_product(product_id):
 
 # GET products by category
 @products_bp.route('/category/<string:category>', methods=['GET'])
+@conditional('products', 'product_specifications')
+@cache.cached(lambda category: request_key(f'products:category:{category}:'))
 def get_products_by_category(category):
     """Get products by category with pagination"""
     # Validate category
-    if category not in VALID_CATEGORIES:
-        return jsonify({'error': f'Invalid category. Must be one of: {VALID_CATEGORIES}'}), 400
+    taxonomy = current_taxonomy()
+    if category not in taxonomy.categories:
+        return jsonify({'error': taxonomy.invalid_category}), 400
     
     page = validate_positive_int(request.args.get('page', 1), 1)
     per_page = validate_positive_int(request.args.get('per_page', 24), 24)
@@ -301,7 +385,7 @@ def get_products_by_category(category):
     
     card_mode = request.args.get('card_mode', 'false').lower() == 'true'
     
-    q = Product.query.filter_by(category=category)
+    q = product_query(card_mode).filter(Product.category == category).order_by(Product.product_id)
     pagination = q.paginate(page=page, per_page=per_page, error_out=False)
     
     products = [serialize_product(p, card_mode=card_mode) for p in pagination.items]
@@ -317,18 +401,20 @@ def get_products_by_category(category):
 
 # GET products by category and subcategory
 @products_bp.route('/category/<string:category>/subcategory/<string:subcategory>', methods=['GET'])
+@conditional('products', 'product_specifications')
+@cache.cached(lambda category, subcategory: request_key(f'products:category:{category}:subcategory:{subcategory}'))
 def get_products_by_category_subcategory(category, subcategory):
     """Get products by category and subcategory"""
     # Validate category
-    if category not in VALID_CATEGORIES:
-        return jsonify({'error': f'Invalid category. Must be one of: {VALID_CATEGORIES}'}), 400
+    taxonomy = current_taxonomy()
+    if category not in taxonomy.categories:
+        return jsonify({'error': taxonomy.invalid_category}), 400
     
     # Validate subcategory
-    valid_subs = VALID_SUBCATEGORIES.get(category, [])
-    if not valid_subs:
-        return jsonify({'error': f'{category} does not have subcategories'}), 400
-    if subcategory not in valid_subs:
-        return jsonify({'error': f'Invalid subcategory for {category}. Must be one of: {valid_subs}'}), 400
+    if not taxonomy.subcategories[category]:
+        return jsonify({'error': taxonomy.no_subcategories[category]}), 400
+    if subcategory not in taxonomy.subcategories[category]:
+        return jsonify({'error': taxonomy.invalid_subcategory[category]}), 400
     
     page = validate_positive_int(request.args.get('page', 1), 1)
     per_page = validate_positive_int(request.args.get('per_page', 24), 24)
@@ -336,7 +422,9 @@ def get_products_by_category_subcategory(category, subcategory):
     
     card_mode = request.args.get('card_mode', 'false').lower() == 'true'
     
-    q = Product.query.filter_by(category=category, subcategory=subcategory)
+    q = product_query(card_mode).filter(
+        Product.category == category, Product.subcategory == subcategory
+    ).order_by(Product.product_id)
     pagination = q.paginate(page=page, per_page=per_page, error_out=False)
     
     products = [serialize_product(p, card_mode=card_mode) for p in pagination.items]
@@ -353,11 +441,14 @@ def get_products_by_category_subcategory(category, subcategory):
 
 # GET laptops by brand
 @products_bp.route('/category/Laptops/brand/<string:brand>', methods=['GET'])
+@conditional('products', 'product_specifications')
+@cache.cached(lambda brand: request_key(f'products:category:Laptops:brand:{brand}'))
 def get_laptops_by_brand(brand):
     """Get laptops by brand"""
     # Validate brand
-    if brand not in VALID_BRANDS:
-        return jsonify({'error': f'Invalid brand. Must be one of: {VALID_BRANDS}'}), 400
+    taxonomy = current_taxonomy()
+    if brand not in taxonomy.brands:
+        return jsonify({'error': taxonomy.invalid_brand}), 400
     
     page = validate_positive_int(request.args.get('page', 1), 1)
     per_page = validate_positive_int(request.args.get('per_page', 24), 24)
@@ -365,7 +456,7 @@ def get_laptops_by_brand(brand):
     
     card_mode = request.args.get('card_mode', 'false').lower() == 'true'
     
-    q = Product.query.filter_by(category='Laptops', brand=brand)
+    q = product_query(card_mode).filter(Product.category == 'Laptops', Product.brand == brand).order_by(Product.product_id)
     pagination = q.paginate(page=page, per_page=per_page, error_out=False)
     
     products = [serialize_product(p, card_mode=card_mode) for p in pagination.items]
@@ -385,62 +476,111 @@ def get_laptops_by_brand(brand):
 # FILTER products by category, subcategory, or brand
 @products_bp.route('/filter', methods=['GET'])
 def filter_products():
-    """Filter products by category, subcategory, or brand"""
+    """Filter products by category, subcategory, or brand (paginated like the other listings)"""
     category = request.args.get('category')
     subcategory = request.args.get('subcategory')
     brand = request.args.get('brand')
     
+    page = validate_positive_int(request.args.get('page', 1), 1)
+    per_page = validate_positive_int(request.args.get('per_page', 24), 24)
+    per_page = min(per_page, 100)  # Hard bound on rows materialized per request
+    
     card_mode = request.args.get('card_mode', 'false').lower() == 'true'
     
-    query = Product.query
+    # Category-specific filtering rules (Laptops: brand only, subcategory
+    # categories: subcategory only, Speakers: neither)
+    error, brand, subcategory = current_taxonomy().filter_rules(category, subcategory, brand)
+    if error:
+        return jsonify({"error": error}), 400
     
-    # Category filter
+    query = product_query(card_mode)
     if category:
-        # Validate category
-        if category not in VALID_CATEGORIES:
-            return jsonify({"error": f"Invalid category. Must be one of: {VALID_CATEGORIES}"}), 400
-        
-        query = query.filter_by(category=category)
-        
-        # Category-specific filtering rules
-        if category == 'Laptops':
-            if subcategory:
-                return jsonify({"error": "Laptops cannot be filtered by subcategory"}), 400
-            if brand:
-                # Validate brand
-                if brand not in VALID_BRANDS:
-                    return jsonify({"error": f"Invalid brand. Must be one of: {VALID_BRANDS}"}), 400
-                query = query.filter_by(brand=brand)
-        
-        elif category in ['Desktop/PCs', 'Components', 'Accessories']:
-            if brand:
-                return jsonify({"error": f"{category} cannot be filtered by brand"}), 400
-            if subcategory:
-                # Validate subcategory
-                valid_subs = VALID_SUBCATEGORIES.get(category, [])
-                if subcategory not in valid_subs:
-                    return jsonify({"error": f"Invalid subcategory for {category}. Must be one of: {valid_subs}"}), 400
-                query = query.filter_by(subcategory=subcategory)
-        
-        elif category == 'Speakers':
-            if subcategory or brand:
-                return jsonify({"error": "Speakers cannot be filtered by brand or subcategory"}), 400
-    
-    elif brand:
-        # If no category specified but brand is, filter by brand (for Laptops only)
-        if brand not in VALID_BRANDS:
-            return jsonify({"error": f"Invalid brand. Must be one of: {VALID_BRANDS}"}), 400
-        query = query.filter_by(brand=brand)
-    
-    products = query.all()
+        query = query.filter(Product.category == category)
+        if subcategory:
+            query = query.filter(Product.subcategory == subcategory)
+    if brand:
+        query = query.filter(Product.brand == brand)
+    
+    return paginated_products_response(
+        query, page, per_page, card_mode,
+        category=category, subcategory=subcategory, brand=brand
+    )
+
+# ========== FACETS ENDPOINT ==========
+
+# GET product counts per category / subcategory / brand
+@products_bp.route('/facets', methods=['GET'])
+@conditional('products')
+@cache.cached(lambda: 'products:facets')
+def get_product_facets():
+    """Get product counts per category, subcategory and brand (one grouped query)"""
+    return jsonify(facet_counts(Product)), 200
+
+# ========== EXPORT ENDPOINT ==========
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CSV_FIELDS = ['product_id', 'name', 'brand', 'category', 'subcategory', 'price', 'image_url', 'specifications']
+
+def iter_export_batches(query):
+    """Yield lists of serialized products, EXPORT_BATCH_SIZE at a time
+
+    yield_per streams rows through a server-side cursor and selectinload
+    fetches specs once per batch, so memory stays flat however large the catalog.
+    """
+    query = query.options(selectinload(Product.specifications)).order_by(Product.product_id)
+    batch = []
+    for product in query.yield_per(EXPORT_BATCH_SIZE):
+        batch.append(serialize_product(product, card_mode=False))
+        if len(batch) == EXPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+# STREAM the full catalog (products + specs) as NDJSON or CSV
+@products_bp.route('/export', methods=['GET'])
+def export_products():
+    """Stream every product with specifications (?format=ndjson|csv, optional ?category=)"""
+    export_format = request.args.get('format', 'ndjson').lower()
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({'error': 'Invalid format. Must be one of: ndjson, csv'}), 400
     
-    if not products:
-        return jsonify([]), 200  # Return empty array instead of 404
+    category = request.args.get('category')
+    query = Product.query
+    if category:
+        taxonomy = current_taxonomy()
+        if category not in taxonomy.categories:
+            return jsonify({'error': taxonomy.invalid_category}), 400
+        query = query.filter_by(category=category)
     
-    # Convert to JSON
-    results = [serialize_product(p, card_mode=card_mode) for p in products]
+    def generate_ndjson():
+        for batch in iter_export_batches(query):
+            yield ''.join(current_app.json.dumps(p) + '\n' for p in batch)
+    
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_CSV_FIELDS)
+        writer.writeheader()
+        for batch in iter_export_batches(query):
+            for p in batch:
+                # Specs go in one JSON-encoded cell: {"spec_name": "spec_value", ...}
+                p['specifications'] = json.dumps({s['spec_name']: s['spec_value'] for s in p['specifications']})
+                writer.writerow(p)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        yield buffer.getvalue()
+    
+    if export_format == 'csv':
+        body, mimetype = generate_csv(), 'text/csv'
+    else:
+        body, mimetype = generate_ndjson(), 'application/x-ndjson'
     
-    return jsonify(results), 200
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=products.{export_format}'}
+    )
 
 # ========== SEARCH ENDPOINT ==========
 
@@ -463,7 +603,8 @@ def search_products():
     card_mode = request.args.get('card_mode', 'false').lower() == 'true'
     
     # ✅ SEARCH ONLY IN PRODUCT NAME (not brand, category, or subcategory)
-    query = Product.query.filter(Product.name.ilike(f'%{search_term}%'))
+    # Trigram-indexed on Postgres, most relevant names first
+    query = search_products_query(product_query(card_mode), search_term)
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
     
     products = [serialize_product(p, card_mode=card_mode) for p in pagination.items]
@@ -1,18 +1,24 @@
 from flask import Blueprint, request, jsonify
 from models import Review, Product
 from datetime import datetime
-from extensions import db
+from extensions import db, cache
+from pagination import cursor_requested, keyset_paginate, InvalidCursor
+from etags import conditional
+from facets import build_facets, review_facet_select
+from taxonomy import current_taxonomy
+from serialization import row_serializer, format_timestamp
+from review_stats import (
+    record_review_added, record_review_removed, record_review_recategorized, product_review_count
+)
 
 reviews_bp = Blueprint('reviews', __name__)
 
-# Constants for validation
-VALID_CATEGORIES = ['Laptops', 'Desktop/PCs', 'Components', 'Accessories', 'Speakers']
-VALID_BRANDS = ['ACER', 'ASUS', 'LENOVO', 'NINGMEI']
-VALID_SUBCATEGORIES = {
-    'Desktop/PCs': ['PC Bundles', 'PC Monitors', 'System Units'],
-    'Components': ['Cooling Systems', 'PC Cases'],
-    'Accessories': ['Headset', 'Keyboard', 'Mouse']
-}
+# Columns selected by the review listings, which serialize straight from row tuples
+REVIEW_COLUMNS = (
+    Review.review_id, Review.product_id, Review.user_alias, Review.review_text,
+    Review.category, Review.subcategory, Review.brand, Review.date_posted
+)
+serialize_review_row = row_serializer(REVIEW_COLUMNS, date_posted=format_timestamp)
 
 def validate_positive_int(value, default):
     """Validate and return positive integer or default"""
@@ -22,8 +28,14 @@ def validate_positive_int(value, default):
     except:
         return default
 
-def serialize_review(review, include_product_name=False):
-    """Serialize review to dictionary"""
+def serialize_review(review, include_product_name=False, product_names=None):
+    """Serialize review to dictionary
+
+    Args:
+        review: Review model instance
+        include_product_name: Include the reviewed product's name
+        product_names: Optional {product_id: name} map already resolved for a page
+    """
     result = {
         "review_id": review.review_id,
         "product_id": review.product_id,
@@ -35,11 +47,33 @@ def serialize_review(review, include_product_name=False):
         "date_posted": review.date_posted.strftime('%Y-%m-%d %H:%M:%S')
     }
     if include_product_name:
-        # Fetch product name via relationship
-        product = Product.query.filter_by(product_id=review.product_id).first()
-        result["product_name"] = product.name if product else None
+        if product_names is not None:
+            result["product_name"] = product_names.get(review.product_id)
+        else:
+            product = Product.query.filter_by(product_id=review.product_id).first()
+            result["product_name"] = product.name if product else None
     return result
 
+def review_rows():
+    """Review listing query returning REVIEW_COLUMNS tuples instead of entities"""
+    return db.session.query(*REVIEW_COLUMNS)
+
+def serialize_reviews(rows, include_product_name=False, product_names=None):
+    """Serialize a page of review_rows(), resolving product names with one IN lookup"""
+    reviews = [serialize_review_row(row) for row in rows]
+    if include_product_name:
+        if product_names is None:
+            product_ids = {r["product_id"] for r in reviews}
+            product_names = {}
+            if product_ids:
+                name_rows = db.session.query(Product.product_id, Product.name).filter(
+                    Product.product_id.in_(product_ids)
+                ).all()
+                product_names = {product_id: name for product_id, name in name_rows}
+        for review in reviews:
+            review["product_name"] = product_names.get(review["product_id"])
+    return reviews
+
 # GET All Reviews (with pagination)
 @reviews_bp.route('/', methods=['GET'])
 def get_reviews():
@@ -49,10 +83,30 @@ def get_reviews():
     per_page = min(per_page, 100)  # Max 100 items per page
     include_product_name = request.args.get('include_product_name', 'false').lower() == 'true'
 
-    paginated = Review.query.order_by(Review.date_posted.desc()).paginate(
+    # Opt-in keyset pagination (newest first) for infinite scroll
+    if cursor_requested(request.args):
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+        try:
+            keyset = keyset_paginate(
+                review_rows(), [Review.date_posted, Review.review_id],
+                request.args.get('cursor', ''), per_page,
+                descending=True, include_total=include_total
+            )
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        result = {
+            "reviews": serialize_reviews(keyset['items'], include_product_name),
+            "per_page": per_page,
+            "next_cursor": keyset['next_cursor']
+        }
+        if include_total:
+            result["total"] = keyset['total']
+        return jsonify(result), 200
+
+    paginated = review_rows().order_by(Review.date_posted.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
-    reviews = [serialize_review(r, include_product_name) for r in paginated.items]
+    reviews = serialize_reviews(paginated.items, include_product_name)
     return jsonify({
         "reviews": reviews,
         "page": page,
@@ -73,6 +127,7 @@ def get_review_by_id(review_id):
 
 # GET Reviews by Product ID
 @reviews_bp.route('/product/<string:product_id>', methods=['GET'])
+@conditional('reviews', 'products')
 def get_reviews_by_product(product_id):
     """Get all reviews for a specific product"""
     product = Product.query.filter_by(product_id=product_id).first()
@@ -82,15 +137,18 @@ def get_reviews_by_product(product_id):
     per_page = validate_positive_int(request.args.get('per_page', 20), 20)
     per_page = min(per_page, 100)
     include_product_name = request.args.get('include_product_name', 'false').lower() == 'true'
-    query = Review.query.filter_by(product_id=product_id).order_by(Review.date_posted.desc())
-    paginated = query.paginate(page=page, per_page=per_page, error_out=False)
-    reviews = [serialize_review(r, include_product_name) for r in paginated.items]
+    query = review_rows().filter(Review.product_id == product_id).order_by(Review.date_posted.desc())
+    # Total comes from the product's stats row rather than a COUNT over reviews
+    paginated = query.paginate(page=page, per_page=per_page, error_out=False, count=False)
+    total = product_review_count(product_id)
+    # Every review on this page belongs to the product we already loaded
+    reviews = serialize_reviews(paginated.items, include_product_name, {product.product_id: product.name})
     return jsonify({
         "reviews": reviews,
         "page": page,
         "per_page": per_page,
-        "total": paginated.total,
-        "pages": paginated.pages,
+        "total": total,
+        "pages": -(-total // per_page),
         "product_id": product_id,
         "product_name": product.name
     }), 200
@@ -106,40 +164,22 @@ def filter_reviews():
     per_page = validate_positive_int(request.args.get('per_page', 20), 20)
     per_page = min(per_page, 100)
     include_product_name = request.args.get('include_product_name', 'false').lower() == 'true'
-    query = Review.query
+    # Same category rules as /products/filter; brands match case-insensitively
+    error, brand, subcategory = current_taxonomy().filter_rules(category, subcategory, brand, fold_case=True)
+    if error:
+        return jsonify({"error": error}), 400
 
-    # Category filter
+    query = review_rows()
     if category:
-        if category not in VALID_CATEGORIES:
-            return jsonify({"error": f"Invalid category. Must be one of: {VALID_CATEGORIES}"}), 400
-        query = query.filter_by(category=category)
-        # Category-specific filtering rules
-        if category == 'Laptops':
-            if subcategory:
-                return jsonify({"error": "Laptops cannot be filtered by subcategory"}), 400
-            if brand:
-                if brand.upper() not in VALID_BRANDS:
-                    return jsonify({"error": f"Invalid brand. Must be one of: {VALID_BRANDS}"}), 400
-                query = query.filter_by(brand=brand.upper())
-        elif category in ['Desktop/PCs', 'Components', 'Accessories']:
-            if brand:
-                return jsonify({"error": f"{category} cannot be filtered by brand"}), 400
-            if subcategory:
-                valid_subs = VALID_SUBCATEGORIES.get(category, [])
-                if subcategory not in valid_subs:
-                    return jsonify({"error": f"Invalid subcategory for {category}. Must be one of: {valid_subs}"}), 400
-                query = query.filter_by(subcategory=subcategory)
-        elif category == 'Speakers':
-            if subcategory or brand:
-                return jsonify({"error": "Speakers cannot be filtered by brand or subcategory"}), 400
-    elif brand:
-        if brand.upper() not in VALID_BRANDS:
-            return jsonify({"error": f"Invalid brand. Must be one of: {VALID_BRANDS}"}), 400
-        query = query.filter_by(brand=brand.upper())
+        query = query.filter(Review.category == category)
+        if subcategory:
+            query = query.filter(Review.subcategory == subcategory)
+    if brand:
+        query = query.filter(Review.brand == brand)
 
     query = query.order_by(Review.date_posted.desc())
     paginated = query.paginate(page=page, per_page=per_page, error_out=False)
-    reviews = [serialize_review(r, include_product_name) for r in paginated.items]
+    reviews = serialize_reviews(paginated.items, include_product_name)
     return jsonify({
         "reviews": reviews,
         "page": page,
@@ -148,6 +188,14 @@ def filter_reviews():
         "pages": paginated.pages
     }), 200
 
+# GET Review counts per Category, Subcategory and Brand
+@reviews_bp.route('/facets', methods=['GET'])
+@conditional('reviews')
+@cache.cached(lambda: 'reviews:facets')
+def get_review_facets():
+    """Get review counts per category, subcategory and brand (from review_facet_stats)"""
+    return jsonify(build_facets(db.session.execute(review_facet_select()).all())), 200
+
 # ADD Review
 @reviews_bp.route('/', methods=['POST'])
 def add_review():
@@ -160,26 +208,15 @@ def add_review():
         if field not in data or not data[field]:
             return jsonify({'error': f'Missing required field: {field}'}), 400
 
+    taxonomy = current_taxonomy()
     category = data['category']
-    if category not in VALID_CATEGORIES:
-        return jsonify({'error': f'Invalid category. Must be one of: {VALID_CATEGORIES}'}), 400
+    if category not in taxonomy.categories:
+        return jsonify({'error': taxonomy.invalid_category}), 400
 
     product = Product.query.filter_by(product_id=data['product_id']).first()
     if not product:
         return jsonify({'error': 'Product not found'}), 404
 
-    # Case-insensitive brand check and store as uppercase
-    brand = data.get('brand')
-    if brand and brand.upper() not in VALID_BRANDS:
-        return jsonify({'error': f'Invalid brand. Must be one of: {VALID_BRANDS}'}), 400
-    brand = brand.upper() if brand else None
-
-    subcategory = data.get('subcategory')
-    if subcategory:
-        valid_subs = VALID_SUBCATEGORIES.get(category, [])
-        if subcategory not in valid_subs:
-            return jsonify({'error': f'Invalid subcategory for {category}. Must be one of: {valid_subs}'}), 400
-
     user_alias = data['user_alias'].strip()
     if len(user_alias) < 2:
         return jsonify({'error': 'User alias must be at least 2 characters long'}), 400
@@ -190,17 +227,12 @@ def add_review():
     if len(review_text) < 10:
         return jsonify({'error': 'Review text must be at least 10 characters long'}), 400
 
-    if category == 'Laptops':
-        if not brand:
-            return jsonify({'error': 'Laptops must have a brand'}), 400
-        subcategory = None
-    elif category in ['Desktop/PCs', 'Components', 'Accessories']:
-        if not subcategory:
-            return jsonify({'error': f'{category} must have a subcategory'}), 400
-        brand = None
-    elif category == 'Speakers':
-        subcategory = None
-        brand = None
+    # Case-insensitive brand check (stored uppercase) plus category-specific rules
+    error, brand, subcategory = taxonomy.apply_category_rules(
+        category, data.get('brand'), data.get('subcategory'), fold_case=True
+    )
+    if error:
+        return jsonify({'error': error}), 400
 
     try:
         new_review = Review(
@@ -213,7 +245,9 @@ def add_review():
             date_posted=datetime.utcnow()
         )
         db.session.add(new_review)
+        record_review_added(new_review)
         db.session.commit()
+        cache.delete('reviews:facets')
         return jsonify({
             "message": "Review added successfully!",
             "review_id": new_review.review_id
@@ -233,22 +267,21 @@ def update_review(review_id):
     if not data:
         return jsonify({'error': 'No data provided'}), 400
 
+    taxonomy = current_taxonomy()
     category = data.get('category', review.category)
-    if category not in VALID_CATEGORIES:
-        return jsonify({'error': f'Invalid category. Must be one of: {VALID_CATEGORIES}'}), 400
+    if category not in taxonomy.categories:
+        return jsonify({'error': taxonomy.invalid_category}), 400
 
     # Case-insensitive update for brand
     brand = data.get('brand')
-    if brand and brand.upper() not in VALID_BRANDS:
-        return jsonify({'error': f'Invalid brand. Must be one of: {VALID_BRANDS}'}), 400
     if brand:
-        brand = brand.upper()
+        brand = taxonomy.canonical_brand(brand, fold_case=True)
+        if brand is None:
+            return jsonify({'error': taxonomy.invalid_brand}), 400
 
     subcategory = data.get('subcategory')
-    if subcategory:
-        valid_subs = VALID_SUBCATEGORIES.get(category, [])
-        if subcategory not in valid_subs:
-            return jsonify({'error': f'Invalid subcategory for {category}. Must be one of: {valid_subs}'}), 400
+    if subcategory and subcategory not in taxonomy.subcategories[category]:
+        return jsonify({'error': taxonomy.invalid_subcategory[category]}), 400
 
     if 'user_alias' in data:
         user_alias = data['user_alias'].strip()
@@ -262,21 +295,18 @@ def update_review(review_id):
         if len(review_text) < 10:
             return jsonify({'error': 'Review text must be at least 10 characters long'}), 400
 
-    if category == 'Laptops':
-        subcategory = None
-    elif category in ['Desktop/PCs', 'Components', 'Accessories']:
-        brand = None
-    elif category == 'Speakers':
-        subcategory = None
-        brand = None
+    brand, subcategory = taxonomy.clear_unused_fields(category, brand, subcategory)
 
     try:
         review.user_alias = data.get('user_alias', review.user_alias).strip() if 'user_alias' in data else review.user_alias
         review.review_text = data.get('review_text', review.review_text).strip() if 'review_text' in data else review.review_text
+        previous = (review.category, review.subcategory, review.brand)
         review.category = category
         review.subcategory = subcategory
         review.brand = brand
+        record_review_recategorized(review, *previous)
         db.session.commit()
+        cache.delete('reviews:facets')
         return jsonify({"message": "Review updated successfully!"}), 200
     except Exception as e:
         db.session.rollback()
@@ -291,7 +321,9 @@ def delete_review(review_id):
         return jsonify({'error': 'Review not found'}), 404
     try:
         db.session.delete(review)
+        record_review_removed(review)
         db.session.commit()
+        cache.delete('reviews:facets')
         return jsonify({"message": "Review deleted successfully!"}), 200
     except Exception as e:
         db.session.rollback()
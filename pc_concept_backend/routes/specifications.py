@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
 from models import ProductSpecification, Product
 from sqlalchemy.exc import IntegrityError
-from extensions import db
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from extensions import db, cache, is_postgres
+from routes.products import invalidate_product_cache
 
 specs_bp = Blueprint('specs', __name__)
 
@@ -62,6 +65,7 @@ def get_spec_by_id(spec_id):
 
 # GET all specs for a specific product (MOST IMPORTANT ENDPOINT)
 @specs_bp.route('/product/<string:product_id>', methods=['GET'])
+@cache.cached(lambda product_id: f'specs:product:{product_id}')
 def get_specs_by_product(product_id):
     """Get all specifications for a specific product"""
     # Check if product exists
@@ -86,6 +90,116 @@ def get_specs_by_product(product_id):
     return jsonify(output), 200
 
 
+MAX_BULK_SPECS = 10000
+
+
+def add_specs_bulk(items):
+    """Insert a list of specifications with set-based validation
+
+    Product existence and (product_id, spec_name) duplicates are each checked
+    with one query for the whole payload, and rows are written with a single
+    multi-row INSERT ... ON CONFLICT DO NOTHING. Every item gets an outcome in
+    "results". By default the import is all-or-nothing (400 on invalid rows,
+    409 on duplicates, as before; the valid rows are then "not_inserted");
+    with ?partial=true valid rows are inserted and the rest are skipped.
+    """
+    if len(items) == 0:
+        return jsonify({'error': 'Empty array provided'}), 400
+    if len(items) > MAX_BULK_SPECS:
+        return jsonify({'error': f'Too many specifications. Maximum is {MAX_BULK_SPECS} per request'}), 400
+    
+    partial = request.args.get('partial', 'false').lower() == 'true'
+    results = [{"index": idx, "status": "pending"} for idx in range(len(items))]
+    rows = {}
+    
+    # Per-item field checks (no queries)
+    for idx, item in enumerate(items):
+        errors = []
+        if not isinstance(item, dict):
+            errors.append("Item must be an object")
+            item = {}
+        for field in ('product_id', 'spec_name', 'spec_value'):
+            if field not in item or not item[field]:
+                errors.append(f"Missing {field}")
+            elif len(str(item[field]).strip()) == 0:
+                errors.append(f"{field} cannot be empty")
+        if errors:
+            results[idx].update(status="invalid", errors=errors)
+            continue
+        rows[idx] = {
+            "product_id": str(item['product_id']),
+            "spec_name": str(item['spec_name']).strip(),
+            "spec_value": str(item['spec_value']).strip()
+        }
+    
+    # One query for every referenced product
+    product_ids = {row['product_id'] for row in rows.values()}
+    categories = dict(
+        db.session.query(Product.product_id, Product.category)
+        .filter(Product.product_id.in_(product_ids)).all()
+    ) if product_ids else {}
+    
+    # One query for every existing spec name on those products
+    existing = set(
+        db.session.query(ProductSpecification.product_id, ProductSpecification.spec_name)
+        .filter(ProductSpecification.product_id.in_(categories)).all()
+    ) if categories else set()
+    
+    for idx, row in list(rows.items()):
+        key = (row['product_id'], row['spec_name'])
+        if row['product_id'] not in categories:
+            results[idx].update(status="invalid", errors=[f"Product {row['product_id']} not found"])
+            del rows[idx]
+        elif key in existing:
+            results[idx].update(status="duplicate", error=f"Specification '{row['spec_name']}' already exists for product {row['product_id']}")
+            del rows[idx]
+        else:
+            existing.add(key)  # Also catches repeats inside the payload
+    
+    invalid = [r for r in results if r['status'] == 'invalid']
+    duplicates = [r for r in results if r['status'] == 'duplicate']
+    if not partial and (invalid or duplicates):
+        for idx in rows:
+            results[idx]['status'] = "not_inserted"  # Valid, but the batch was rejected
+    if not partial and invalid:
+        details = [f"Item {r['index']}: {e}" for r in invalid for e in r['errors']]
+        return jsonify({'error': 'Validation failed', 'details': details, 'results': results}), 400
+    if not partial and duplicates:
+        return jsonify({'error': duplicates[0]['error'], 'results': results}), 409
+    
+    inserted = set()
+    try:
+        if rows:
+            # Rows another request inserted since the check above are skipped, not an IntegrityError
+            dialect_insert = pg_insert if is_postgres() else sqlite_insert
+            stmt = dialect_insert(ProductSpecification).on_conflict_do_nothing(
+                index_elements=['product_id', 'spec_name']
+            ).returning(ProductSpecification.product_id, ProductSpecification.spec_name)
+            inserted = {tuple(r) for r in db.session.execute(stmt, list(rows.values())).all()}
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Database error: {str(e)}'}), 500
+    
+    for idx, row in rows.items():
+        if (row['product_id'], row['spec_name']) in inserted:
+            results[idx]['status'] = "created"
+        else:
+            # Lost a race with a concurrent insert of the same spec
+            results[idx].update(status="duplicate", error=f"Specification '{row['spec_name']}' already exists for product {row['product_id']}")
+    
+    for product_id in {product_id for product_id, _ in inserted}:
+        invalidate_product_cache(product_id, categories[product_id])
+    
+    created = len(inserted)
+    return jsonify({
+        "message": f"{created} specification(s) added successfully!",
+        "count": created,
+        "skipped": len(items) - created,
+        "results": results
+    }), 201 if created else 200
+
+
 # ADD new specification(s)
 @specs_bp.route('/', methods=['POST'])
 def add_spec():
@@ -97,67 +211,7 @@ def add_spec():
     
     # Check if the request is a list (bulk insert)
     if isinstance(data, list):
-        if len(data) == 0:
-            return jsonify({'error': 'Empty array provided'}), 400
-        
-        # Validate all items first
-        errors = []
-        for idx, item in enumerate(data):
-            # Validate required fields
-            if 'product_id' not in item or not item['product_id']:
-                errors.append(f"Item {idx}: Missing product_id")
-            if 'spec_name' not in item or not item['spec_name']:
-                errors.append(f"Item {idx}: Missing spec_name")
-            if 'spec_value' not in item or not item['spec_value']:
-                errors.append(f"Item {idx}: Missing spec_value")
-            
-            # Validate product exists
-            if 'product_id' in item:
-                product = Product.query.filter_by(product_id=item['product_id']).first()
-                if not product:
-                    errors.append(f"Item {idx}: Product {item['product_id']} not found")
-            
-            # Validate spec_name and spec_value are not empty
-            if 'spec_name' in item and len(str(item['spec_name']).strip()) == 0:
-                errors.append(f"Item {idx}: spec_name cannot be empty")
-            if 'spec_value' in item and len(str(item['spec_value']).strip()) == 0:
-                errors.append(f"Item {idx}: spec_value cannot be empty")
-        
-        if errors:
-            return jsonify({'error': 'Validation failed', 'details': errors}), 400
-        
-        try:
-            specs = []
-            for item in data:
-                # Check for duplicate spec_name for the same product
-                existing = ProductSpecification.query.filter_by(
-                    product_id=item['product_id'],
-                    spec_name=item['spec_name'].strip()
-                ).first()
-                
-                if existing:
-                    return jsonify({
-                        'error': f"Specification '{item['spec_name']}' already exists for product {item['product_id']}"
-                    }), 409
-                
-                spec = ProductSpecification(
-                    product_id=item['product_id'],
-                    spec_name=item['spec_name'].strip(),
-                    spec_value=item['spec_value'].strip()
-                )
-                specs.append(spec)
-            
-            db.session.add_all(specs)
-            db.session.commit()
-            
-            return jsonify({
-                "message": f"{len(specs)} specification(s) added successfully!",
-                "count": len(specs)
-            }), 201
-        
-        except Exception as e:
-            db.session.rollback()
-            return jsonify({'error': f'Database error: {str(e)}'}), 500
+        return add_specs_bulk(data)
     
     # Otherwise handle a single insert
     # Validate required fields
@@ -200,6 +254,7 @@ def add_spec():
         
         db.session.add(new_spec)
         db.session.commit()
+        invalidate_product_cache(product.product_id, product.category)
         
         return jsonify({
             "message": "Specification added successfully!",
@@ -258,6 +313,7 @@ def update_spec(spec_id):
         spec.spec_value = data.get('spec_value', spec.spec_value).strip() if 'spec_value' in data else spec.spec_value
         
         db.session.commit()
+        invalidate_product_cache(spec.product_id, spec.product.category)
         return jsonify({"message": "Specification updated successfully!"}), 200
     
     except Exception as e:
@@ -275,8 +331,10 @@ def delete_spec(spec_id):
         return jsonify({'error': 'Specification not found'}), 404
     
     try:
+        product_id, category = spec.product_id, spec.product.category
         db.session.delete(spec)
         db.session.commit()
+        invalidate_product_cache(product_id, category)
         return jsonify({"message": "Specification deleted successfully!"}), 200
     
     except Exception as e:
@@ -296,6 +354,7 @@ def delete_specs_by_product(product_id):
     try:
         deleted_count = ProductSpecification.query.filter_by(product_id=product_id).delete()
         db.session.commit()
+        invalidate_product_cache(product_id, product.category)
         
         return jsonify({
             "message": f"{deleted_count} specification(s) deleted successfully!",
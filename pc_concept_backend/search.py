@@ -0,0 +1,82 @@
+import re
+from sqlalchemy import func, literal_column, select, true
+from extensions import db, is_postgres
+from models import Product, Blog
+
+# Generated tsvector column added by migration 7d41c0e2b9f3 (Postgres only).
+# Weighted title > introduction > body/conclusion so ts_rank_cd favours title hits.
+BLOG_SEARCH_VECTOR = literal_column('blogs.search_vector')
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def prefix_tsquery(search_term):
+    """Build a to_tsquery string that prefix-matches every word, e.g. 'gam & lap' -> 'gam:* & lap:*'
+
+    Only word characters are kept so user input can never produce tsquery syntax errors.
+    Returns None when nothing searchable is left.
+    """
+    tokens = TOKEN_PATTERN.findall(search_term)
+    if not tokens:
+        return None
+    return ' & '.join(f'{token}:*' for token in tokens)
+
+
+def search_products_query(query, search_term, postgres=None):
+    """Filter products by name, ranked by trigram word similarity
+
+    ILIKE '%term%' is served by the ix_products_name_trgm GIN index on Postgres.
+
+    Args:
+        query: Product Query or select()
+        postgres: Dialect flag; defaults to is_postgres() (the ASGI read paths pass their engine's)
+    """
+    if postgres is None:
+        postgres = is_postgres()
+    query = query.filter(Product.name.ilike(f'%{search_term}%'))
+    if postgres:
+        return query.order_by(
+            func.word_similarity(search_term, Product.name).desc(),
+            Product.product_id
+        )
+    return query.order_by(Product.product_id)
+
+
+def empty_tsquery_select(search_term):
+    """SELECT that is true when search_term leaves nothing for full-text search
+
+    to_tsquery('english', ...) drops stopwords, so 'the' or 'how to' give an
+    empty query that matches no row. Blog search falls back to ILIKE for those.
+    """
+    tsquery_text = prefix_tsquery(search_term)
+    if tsquery_text is None:
+        return select(true())
+    return select(func.numnode(func.to_tsquery('english', tsquery_text)) == 0)
+
+
+def search_blogs_query(query, search_term, postgres=None, empty_tsquery=None):
+    """Filter blogs by full-text match over title and content, ranked by relevance
+
+    Args:
+        empty_tsquery: Result of empty_tsquery_select(search_term); looked up with
+            db.session when omitted (the ASGI read paths run it on their own session)
+    """
+    if postgres is None:
+        postgres = is_postgres()
+    if postgres and empty_tsquery is None:
+        empty_tsquery = db.session.execute(empty_tsquery_select(search_term)).scalar()
+    if not postgres or empty_tsquery:
+        return query.filter(
+            db.or_(
+                Blog.title.ilike(f'%{search_term}%'),
+                Blog.introduction.ilike(f'%{search_term}%'),
+                Blog.body.ilike(f'%{search_term}%'),
+                Blog.conclusion.ilike(f'%{search_term}%')
+            )
+        ).order_by(Blog.date_published.desc())
+
+    tsquery = func.to_tsquery('english', prefix_tsquery(search_term))
+    return query.filter(BLOG_SEARCH_VECTOR.op('@@')(tsquery)).order_by(
+        func.ts_rank_cd(BLOG_SEARCH_VECTOR, tsquery).desc(),
+        Blog.date_published.desc()
+    )
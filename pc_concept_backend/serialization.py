@@ -0,0 +1,90 @@
+"""JSON encoding for the API and precompiled row serializers
+
+The app's JSON provider is chosen by JSON_PROVIDER: 'orjson' (default) or
+'stdlib'. Both encode Decimal as a number and date/datetime in ISO format, so
+serializers can hand database values over as-is and either provider produces
+the same JSON.
+
+Listing endpoints select plain column tuples instead of ORM entities and turn
+them into dicts with row_serializer(), which resolves the field names and
+converters once at import time instead of once per row.
+"""
+import decimal
+from datetime import date, datetime
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_default(value):
+    """Fallback for types the encoders don't handle natively"""
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class OrjsonProvider(JSONProvider):
+    """orjson-backed provider: sorted keys and compact output like Flask's default"""
+
+    option = orjson.OPT_SORT_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=encode_default, option=self.option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=encode_default, option=self.option | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype='application/json')
+
+
+class StdlibProvider(DefaultJSONProvider):
+    """Flask's default provider, with Decimal/date encoding matching OrjsonProvider"""
+
+    default = staticmethod(encode_default)
+
+
+def init_json(app):
+    """Install the provider selected by JSON_PROVIDER"""
+    provider = app.config.get('JSON_PROVIDER', 'orjson')
+    if provider == 'orjson':
+        if orjson is None:
+            raise RuntimeError("JSON_PROVIDER='orjson' requires the 'orjson' package")
+        app.json = OrjsonProvider(app)
+    elif provider == 'stdlib':
+        app.json = StdlibProvider(app)
+    else:
+        raise ValueError(f"Unknown JSON_PROVIDER: {provider}")
+
+
+def format_timestamp(value):
+    """'YYYY-MM-DD HH:MM:SS', the format the API has always used for timestamps"""
+    return value.isoformat(' ', 'seconds')
+
+
+def row_serializer(columns, **converters):
+    """Build a function that turns a row of the given columns into a dict
+
+    Args:
+        columns: Model attributes in select order; their keys become the dict keys
+        converters: Optional {key: function} applied to non-null values
+    """
+    names = tuple(column.key for column in columns)
+    converted = tuple((name, converters[name]) for name in names if name in converters)
+
+    def serialize(row):
+        result = dict(zip(names, row))
+        for name, convert in converted:
+            value = result[name]
+            if value is not None:
+                result[name] = convert(value)
+        return result
+
+    return serialize
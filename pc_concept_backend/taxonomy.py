@@ -0,0 +1,227 @@
+"""Canonical category / subcategory / brand taxonomy
+
+One place for the rules products and reviews share. Lookups are frozensets
+and dicts built once per taxonomy version, and error messages are formatted
+up front, so validating a request is a handful of O(1) checks.
+
+The taxonomy is read from the taxonomy_terms table and reloaded when its
+table_versions counter changes (checked at most every
+TAXONOMY_REFRESH_SECONDS), so adding a brand is an INSERT, not a redeploy.
+The counter is bumped by a Postgres trigger; elsewhere the taxonomy is read
+once per process. If the table is missing or empty the defaults below are used.
+"""
+import logging
+import threading
+import time
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from extensions import db
+from models import TaxonomyTerm, TableVersion
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORIES = ['Laptops', 'Desktop/PCs', 'Components', 'Accessories', 'Speakers']
+DEFAULT_BRANDS = {'Laptops': ['ACER', 'ASUS', 'LENOVO', 'NINGMEI']}
+DEFAULT_SUBCATEGORIES = {
+    'Desktop/PCs': ['PC Bundles', 'PC Monitors', 'System Units'],
+    'Components': ['Cooling Systems', 'PC Cases'],
+    'Accessories': ['Headset', 'Keyboard', 'Mouse']
+}
+
+
+class Taxonomy:
+    """Immutable lookup tables for one taxonomy version
+
+    A category with subcategories must have one and never has a brand; a
+    category with brands must have one and never has a subcategory; any other
+    category has neither. Brands are stored uppercase. Products match brands
+    exactly, reviews fold case (fold_case=True), as before.
+    """
+
+    def __init__(self, categories, brands, subcategories, version=0):
+        self.version = version
+        self.category_list = list(categories)
+        self.categories = frozenset(self.category_list)
+
+        self.brand_list = list(dict.fromkeys(b for c in self.category_list for b in brands.get(c, [])))
+        self.brands = frozenset(self.brand_list)
+        self.branded_categories = frozenset(c for c in self.category_list if brands.get(c))
+        # Case-normalization tables: input -> canonical brand
+        self.brand_lookup = {
+            False: {b: b for b in self.brand_list},
+            True: {b.upper(): b for b in self.brand_list}
+        }
+
+        self.subcategory_lists = {c: list(subcategories.get(c, [])) for c in self.category_list}
+        self.subcategories = {c: frozenset(subs) for c, subs in self.subcategory_lists.items()}
+
+        # Precomputed error messages (same wording the routes always returned)
+        self.invalid_category = f'Invalid category. Must be one of: {self.category_list}'
+        self.invalid_brand = f'Invalid brand. Must be one of: {self.brand_list}'
+        self.invalid_subcategory = {
+            c: f'Invalid subcategory for {c}. Must be one of: {subs}' for c, subs in self.subcategory_lists.items()
+        }
+        self.missing_brand = {c: f'{c} must have a brand' for c in self.branded_categories}
+        self.missing_subcategory = {c: f'{c} must have a subcategory' for c in self.category_list}
+        self.no_subcategories = {c: f'{c} does not have subcategories' for c in self.category_list}
+        self.filter_errors = {
+            c: (f'{c} cannot be filtered by subcategory' if c in self.branded_categories
+                else f'{c} cannot be filtered by brand' if self.subcategories[c]
+                else f'{c} cannot be filtered by brand or subcategory')
+            for c in self.category_list
+        }
+
+    def canonical_brand(self, brand, fold_case=False):
+        """Canonical spelling of brand, or None if it isn't a known brand"""
+        if fold_case:
+            brand = brand.upper()
+        return self.brand_lookup[fold_case].get(brand)
+
+    def apply_category_rules(self, category, brand, subcategory, fold_case=False):
+        """Validate brand/subcategory for a category and clear the fields it doesn't use
+
+        Shared by add_product, the review routes and the catalog importer.
+
+        Returns:
+            (error message or None, brand, subcategory)
+        """
+        if category not in self.categories:
+            return self.invalid_category, brand, subcategory
+
+        if brand:
+            canonical = self.canonical_brand(brand, fold_case)
+            if canonical is None:
+                return self.invalid_brand, brand, subcategory
+            brand = canonical
+
+        if subcategory and subcategory not in self.subcategories[category]:
+            return self.invalid_subcategory[category], brand, subcategory
+
+        if category in self.branded_categories:
+            if not brand:
+                return self.missing_brand[category], brand, subcategory
+            subcategory = None
+        elif self.subcategories[category]:
+            if not subcategory:
+                return self.missing_subcategory[category], brand, subcategory
+            brand = None
+        else:
+            subcategory = None
+            brand = None
+
+        return None, brand, subcategory
+
+    def clear_unused_fields(self, category, brand, subcategory):
+        """Drop brand/subcategory values the category doesn't use (no required-field checks)"""
+        if category in self.branded_categories:
+            return brand, None
+        if self.subcategories.get(category):
+            return None, subcategory
+        return None, None
+
+    def filter_rules(self, category, subcategory, brand, fold_case=False):
+        """Validate listing filters; returns (error or None, brand, subcategory)"""
+        if category:
+            if category not in self.categories:
+                return self.invalid_category, brand, subcategory
+            if category in self.branded_categories:
+                if subcategory:
+                    return self.filter_errors[category], brand, subcategory
+            elif self.subcategories[category]:
+                if brand:
+                    return self.filter_errors[category], brand, subcategory
+                if subcategory and subcategory not in self.subcategories[category]:
+                    return self.invalid_subcategory[category], brand, subcategory
+            elif subcategory or brand:
+                return self.filter_errors[category], brand, subcategory
+
+        if brand:
+            canonical = self.canonical_brand(brand, fold_case)
+            if canonical is None:
+                return self.invalid_brand, brand, subcategory
+            brand = canonical
+
+        return None, brand, subcategory
+
+
+DEFAULT_TAXONOMY = Taxonomy(DEFAULT_CATEGORIES, DEFAULT_BRANDS, DEFAULT_SUBCATEGORIES)
+
+_current = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def load_taxonomy(conn, version):
+    """Build a Taxonomy from taxonomy_terms; None if the table is empty"""
+    rows = conn.execute(
+        select(TaxonomyTerm.kind, TaxonomyTerm.category, TaxonomyTerm.value)
+        .order_by(TaxonomyTerm.position, TaxonomyTerm.id)
+    ).all()
+    if not rows:
+        return None
+
+    categories, brands, subcategories = [], {}, {}
+    for kind, category, value in rows:
+        if kind == 'category':
+            categories.append(value)
+        elif kind == 'brand':
+            brands.setdefault(category, []).append(value)
+        elif kind == 'subcategory':
+            subcategories.setdefault(category, []).append(value)
+    return Taxonomy(categories, brands, subcategories, version)
+
+
+def current_taxonomy():
+    """The taxonomy for this request, reloaded only when its version stamp changes
+
+    Uses its own connection so a failed lookup can never disturb the request's session.
+    """
+    global _current, _checked_at
+    now = time.monotonic()
+    refresh = current_app.config.get('TAXONOMY_REFRESH_SECONDS', 30)
+    if _current is not None and now - _checked_at < refresh:
+        return _current
+
+    with _lock:
+        if _current is not None and now - _checked_at < refresh:
+            return _current
+        try:
+            with db.engine.connect() as conn:
+                version = conn.execute(
+                    select(TableVersion.current_version).where(TableVersion.table_name == 'taxonomy_terms')
+                ).scalar() or 0
+                if _current is None or version != _current.version:
+                    _current = load_taxonomy(conn, version) or DEFAULT_TAXONOMY
+        except SQLAlchemyError as e:
+            logger.warning("Taxonomy load failed, using defaults: %s", e)
+            if _current is None:
+                _current = DEFAULT_TAXONOMY
+        _checked_at = now
+        return _current
+
+
+async def current_taxonomy_async(engine, refresh):
+    """current_taxonomy() for the ASGI read paths, loading through an async engine
+
+    Shares the cached taxonomy with current_taxonomy(), so both entry points
+    in one process see the same version.
+    """
+    global _current, _checked_at
+    now = time.monotonic()
+    if _current is not None and now - _checked_at < refresh:
+        return _current
+
+    try:
+        async with engine.connect() as conn:
+            version = (await conn.execute(
+                select(TableVersion.current_version).where(TableVersion.table_name == 'taxonomy_terms')
+            )).scalar() or 0
+            if _current is None or version != _current.version:
+                _current = await conn.run_sync(load_taxonomy, version) or DEFAULT_TAXONOMY
+    except SQLAlchemyError as e:
+        logger.warning("Taxonomy load failed, using defaults: %s", e)
+        if _current is None:
+            _current = DEFAULT_TAXONOMY
+    _checked_at = now
+    return _current
@@ -0,0 +1,197 @@
+"""Shared fixtures: one Flask app on a throwaway SQLite database
+
+Config reads the environment at import time, so DATABASE_URL and friends are
+set here before anything imports config. The response cache starts disabled
+(CACHE_TTL=0); tests that exercise it set cache.ttl themselves.
+
+Tests marked `postgres` use pg_app instead: a second app on TEST_POSTGRES_URL,
+migrated to head. That database is wiped, so point it at a scratch one, e.g.
+TEST_POSTGRES_URL=postgresql://postgres@localhost/pcconcept_test. Without it
+those tests are skipped.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+_tmpdir = tempfile.mkdtemp(prefix='pcconcept-tests-')
+os.environ['DATABASE_URL'] = f'sqlite:///{_tmpdir}/test.db'
+os.environ['ASYNC_DATABASE_URL'] = ''
+os.environ['REPLICA_DATABASE_URLS'] = ''
+os.environ['CACHE_BACKEND'] = 'memory'
+os.environ['CACHE_TTL'] = '0'
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from app import create_app
+from config import Config, build_engine_options
+from extensions import db, cache
+from models import Product, ProductSpecification, Review, Blog
+from review_stats import rebuild_review_stats
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POSTGRES_URL = os.getenv('TEST_POSTGRES_URL')
+
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@pytest.fixture(autouse=True)
+def clean_db(app):
+    """Empty every table and the response cache after each test"""
+    yield
+    with app.app_context():
+        db.session.remove()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+    cache.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_app(app, monkeypatch):
+    """make(**config) -> a new create_app() with those Config attributes overridden
+
+    Uses the same SQLite database unless SQLALCHEMY_DATABASE_URI is given.
+    Engines are disposed after the test.
+    """
+    created = []
+
+    def make(**config):
+        for name, value in config.items():
+            monkeypatch.setattr(Config, name, value)
+        new_app = create_app()
+        new_app.config['TESTING'] = True
+        created.append(new_app)
+        return new_app
+
+    yield make
+    for new_app in created:
+        with new_app.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
+
+
+@pytest.fixture
+def count_statements(app):
+    """with count_statements() as statements: ... collects the SQL sent to the primary engine"""
+    with app.app_context():
+        engine = db.engine
+
+    @contextmanager
+    def counting():
+        executed = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            executed.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield executed
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+    return counting
+
+
+def seed_catalog(app, products=0, specs_per_product=2, reviews_per_product=0, blogs=0,
+                 category='Laptops', brand='ASUS', subcategory=None, prefix='P'):
+    """Insert products P0000, P0001, ... (prefix + number) with specs and reviews, plus blogs; returns the product IDs
+
+    Review stats are rebuilt afterwards, as `flask rebuild-review-stats` would.
+    """
+    posted = datetime(2025, 1, 1)
+    with app.app_context():
+        ids = [f'{prefix}{i:04d}' for i in range(products)]
+        for i, product_id in enumerate(ids):
+            db.session.add(Product(
+                product_id=product_id, name=f'Product {i}', brand=brand, category=category,
+                subcategory=subcategory, price=100 + i, image_url=f'https://example.com/{product_id}.jpg'
+            ))
+            for s in range(specs_per_product):
+                db.session.add(ProductSpecification(
+                    product_id=product_id, spec_name=f'Spec {s}', spec_value=f'Value {s}'
+                ))
+            for r in range(reviews_per_product):
+                db.session.add(Review(
+                    product_id=product_id, user_alias=f'user{r}', review_text='Solid machine',
+                    category=category, subcategory=subcategory, brand=brand,
+                    date_posted=posted + timedelta(days=r)
+                ))
+        for b in range(blogs):
+            db.session.add(Blog(
+                title=f'Build guide {b}', introduction='Intro', body='Body text', conclusion='Done',
+                author='Anna', date_published=date(2025, 1, 1) + timedelta(days=b)
+            ))
+        db.session.commit()
+        rebuild_review_stats()
+    return ids
+
+
+@pytest.fixture
+def catalog(app):
+    """seed(products=..., ...) -> product IDs, see seed_catalog()"""
+    def seed(**kwargs):
+        return seed_catalog(app, **kwargs)
+    return seed
+
+
+@pytest.fixture(scope='session')
+def pg_app():
+    """App on TEST_POSTGRES_URL with every migration applied to an empty schema"""
+    if not POSTGRES_URL:
+        pytest.skip('TEST_POSTGRES_URL is not set')
+    engine = create_engine(POSTGRES_URL)
+    try:
+        with engine.begin() as conn:
+            conn.execute(text('DROP SCHEMA public CASCADE'))
+            conn.execute(text('CREATE SCHEMA public'))
+    except OperationalError as e:
+        pytest.skip(f'Postgres unavailable: {e.orig}')
+    finally:
+        engine.dispose()
+
+    # In a subprocess: Alembic's env.py reconfigures logging for the whole process
+    upgrade = subprocess.run(
+        [sys.executable, '-m', 'flask', '--app', 'app:create_app', 'db', 'upgrade'],
+        cwd=BACKEND_DIR, env={**os.environ, 'DATABASE_URL': POSTGRES_URL},
+        capture_output=True, text=True
+    )
+    if upgrade.returncode:
+        pytest.fail(f'flask db upgrade failed:\n{upgrade.stderr[-2000:]}')
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Config, 'SQLALCHEMY_DATABASE_URI', POSTGRES_URL)
+        mp.setattr(Config, 'SQLALCHEMY_ENGINE_OPTIONS', build_engine_options(POSTGRES_URL))
+        app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def pg_catalog(pg_app):
+    """seed_catalog() on the Postgres app; catalog rows are truncated afterwards"""
+    def seed(**kwargs):
+        return seed_catalog(pg_app, **kwargs)
+    yield seed
+    with pg_app.app_context():
+        db.session.remove()
+        db.session.execute(text(
+            'TRUNCATE products, product_specifications, reviews, blogs, '
+            'product_review_stats, category_review_stats, review_facet_stats RESTART IDENTITY CASCADE'
+        ))
+        db.session.commit()
+    cache.clear()
@@ -0,0 +1,157 @@
+"""The ASGI read paths answer exactly like the Flask app
+
+Every URL is requested through create_asgi_app() and through the Flask test
+client; status, JSON body and ETag must match. Runs on SQLite (aiosqlite,
+where neither side sends ETags) and, with TEST_POSTGRES_URL, on Postgres
+(asyncpg), which also compares the ETag/304 and response cache paths.
+"""
+import asyncio
+import json
+from urllib.parse import unquote
+import pytest
+from asgi import create_asgi_app
+from async_db import async_db
+from config import Config, async_database_url, build_async_engine_options, build_engine_options
+from extensions import db, cache
+from models import Blog, Review, ProductSpecification
+from conftest import POSTGRES_URL
+
+
+@pytest.fixture(params=['sqlite', pytest.param('postgres', marks=pytest.mark.postgres)])
+def parity(request, monkeypatch):
+    """(flask_app, asgi_app, seed) on one database, with the async routes on its asyncio driver"""
+    if request.param == 'postgres':
+        seed = request.getfixturevalue('pg_catalog')
+        async_url = async_database_url(POSTGRES_URL)
+        for name, value in (('SQLALCHEMY_DATABASE_URI', POSTGRES_URL),
+                            ('SQLALCHEMY_ENGINE_OPTIONS', build_engine_options(POSTGRES_URL)),
+                            ('ASYNC_DATABASE_URL', async_url),
+                            ('ASYNC_ENGINE_OPTIONS', build_async_engine_options(async_url))):
+            monkeypatch.setattr(Config, name, value)
+    else:
+        seed = request.getfixturevalue('catalog')
+
+    dispatcher = create_asgi_app()
+    flask_app = dispatcher.wsgi_app.app
+    flask_app.config['TESTING'] = True
+    yield flask_app, dispatcher, seed
+    with flask_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+async def asgi_get(asgi_app, url, headers=()):
+    """(status, headers, body) of a GET sent straight to the ASGI callable"""
+    path, _, query = url.partition('?')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': unquote(path), 'raw_path': path.encode(), 'query_string': query.encode(),
+        'root_path': '', 'headers': [(b'host', b'localhost'), *((k.lower().encode(), v.encode()) for k, v in headers)],
+        'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+    }
+    requested = False
+    messages = []
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app(scope, receive, send)
+    start = messages[0]
+    headers = {name.decode().lower(): value.decode() for name, value in start['headers']}
+    return start['status'], headers, b''.join(m.get('body', b'') for m in messages[1:])
+
+
+def read_urls(app):
+    with app.app_context():
+        blog_id = db.session.query(db.func.min(Blog.blog_id)).scalar()
+        review_id = db.session.query(db.func.min(Review.review_id)).scalar()
+        spec_id = db.session.query(db.func.min(ProductSpecification.spec_id)).scalar()
+    return [
+        '/products/',
+        '/products/?page=2&per_page=5',
+        '/products/?card_mode=true',
+        '/products/P0003',
+        '/products/MISSING',
+        '/products/P0003/detail',
+        '/products/category/Laptops',
+        '/products/category/Laptops?card_mode=true&per_page=4',
+        '/products/category/Components/subcategory/PC Cases',
+        '/products/category/Laptops/brand/ASUS',
+        '/products/category/Nope',
+        '/products/filter?category=Laptops&brand=ASUS',
+        '/products/filter?brand=ASUS&per_page=3',
+        '/products/facets',
+        '/products/search?q=product 1',
+        '/products/search',
+        '/specs/',
+        f'/specs/{spec_id}',
+        '/specs/product/P0003',
+        '/reviews/',
+        '/reviews/?cursor=&per_page=5',
+        f'/reviews/{review_id}',
+        '/reviews/product/P0003',
+        '/reviews/filter?category=Laptops&brand=ASUS',
+        '/reviews/facets',
+        '/blogs/',
+        '/blogs/?full_content=true',
+        '/blogs/latest?limit=3',
+        f'/blogs/{blog_id}',
+        '/blogs/search?q=guide',
+        '/blogs/search?q=the',
+        '/blogs/author/Anna',
+    ]
+
+
+def test_async_read_paths_match_flask(parity, monkeypatch):
+    flask_app, asgi_app, seed = parity
+    seed(products=12, reviews_per_product=3, blogs=5)
+    seed(products=4, reviews_per_product=1, category='Components', brand=None,
+         subcategory='PC Cases', prefix='C')
+    urls = read_urls(flask_app)
+    # Otherwise Flask would be compared with itself behind a2wsgi
+    assert all(asgi_app.handles({'method': 'GET', 'path': unquote(url.partition('?')[0])}) for url in urls)
+    client = flask_app.test_client()
+    expected = {url: client.get(url) for url in urls}
+    postgres = flask_app.config['SQLALCHEMY_DATABASE_URI'].startswith('postgresql')
+
+    async def replay(**request):
+        try:
+            return [await asgi_get(asgi_app, url, **request) for url in urls]
+        finally:
+            await async_db.engine.dispose()
+
+    for url, (status, headers, body) in zip(urls, asyncio.run(replay())):
+        assert status == expected[url].status_code, url
+        assert json.loads(body) == expected[url].get_json(), url
+        assert headers.get('etag') == expected[url].headers.get('ETag'), url
+
+    if postgres:
+        # Both sides answer a revalidation with the other's tag
+        tagged = [url for url in urls if expected[url].headers.get('ETag')]
+        assert len(tagged) >= 8
+        for url in tagged:
+            async def revalidate():
+                try:
+                    return await asgi_get(asgi_app, url, headers=[('If-None-Match', expected[url].headers['ETag'])])
+                finally:
+                    await async_db.engine.dispose()
+            assert asyncio.run(revalidate())[0] == 304, url
+
+    # The async cache: a miss that stores the body, then a hit that returns it
+    monkeypatch.setattr(cache, 'ttl', 60)
+    cache.clear()
+    hits = []
+    for _ in range(2):
+        for url, (status, headers, body) in zip(urls, asyncio.run(replay())):
+            assert status == expected[url].status_code, url
+            assert json.loads(body) == expected[url].get_json(), url
+        hits.append(cache.stats()['hits'])
+    assert cache.stats()['entries'] > 0
+    assert hits[1] - hits[0] >= cache.stats()['entries']
@@ -0,0 +1,211 @@
+"""Response cache: both backends, and the invalidations of product and blog writes"""
+import time
+import fakeredis
+import pytest
+import cache as cache_module
+from cache import MemoryBackend, RedisBackend
+from extensions import cache
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_entries=2)
+    backend.set('a', b'1', 60)
+    backend.set('b', b'2', 60)
+    backend.get('a')  # now b is the least recently used
+    backend.set('c', b'3', 60)
+
+    assert (backend.get('a'), backend.get('b'), backend.get('c')) == (b'1', None, b'3')
+    assert backend.size() == 2
+
+
+def test_memory_backend_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    backend = MemoryBackend()
+    backend.set('a', b'1', 60)
+
+    now[0] += 59.9
+    assert backend.get('a') == b'1'
+    now[0] += 0.1
+    assert backend.get('a') is None
+    assert backend.size() == 0
+
+
+def test_memory_backend_delete_prefix():
+    backend = MemoryBackend()
+    for key in ('products:category:Laptops:?', 'products:category:Laptops:brand:ASUS?', 'products:category:LaptopsX:?'):
+        backend.set(key, b'{}', 60)
+
+    backend.delete_prefix('products:category:Laptops:')
+
+    assert backend.get('products:category:LaptopsX:?') == b'{}'
+    assert backend.size() == 1
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis_backend(redis_server):
+    return RedisBackend(client=fakeredis.FakeRedis(server=redis_server), namespace='test:')
+
+
+def test_redis_round_trip_with_ttl(redis_backend):
+    redis_backend.set('product:P0000', b'{"name": "x"}', 60)
+
+    assert redis_backend.get('product:P0000') == b'{"name": "x"}'
+    assert redis_backend.client.ttl('test:product:P0000') in (59, 60)
+    assert redis_backend.get('product:P0001') is None
+
+
+def test_redis_entries_expire(redis_backend):
+    redis_backend.set('product:P0000', b'{}', 60)
+    redis_backend.client.pexpire('test:product:P0000', 1)  # what set(..., ttl) leaves after ttl seconds
+    time.sleep(0.01)
+
+    assert redis_backend.get('product:P0000') is None
+
+
+def test_redis_delete_prefix_scans_only_matching_keys(redis_backend, redis_server):
+    for key in ('products:category:Laptops:?page=1', 'products:category:Laptops:?page=2',
+                'products:category:LaptopsX:?', 'blogs:author:a*b?', 'blogs:author:aXb?'):
+        redis_backend.set(key, b'{}', 60)
+    other_namespace = RedisBackend(client=fakeredis.FakeRedis(server=redis_server), namespace='other:')
+    other_namespace.set('products:category:Laptops:?page=1', b'{}', 60)
+
+    redis_backend.delete_prefix('products:category:Laptops:')
+    redis_backend.delete_prefix('blogs:author:a*')  # glob characters are matched literally
+
+    assert sorted(k.decode() for k in redis_backend.client.keys('test:*')) == [
+        'test:blogs:author:aXb?', 'test:products:category:LaptopsX:?'
+    ]
+    assert other_namespace.get('products:category:Laptops:?page=1') == b'{}'
+
+
+def test_redis_errors_are_misses(redis_backend, redis_server, caplog):
+    redis_backend.set('product:P0000', b'{}', 60)
+    redis_server.connected = False
+
+    assert redis_backend.get('product:P0000') is None
+    redis_backend.set('product:P0001', b'{}', 60)
+    redis_backend.delete('product:P0000')
+    redis_backend.delete_prefix('products:')
+    assert [r.getMessage().split(':')[0] for r in caplog.records] == [
+        'Cache get failed', 'Cache set failed', 'Cache delete failed', 'Cache delete_prefix failed'
+    ]
+
+
+@pytest.fixture
+def shared_cache(app, redis_backend, monkeypatch):
+    """The app's response cache on fakeredis, with a TTL"""
+    monkeypatch.setattr(cache, 'backend', redis_backend)
+    monkeypatch.setattr(cache, 'ttl', 60)
+    return redis_backend
+
+
+def test_blog_reads_are_cached_and_writes_invalidate_them(client, catalog, shared_cache, count_statements):
+    catalog(blogs=3)
+    blog_id = client.get('/blogs/').get_json()['blogs'][0]['blog_id']
+    urls = ['/blogs/', '/blogs/latest', f'/blogs/{blog_id}', '/blogs/author/Anna']
+    first = [client.get(url).get_json() for url in urls]
+
+    with count_statements() as statements:
+        assert [client.get(url).get_json() for url in urls] == first
+    assert statements == []
+
+    assert client.put(f'/blogs/{blog_id}', json={'title': 'Renamed'}).status_code == 200
+
+    assert shared_cache.client.keys('test:blog*') == []
+    assert client.get(f'/blogs/{blog_id}').get_json()['title'] == 'Renamed'
+    assert client.get('/blogs/author/Anna').get_json()['blogs'][0]['title'] == 'Renamed'
+
+
+def test_new_and_deleted_blogs_invalidate_listings(client, catalog, shared_cache):
+    catalog(blogs=1)
+    assert client.get('/blogs/').get_json()['total'] == 1
+
+    created = client.post('/blogs/', json={
+        'title': 'New build', 'introduction': 'Intro', 'body': 'Body', 'conclusion': 'Done',
+        'author': 'Anna', 'image_url': 'https://example.com/new.jpg', 'date_published': '2025-06-01'
+    })
+    assert client.get('/blogs/').get_json()['total'] == 2
+
+    blog_id = created.get_json()['blog_id']
+    assert client.get(f'/blogs/{blog_id}').status_code == 200
+    client.delete(f'/blogs/{blog_id}')
+    assert client.get(f'/blogs/{blog_id}').status_code == 404
+    assert client.get('/blogs/').get_json()['total'] == 1
+
+
+@pytest.fixture
+def memory_cache(app, monkeypatch):
+    """The app's response cache on a fresh MemoryBackend, with a TTL"""
+    backend = MemoryBackend()
+    monkeypatch.setattr(cache, 'backend', backend)
+    monkeypatch.setattr(cache, 'ttl', 60)
+    return backend
+
+
+PRODUCT_READS = [
+    '/products/P0000', '/products/P0001', '/specs/product/P0000', '/specs/product/P0001',
+    '/products/', '/products/?card_mode=true', '/products/facets',
+    '/products/category/Laptops', '/products/category/Laptops/brand/ASUS',
+    '/products/category/Components/subcategory/PC Cases', '/products/category/Speakers',
+]
+
+
+def cached_keys(client, backend):
+    for url in PRODUCT_READS:
+        assert client.get(url).status_code == 200, url
+    return set(backend._entries)
+
+
+def test_product_reads_are_served_from_the_cache(client, catalog, memory_cache, count_statements):
+    catalog(products=2)
+    first = [client.get(url).get_json() for url in PRODUCT_READS]
+
+    with count_statements() as statements:
+        assert [client.get(url).get_json() for url in PRODUCT_READS] == first
+    assert statements == []
+
+
+def test_moving_a_product_invalidates_both_categories(client, catalog, memory_cache):
+    catalog(products=2)
+    catalog(products=1, category='Components', brand=None, subcategory='PC Cases', prefix='C')
+    before = cached_keys(client, memory_cache)
+
+    response = client.put('/products/P0000', json={'category': 'Components', 'subcategory': 'PC Cases'})
+    assert response.status_code == 200
+
+    assert {k.split('?')[0] for k in before - set(memory_cache._entries)} == {
+        'product:P0000', 'specs:product:P0000', 'products:list', 'products:facets',
+        'products:category:Laptops:', 'products:category:Laptops:brand:ASUS',
+        'products:category:Components:subcategory:PC Cases',
+    }
+    assert client.get('/products/category/Components/subcategory/PC Cases').get_json()['total'] == 2
+    assert client.get('/products/category/Laptops').get_json()['total'] == 1
+
+
+def test_adding_and_deleting_products_invalidate_listings(client, catalog, memory_cache):
+    catalog(products=2)
+    before = cached_keys(client, memory_cache)
+
+    response = client.post('/products/', json={
+        'product_id': 'N0001', 'name': 'New', 'category': 'Laptops', 'brand': 'ASUS',
+        'price': 10, 'image_url': 'https://example.com/N0001.jpg'
+    })
+    assert response.status_code == 201
+    dropped = {k.split('?')[0] for k in before - set(memory_cache._entries)}
+    assert dropped == {'products:list', 'products:facets', 'products:category:Laptops:',
+                       'products:category:Laptops:brand:ASUS'}
+    assert client.get('/products/category/Laptops').get_json()['total'] == 3
+
+    before = cached_keys(client, memory_cache)
+    assert client.delete('/products/P0001').status_code == 200
+    dropped = {k.split('?')[0] for k in before - set(memory_cache._entries)}
+    assert dropped == {'product:P0001', 'specs:product:P0001', 'products:list', 'products:facets',
+                       'products:category:Laptops:', 'products:category:Laptops:brand:ASUS'}
+    assert client.get('/products/P0001').status_code == 404
+    assert client.get('/products/').get_json()['total'] == 2
@@ -0,0 +1,130 @@
+"""flask import-catalog: per-row rejects, upserts, re-runs and the cache warning"""
+import csv
+import pytest
+from extensions import db, cache
+from models import Product, ProductReviewStats, Review, Blog
+
+pytestmark = pytest.mark.postgres
+
+BLOGS_CSV = (
+    'title,introduction,body,conclusion,image_url,author,date_published\n'
+    'Imported,Intro,Body,Done,https://example.com/b.jpg,Anna,2025-02-01\n'
+)
+
+
+@pytest.fixture
+def blogs_csv(tmp_path):
+    path = tmp_path / 'blogs.csv'
+    path.write_text(BLOGS_CSV)
+    return str(path)
+
+
+def import_blogs(pg_app, blogs_csv):
+    result = pg_app.test_cli_runner().invoke(args=['import-catalog', '--blogs', blogs_csv])
+    assert result.exit_code == 0, result.output
+    return result
+
+
+def write_csv(tmp_path, name, rows):
+    path = tmp_path / name
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def product_row(product_id, price='999.00', **fields):
+    return {'product_id': product_id, 'name': f'Laptop {product_id}', 'brand': 'ASUS', 'category': 'Laptops',
+            'subcategory': '', 'price': price, 'image_url': f'https://example.com/{product_id}.jpg', **fields}
+
+
+def run_import(pg_app, *args):
+    result = pg_app.test_cli_runner().invoke(args=['import-catalog', *args])
+    assert result.exit_code == 0, result.output
+    return result
+
+
+def test_bad_prices_are_rejected_per_row(pg_app, pg_catalog, tmp_path):
+    products = write_csv(tmp_path, 'products.csv', [
+        product_row('OK1'),
+        product_row('NAN', price='nan'),
+        product_row('INF', price='inf'),
+        product_row('BIG', price='1e12'),
+        product_row('EDGE', price='99999999.999'),
+        product_row('OK2', price='99999999.99'),
+    ])
+    rejects_path = str(tmp_path / 'rejects.csv')
+
+    result = run_import(pg_app, '--products', products, '--rejects', rejects_path)
+
+    assert 'products read=6 loaded=2 rejected=4' in result.output
+    with open(rejects_path, newline='') as f:
+        reasons = {row['line']: row['reason'] for row in csv.DictReader(f)}
+    assert reasons == {
+        '3': 'Price must be a finite number',
+        '4': 'Price must be a finite number',
+        '5': 'Price must be less than 100,000,000',
+        '6': 'Price must be less than 100,000,000',
+    }
+    with pg_app.app_context():
+        assert sorted(db.session.scalars(db.select(Product.product_id))) == ['OK1', 'OK2']
+
+
+def test_rerun_updates_products_in_place(pg_app, pg_catalog, tmp_path):
+    run_import(pg_app, '--products', write_csv(tmp_path, 'v1.csv', [product_row('UP1')]))
+
+    result = run_import(pg_app, '--products', write_csv(tmp_path, 'v2.csv', [
+        product_row('UP1', price='799.50', name='Renamed'), product_row('UP2')
+    ]))
+
+    assert 'products read=2 loaded=2 rejected=0' in result.output
+    with pg_app.app_context():
+        renamed = db.session.get(Product, 'UP1')
+        assert (renamed.name, str(renamed.price)) == ('Renamed', '799.50')
+        assert db.session.query(Product).count() == 2
+
+
+def test_rerun_does_not_duplicate_reviews_and_blogs_without_ids(pg_app, pg_catalog, tmp_path):
+    pg_catalog(products=1)
+    reviews = write_csv(tmp_path, 'reviews.csv', [
+        {'product_id': 'P0000', 'user_alias': 'anna', 'review_text': 'Great keyboard and screen',
+         'category': 'Laptops', 'brand': 'ASUS', 'subcategory': '', 'date_posted': '2025-03-01 10:00:00'},
+        {'product_id': 'P0000', 'user_alias': 'ben', 'review_text': 'Battery could be better',
+         'category': 'Laptops', 'brand': 'ASUS', 'subcategory': '', 'date_posted': '2025-03-02 10:00:00'},
+    ])
+    blogs = write_csv(tmp_path, 'blogs.csv', [
+        {'title': 'Imported', 'introduction': 'Intro', 'body': 'Body', 'conclusion': 'Done',
+         'image_url': 'https://example.com/b.jpg', 'author': 'Anna', 'date_published': '2025-02-01'},
+    ])
+
+    run_import(pg_app, '--reviews', reviews, '--blogs', blogs)
+    run_import(pg_app, '--reviews', reviews, '--blogs', blogs)
+
+    with pg_app.app_context():
+        assert db.session.query(Review).count() == 2
+        assert db.session.query(Blog).count() == 1
+        assert db.session.get(ProductReviewStats, 'P0000').review_count == 2
+
+
+def test_memory_cache_is_left_alone_with_a_warning(pg_app, pg_catalog, blogs_csv, monkeypatch):
+    monkeypatch.setitem(pg_app.config, 'CACHE_BACKEND', 'memory')
+    monkeypatch.setattr(cache, 'ttl', 60)
+    cache.set('products:list?', b'{}')
+
+    result = import_blogs(pg_app, blogs_csv)
+
+    assert 'blogs    read=1 loaded=1' in result.output
+    assert "CACHE_BACKEND is 'memory'" in result.stderr
+    assert cache.get('products:list?')[0]
+
+
+def test_shared_cache_is_cleared(pg_app, pg_catalog, blogs_csv, monkeypatch):
+    monkeypatch.setitem(pg_app.config, 'CACHE_BACKEND', 'redis')  # the backend object stays in memory here
+    monkeypatch.setattr(cache, 'ttl', 60)
+    cache.set('products:list?', b'{}')
+
+    result = import_blogs(pg_app, blogs_csv)
+
+    assert 'Cleared the shared response cache' in result.output
+    assert not cache.get('products:list?')[0]
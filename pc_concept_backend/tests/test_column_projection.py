@@ -0,0 +1,55 @@
+"""Card-mode and blog summary listings select only the columns they serialize"""
+import re
+import pytest
+
+CARD_LISTINGS = [
+    '/products/?card_mode=true',
+    '/products/category/Laptops?card_mode=true',
+    '/products/category/Laptops/brand/ASUS?card_mode=true',
+    '/products/filter?category=Laptops&card_mode=true',
+    '/products/search?q=product&card_mode=true',
+]
+BLOG_SUMMARIES = ['/blogs/', '/blogs/latest', '/blogs/author/Anna', '/blogs/search?q=guide']
+
+
+def selected_columns(statements, table):
+    """Column list of the statement that fetched the page rows (not the COUNT)"""
+    selects = [s for s in statements if s.startswith('SELECT') and f'FROM {table}' in s and 'count(' not in s]
+    assert len(selects) == 1, statements
+    return re.split(r'\sFROM\s', selects[0], maxsplit=1)[0]
+
+
+@pytest.mark.parametrize('url', CARD_LISTINGS)
+def test_card_mode_selects_card_columns_only(client, catalog, count_statements, url):
+    catalog(products=3)
+    client.get('/products/category/Laptops?per_page=1')  # loads the taxonomy once per process
+
+    with count_statements() as statements:
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert set(response.get_json()['products'][0]) == {'product_id', 'name', 'price', 'image_url', 'image_srcset'}
+    columns = selected_columns(statements, 'products')
+    for column in ('brand', 'category', 'subcategory'):
+        assert f'products.{column}' not in columns, columns
+    assert 'product_specifications' not in ' '.join(statements)
+
+
+@pytest.mark.parametrize('url', BLOG_SUMMARIES)
+def test_blog_summaries_skip_body_and_conclusion(client, catalog, count_statements, url):
+    catalog(blogs=3)
+
+    with count_statements() as statements:
+        response = client.get(url)
+
+    assert response.status_code == 200
+    columns = selected_columns(statements, 'blogs')
+    assert 'blogs.body' not in columns and 'blogs.conclusion' not in columns, columns
+
+
+def test_full_content_still_loads_the_whole_blog(client, catalog):
+    catalog(blogs=1)
+
+    blog = client.get('/blogs/?full_content=true').get_json()['blogs'][0]
+
+    assert blog['body'] == 'Body text' and blog['conclusion'] == 'Done'
@@ -0,0 +1,65 @@
+"""ETags from the table_versions change counters, and writers that don't queue on them"""
+import pytest
+from sqlalchemy import select, text
+from extensions import db
+from models import TableVersion
+
+pytestmark = pytest.mark.postgres
+
+
+def test_if_none_match_gets_304_until_a_write(pg_app, pg_catalog):
+    pg_catalog(products=2)
+    client = pg_app.test_client()
+
+    first = client.get('/products/P0000')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+
+    repeat = client.get('/products/P0000', headers={'If-None-Match': etag})
+    assert repeat.status_code == 304
+    assert repeat.headers['ETag'] == etag
+    assert repeat.get_data() == b''
+
+    assert client.put('/products/P0000', json={'name': 'Renamed'}).status_code == 200
+
+    changed = client.get('/products/P0000', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.get_json()['name'] == 'Renamed'
+
+
+def test_tag_depends_on_the_path(pg_app, pg_catalog):
+    pg_catalog(products=2)
+    client = pg_app.test_client()
+
+    assert client.get('/products/P0000').headers['ETag'] != client.get('/products/P0001').headers['ETag']
+
+
+def version(conn, table):
+    return conn.execute(select(TableVersion.current_version).where(TableVersion.table_name == table)).scalar()
+
+
+def test_concurrent_writers_do_not_wait_for_each_other(pg_app, pg_catalog):
+    pg_catalog(products=2)
+    with pg_app.app_context():
+        engine = db.engine
+    with engine.connect() as before:
+        start = version(before, 'products')
+
+    first, second = engine.connect(), engine.connect()
+    try:
+        # Opposite table orders, as delete_product and import-catalog use
+        first.execute(text("UPDATE product_specifications SET spec_value = 'x' WHERE product_id = 'P0000'"))
+        second.execute(text("SET LOCAL lock_timeout = '500ms'"))
+        second.execute(text("UPDATE products SET price = 1 WHERE product_id = 'P0001'"))
+        second.execute(text("UPDATE product_specifications SET spec_value = 'y' WHERE product_id = 'P0001'"))
+        first.execute(text("SET LOCAL lock_timeout = '500ms'"))
+        first.execute(text("UPDATE products SET price = 2 WHERE product_id = 'P0000'"))
+        first.commit()
+        second.commit()
+    finally:
+        first.close()
+        second.close()
+
+    with engine.connect() as after:
+        assert version(after, 'products') == start + 2
@@ -0,0 +1,92 @@
+"""/products/facets and /reviews/facets: counts, the response cache and invalidation on writes"""
+import pytest
+from extensions import cache
+from facets import facet_counts
+from models import Review
+
+REVIEW = {'user_alias': 'anna', 'review_text': 'Fast and quiet laptop', 'category': 'Laptops', 'brand': 'ASUS'}
+
+
+@pytest.fixture
+def cached_facets(app, monkeypatch):
+    monkeypatch.setattr(cache, 'ttl', 60)
+    cache.clear()
+
+
+@pytest.fixture
+def mixed_catalog(catalog):
+    catalog(products=3, reviews_per_product=2)
+    catalog(products=2, reviews_per_product=1, category='Components', brand=None, subcategory='PC Cases', prefix='C')
+
+
+def test_facet_counts(client, mixed_catalog):
+    expected = {'total': 0, 'categories': {
+        'Laptops': {'count': 0, 'subcategories': {}, 'brands': {'ASUS': 0}},
+        'Components': {'count': 0, 'subcategories': {'PC Cases': 0}, 'brands': {}},
+    }}
+    for url, laptops, components in (('/products/facets', 3, 2), ('/reviews/facets', 6, 2)):
+        expected['total'] = laptops + components
+        expected['categories']['Laptops'].update(count=laptops, brands={'ASUS': laptops})
+        expected['categories']['Components'].update(count=components, subcategories={'PC Cases': components})
+        assert client.get(url).get_json() == expected, url
+
+
+@pytest.mark.parametrize('url', ['/products/facets', '/reviews/facets'])
+def test_facets_are_served_from_the_cache(client, mixed_catalog, cached_facets, count_statements, url):
+    first = client.get(url).get_json()
+
+    with count_statements() as statements:
+        assert client.get(url).get_json() == first
+    assert statements == []
+
+
+def test_review_facets_read_the_stats_table(client, mixed_catalog, count_statements):
+    with count_statements() as statements:
+        client.get('/reviews/facets')
+
+    assert not any('FROM reviews' in s for s in statements), statements
+
+
+def test_review_writes_invalidate_review_facets(app, client, mixed_catalog, cached_facets):
+    def facets():
+        response = client.get('/reviews/facets').get_json()
+        with app.app_context():
+            # The stats rows agree with a GROUP BY over reviews after every write
+            assert response == facet_counts(Review)
+        return response
+
+    assert facets()['categories']['Laptops']['brands'] == {'ASUS': 6}
+
+    created = client.post('/reviews/', json={**REVIEW, 'product_id': 'P0000', 'brand': 'acer'})
+    assert created.status_code == 201
+    assert facets()['categories']['Laptops']['brands'] == {'ASUS': 6, 'ACER': 1}
+
+    review_id = created.get_json()['review_id']
+    moved = client.put(f'/reviews/{review_id}', json={'category': 'Components', 'subcategory': 'PC Cases'})
+    assert moved.status_code == 200
+    after_move = facets()
+    assert after_move['categories']['Laptops'] == {'count': 6, 'subcategories': {}, 'brands': {'ASUS': 6}}
+    assert after_move['categories']['Components']['subcategories'] == {'PC Cases': 3}
+
+    assert client.put(f'/reviews/{review_id}', json={'category': 'Laptops', 'brand': 'ASUS'}).status_code == 200
+    assert facets()['categories']['Laptops']['brands'] == {'ASUS': 7}
+
+    assert client.delete(f'/reviews/{review_id}').status_code == 200
+    assert facets()['total'] == 8
+
+
+def test_product_writes_invalidate_product_facets(client, mixed_catalog, cached_facets):
+    assert client.get('/products/facets').get_json()['categories']['Laptops']['count'] == 3
+
+    assert client.post('/products/', json={
+        'product_id': 'N0001', 'name': 'New', 'category': 'Laptops', 'brand': 'ACER',
+        'price': 10, 'image_url': 'https://example.com/N0001.jpg'
+    }).status_code == 201
+    assert client.get('/products/facets').get_json()['categories']['Laptops']['brands'] == {'ASUS': 3, 'ACER': 1}
+
+    assert client.put('/products/C0000', json={'category': 'Laptops', 'brand': 'ASUS'}).status_code == 200
+    categories = client.get('/products/facets').get_json()['categories']
+    assert (categories['Laptops']['count'], categories['Components']['count']) == (5, 1)
+
+    assert client.delete('/products/N0001').status_code == 200
+    assert client.get('/products/facets').get_json()['total'] == 5
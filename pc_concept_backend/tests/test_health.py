@@ -0,0 +1,70 @@
+"""/health round-trips to the database and reports the pool; /health/ready also fails when saturated"""
+import pytest
+from extensions import db
+
+SMALL_POOL = {'pool_size': 2, 'max_overflow': 0, 'pool_timeout': 0.2}
+
+
+@pytest.fixture
+def pooled_app(make_app):
+    return make_app(SQLALCHEMY_ENGINE_OPTIONS=SMALL_POOL, HEALTH_POOL_SATURATION=0.5)
+
+
+def hold_connections(app, count):
+    with app.app_context():
+        return [db.engine.connect() for _ in range(count)]
+
+
+def test_health_reports_round_trip_and_pool(client):
+    response = client.get('/health')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['status'] == 'healthy' and body['database'] == 'connected'
+    assert body['latency_ms'] >= 0 and body['checkout_wait_ms'] >= 0
+    assert body['pool']['class'] == 'QueuePool'
+
+
+def test_health_fails_when_the_database_is_unreachable(make_app, tmp_path):
+    unreachable = make_app(SQLALCHEMY_DATABASE_URI=f'sqlite:///{tmp_path}/missing/dir/db.sqlite')
+
+    response = unreachable.test_client().get('/health')
+
+    assert response.status_code == 503
+    assert response.get_json()['database'] == 'unavailable'
+
+
+def test_ready_fails_at_saturation_while_health_passes(pooled_app):
+    held = hold_connections(pooled_app, 1)  # 1 of 2 connections: 50% utilization
+    try:
+        health = pooled_app.test_client().get('/health')
+        ready = pooled_app.test_client().get('/health/ready')
+    finally:
+        for conn in held:
+            conn.close()
+
+    assert health.status_code == 200
+    assert health.get_json()['pool']['checked_out'] == 1
+    assert ready.status_code == 503
+    assert ready.get_json()['ready'] is False
+    assert 'saturated' in ready.get_json()['error']
+
+
+def test_ready_passes_below_saturation(pooled_app):
+    response = pooled_app.test_client().get('/health/ready')
+
+    assert response.status_code == 200
+    assert response.get_json()['ready'] is True
+    assert response.get_json()['pool']['utilization'] == 0
+
+
+def test_exhausted_pool_fails_health_without_waiting(pooled_app):
+    held = hold_connections(pooled_app, 2)
+    try:
+        response = pooled_app.test_client().get('/health')
+    finally:
+        for conn in held:
+            conn.close()
+
+    assert response.status_code == 503
+    assert 'exhausted' in response.get_json()['error']
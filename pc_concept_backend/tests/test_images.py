@@ -0,0 +1,53 @@
+"""Cloudinary resize URLs, srcset and how other image URLs pass through"""
+import pytest
+from extensions import db
+from images import resized_url, srcset, variant_url
+from models import Blog, Product
+
+CLOUDINARY = 'https://res.cloudinary.com/demo/image/upload/v1712/products/laptops/P0000.jpg'
+
+
+def resized(width):
+    return f'https://res.cloudinary.com/demo/image/upload/c_limit,w_{width},f_auto,q_auto/v1712/products/laptops/P0000.jpg'
+
+
+def test_resized_url_inserts_the_transformation():
+    assert resized_url(CLOUDINARY, 400) == resized(400)
+    assert variant_url(CLOUDINARY, 'card') == resized(400)
+
+
+def test_srcset_lists_each_width():
+    assert srcset(CLOUDINARY) == f'{resized(200)} 200w, {resized(400)} 400w, {resized(800)} 800w'
+    assert srcset(CLOUDINARY, widths=(100,)) == f'{resized(100)} 100w'
+
+
+@pytest.mark.parametrize('url', [
+    'https://example.com/P0000.jpg',
+    'https://example.com/image/upload/P0000.jpg',  # upload path on another host
+    'https://res.cloudinary.com/demo/video/upload/v1712/clip.mp4',
+    '',
+    None,
+])
+def test_other_urls_pass_through(url):
+    assert resized_url(url, 400) == url
+    assert variant_url(url, 'card') == url
+    assert srcset(url) is None
+
+
+def test_card_listings_and_latest_blogs_get_card_images(app, client, catalog):
+    catalog(products=2, blogs=1)
+    with app.app_context():
+        db.session.get(Product, 'P0000').image_url = CLOUDINARY
+        db.session.execute(db.update(Blog).values(image_url=CLOUDINARY))
+        db.session.commit()
+
+    cards = {p['product_id']: p for p in client.get('/products/?card_mode=true').get_json()['products']}
+    assert cards['P0000']['image_url'] == resized(400)
+    assert cards['P0000']['image_srcset'] == srcset(CLOUDINARY)
+    assert cards['P0001']['image_url'] == 'https://example.com/P0001.jpg'
+    assert cards['P0001']['image_srcset'] is None
+
+    latest = client.get('/blogs/latest').get_json()[0]
+    assert (latest['image_url'], latest['image_srcset']) == (resized(400), srcset(CLOUDINARY))
+    # Full-size pages keep the original upload
+    assert client.get('/products/P0000').get_json()['image_url'] == CLOUDINARY
@@ -0,0 +1,89 @@
+"""Every catalog query behind the filter and sort endpoints must be able to use an index
+
+Each endpoint is requested once while its SQL is recorded, then every
+statement on the catalog tables is EXPLAINed with enable_seqscan off. The
+planner still picks a sequential scan when no index fits the query shape,
+or walks a whole index for its order while filtering every row, so either
+in a plan means an index is missing (or a query changed).
+"""
+import re
+import pytest
+from sqlalchemy import event, text
+from extensions import db
+
+pytestmark = pytest.mark.postgres
+
+CATALOG_TABLES = re.compile(r'\b(products|product_specifications|reviews|blogs)\b')
+
+ENDPOINTS = [
+    '/products/category/Laptops',
+    '/products/category/Components/subcategory/PC Cases',
+    '/products/category/Laptops/brand/ASUS',
+    '/products/filter?category=Laptops&brand=ASUS',
+    '/products/filter?brand=ASUS',
+    '/products/search?q=product',
+    '/reviews/',
+    '/reviews/?cursor=',
+    '/reviews/product/P0000',
+    '/reviews/filter?category=Laptops&brand=ASUS',
+    '/reviews/filter?brand=ASUS',
+    '/blogs/',
+    '/blogs/?cursor=',
+    '/blogs/latest',
+    '/blogs/author/Anna',
+    '/blogs/search?q=guide',
+]
+
+
+def full_scans(plan):
+    """Scan nodes in an EXPLAIN (FORMAT JSON) plan that read a table without an index condition"""
+    found = []
+    if plan['Node Type'] == 'Seq Scan':
+        found.append(f"Seq Scan on {plan['Relation Name']}")
+    elif plan['Node Type'] in ('Index Scan', 'Index Only Scan') and 'Filter' in plan and 'Index Cond' not in plan:
+        found.append(f"{plan['Node Type']} on {plan['Relation Name']} filtering {plan['Filter']}")
+    for child in plan.get('Plans', []):
+        found.extend(full_scans(child))
+    return found
+
+
+@pytest.fixture
+def recorded_queries(pg_app):
+    """(statement, parameters) for every SELECT on the primary engine while the test runs"""
+    queries = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            queries.append((statement, parameters))
+
+    with pg_app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield queries
+    event.remove(engine, 'before_cursor_execute', record)
+
+
+@pytest.mark.parametrize('url', ENDPOINTS)
+def test_endpoint_queries_use_indexes(pg_app, pg_catalog, recorded_queries, url):
+    # A mixed catalog, so every filter is selective and an index beats walking the table
+    pg_catalog(products=20, reviews_per_product=3, blogs=20)
+    pg_catalog(products=200, reviews_per_product=3, category='Components', brand=None,
+               subcategory='PC Cases', prefix='C')
+    pg_catalog(products=200, reviews_per_product=3, category='Laptops', brand='LENOVO', prefix='L')
+    with pg_app.app_context():
+        db.session.execute(text('ANALYZE'))
+        db.session.commit()
+    recorded_queries.clear()
+
+    response = pg_app.test_client().get(url)
+    assert response.status_code == 200
+
+    catalog_queries = [(s, p) for s, p in recorded_queries if CATALOG_TABLES.search(s)]
+    assert catalog_queries, f'{url} ran no catalog queries'
+    with pg_app.app_context():
+        conn = db.session.connection()
+        conn.exec_driver_sql('SET LOCAL enable_seqscan = off')
+        for statement, parameters in catalog_queries:
+            plan = conn.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters).scalar()[0]['Plan']
+            assert not full_scans(plan), f'{url}\n{statement}\n{full_scans(plan)}'
+        db.session.rollback()
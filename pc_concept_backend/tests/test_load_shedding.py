@@ -0,0 +1,157 @@
+"""503 + Retry-After instead of a 500 when the pool is exhausted or a query hits statement_timeout"""
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from config import build_engine_options
+from extensions import db
+from conftest import BACKEND_DIR, POSTGRES_URL
+from review_stats import rebuild_review_stats
+
+
+class QueryCanceled(sqlite3.OperationalError):
+    """Stands in for psycopg2's QueryCanceled on SQLite"""
+    pgcode = '57014'
+
+
+def fail_next_query(app, error):
+    """Fail the next statement on the app's engine with error, wrapped as SQLAlchemy wraps driver errors"""
+    with app.app_context():
+        engine = db.engine
+
+    def raise_error(conn, cursor, statement, parameters, context, executemany):
+        event.remove(engine, 'before_cursor_execute', raise_error)
+        raise OperationalError(statement, parameters, error)
+
+    event.listen(engine, 'before_cursor_execute', raise_error)
+
+
+def test_pool_exhaustion_returns_503(make_app, catalog):
+    catalog(products=1)
+    small = make_app(SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 1, 'max_overflow': 0, 'pool_timeout': 0.1})
+    with small.app_context():
+        held = db.engine.connect()
+    try:
+        response = small.test_client().get('/products/')
+    finally:
+        held.close()
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert response.get_json() == {'error': 'Database busy, please retry'}
+    assert small.test_client().get('/products/').status_code == 200  # and recovers once a connection is free
+
+
+def test_statement_timeout_returns_503(app, client, catalog):
+    catalog(products=1)
+    fail_next_query(app, QueryCanceled('canceling statement due to statement timeout'))
+
+    response = client.get('/products/')
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert response.get_json() == {'error': 'Query timed out'}
+
+
+def test_other_operational_errors_stay_500(app, client, catalog):
+    catalog(products=1)
+    fail_next_query(app, sqlite3.OperationalError('disk I/O error'))
+
+    response = client.get('/products/')
+
+    assert response.status_code == 500
+    assert 'Retry-After' not in response.headers
+
+
+@pytest.mark.postgres
+@pytest.mark.parametrize('pgbouncer', [False, True], ids=['startup-option', 'set-local'])
+def test_postgres_statement_timeout_returns_503(pg_app, pg_catalog, make_app, monkeypatch, pgbouncer):
+    """A real statement_timeout, set at connection startup or (PgBouncer mode) per transaction"""
+    pg_catalog(products=1)
+    monkeypatch.setattr('config.DB_STATEMENT_TIMEOUT_MS', 100)
+    monkeypatch.setattr('config.DB_PGBOUNCER', pgbouncer)
+    timed = make_app(
+        SQLALCHEMY_DATABASE_URI=POSTGRES_URL, SQLALCHEMY_ENGINE_OPTIONS=build_engine_options(POSTGRES_URL),
+        DB_STATEMENT_TIMEOUT_MS=100, DB_PGBOUNCER=pgbouncer
+    )
+    with timed.app_context():
+        engine = db.engine
+
+    def slow_products_query(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM products' in statement:
+            statement = 'SELECT pg_sleep(1); ' + statement
+        return statement, parameters
+
+    event.listen(engine, 'before_cursor_execute', slow_products_query, retval=True)
+    try:
+        response = timed.test_client().get('/products/')
+    finally:
+        event.remove(engine, 'before_cursor_execute', slow_products_query)
+
+    assert response.status_code == 503
+    assert response.get_json() == {'error': 'Query timed out'}
+    assert timed.test_client().get('/products/').status_code == 200
+
+
+def slow_statements(marker):
+    """before_cursor_execute hook that makes statements containing marker take 0.3s"""
+    def slow(conn, cursor, statement, parameters, context, executemany):
+        if marker in statement:
+            statement = 'SELECT pg_sleep(0.3); ' + statement
+        return statement, parameters
+    return slow
+
+
+@pytest.mark.postgres
+@pytest.mark.parametrize('pgbouncer', [False, True], ids=['startup-option', 'set-local'])
+def test_rebuild_review_stats_is_not_cut_off_by_statement_timeout(pg_app, pg_catalog, make_app,
+                                                                 monkeypatch, pgbouncer):
+    pg_catalog(products=2, reviews_per_product=2)
+    monkeypatch.setattr('config.DB_STATEMENT_TIMEOUT_MS', 100)
+    monkeypatch.setattr('config.DB_PGBOUNCER', pgbouncer)
+    timed = make_app(
+        SQLALCHEMY_DATABASE_URI=POSTGRES_URL, SQLALCHEMY_ENGINE_OPTIONS=build_engine_options(POSTGRES_URL),
+        DB_STATEMENT_TIMEOUT_MS=100, DB_PGBOUNCER=pgbouncer
+    )
+    with timed.app_context():
+        engine = db.engine
+        slow = slow_statements('FROM reviews')
+        event.listen(engine, 'before_cursor_execute', slow, retval=True)
+        try:
+            assert rebuild_review_stats() == (2, 1)
+        finally:
+            event.remove(engine, 'before_cursor_execute', slow)
+
+
+# Run in a subprocess: Alembic's env.py reconfigures logging for the whole process
+MIGRATE_SLOWLY = textwrap.dedent("""
+    from flask_migrate import downgrade, upgrade
+    from sqlalchemy import event
+    from app import create_app
+    from extensions import db
+
+    def slow(conn, cursor, statement, parameters, context, executemany):
+        if 'CREATE INDEX' in statement:
+            statement = 'SELECT pg_sleep(0.3); ' + statement
+        return statement, parameters
+
+    app = create_app()
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', slow, retval=True)
+        downgrade(revision='4a7f19c3e8b2')  # back past the index rebuild in b83e5f2a9c61
+        upgrade()
+""")
+
+
+@pytest.mark.postgres
+def test_migrations_are_not_cut_off_by_statement_timeout(pg_app):
+    migrate = subprocess.run(
+        [sys.executable, '-c', MIGRATE_SLOWLY],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+        env={**os.environ, 'DATABASE_URL': POSTGRES_URL, 'DB_STATEMENT_TIMEOUT_MS': '100'},
+    )
+    assert migrate.returncode == 0, migrate.stderr[-2000:]
@@ -0,0 +1,64 @@
+"""Per-request instrumentation: Server-Timing, structured log lines and GET /metrics"""
+import json
+import logging
+import re
+from metrics import Histogram
+
+
+def test_server_timing_reports_statement_count(client, catalog, count_statements):
+    catalog(products=3)
+
+    with count_statements() as statements:
+        response = client.get('/products/?per_page=3')
+
+    timing = response.headers['Server-Timing']
+    assert re.fullmatch(r'app;dur=[\d.]+, db;desc="(\d+) queries";dur=[\d.]+', timing)
+    assert int(re.search(r'"(\d+) queries"', timing).group(1)) == len(statements) == 3
+
+
+def test_each_request_logs_one_json_line(client, catalog, caplog):
+    catalog(products=2)
+
+    with caplog.at_level(logging.INFO, logger='request_metrics'):
+        response = client.get('/products/?per_page=2')
+
+    [record] = [r for r in caplog.records if r.name == 'request_metrics']
+    line = json.loads(record.getMessage())
+    assert line['endpoint'] == 'products.get_products'
+    assert line['status'] == 200
+    assert line['sql_statements'] == 3
+    assert line['bytes'] == len(response.data)
+
+
+def test_metrics_endpoint_aggregates_per_endpoint(client, catalog):
+    catalog(products=1)
+    client.get('/products/')
+    client.get('/products/')
+    client.get('/products/NOPE')
+
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    count = re.search(r'^http_request_duration_seconds_count\{endpoint="products.get_products",method="GET"\} (\d+)$',
+                      text, re.M)
+    assert count and int(count.group(1)) >= 2
+    assert re.search(r'^http_requests_total\{endpoint="products.get_product",method="GET",status="404"\} \d+$',
+                     text, re.M)
+    assert re.search(r'^db_statements_per_request_bucket\{endpoint="products.get_products",method="GET",le="3"\} \d+$',
+                     text, re.M)
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('latency', 'help', (0.1, 1.0), ('endpoint',))
+    for value in (0.05, 0.5, 0.7, 5.0):
+        histogram.observe(('e',), value)
+
+    lines = histogram.render()
+
+    assert 'latency_bucket{endpoint="e",le="0.1"} 1' in lines
+    assert 'latency_bucket{endpoint="e",le="1.0"} 3' in lines
+    assert 'latency_bucket{endpoint="e",le="+Inf"} 4' in lines
+    assert 'latency_count{endpoint="e"} 4' in lines
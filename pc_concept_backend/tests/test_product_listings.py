@@ -0,0 +1,44 @@
+"""Offset pages of the product listings are stable: product_id order, no gaps or repeats"""
+import random
+import pytest
+from extensions import db
+from models import Product
+
+LISTINGS = [
+    '/products/',
+    '/products/category/Laptops',
+    '/products/category/Laptops/brand/ASUS',
+    '/products/category/Components/subcategory/PC Cases',
+    '/products/filter?category=Laptops&brand=ASUS',
+]
+
+
+@pytest.fixture
+def shuffled_catalog(app):
+    """Products inserted out of ID order, so an unordered query wouldn't return them sorted"""
+    rows = [('Laptops', 'ASUS', None)] * 12 + [('Components', None, 'PC Cases')] * 12
+    ids = [f'P{i:04d}' for i in range(len(rows))]
+    order = list(range(len(rows)))
+    random.Random(7).shuffle(order)
+    with app.app_context():
+        for i in order:
+            category, brand, subcategory = rows[i]
+            db.session.add(Product(
+                product_id=ids[i], name=f'Product {i}', brand=brand, category=category,
+                subcategory=subcategory, price=100, image_url='https://example.com/p.jpg'
+            ))
+            db.session.commit()  # one INSERT per row, in shuffled order
+    return ids
+
+
+@pytest.mark.parametrize('url', LISTINGS)
+def test_pages_follow_product_id_order(client, shuffled_catalog, url):
+    separator = '&' if '?' in url else '?'
+    seen = []
+    for page in (1, 2, 3):
+        response = client.get(f'{url}{separator}card_mode=true&per_page=5&page={page}')
+        assert response.status_code == 200
+        seen.extend(p['product_id'] for p in response.get_json()['products'])
+
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen))
@@ -0,0 +1,53 @@
+"""Statement counts for the product read paths, so the N+1 spec loading can't come back"""
+
+
+def test_full_mode_listing_loads_specs_in_one_query(client, catalog, count_statements):
+    catalog(products=30, specs_per_product=3)
+
+    with count_statements() as statements:
+        response = client.get('/products/?per_page=30')
+
+    assert response.status_code == 200
+    products = response.get_json()['products']
+    assert len(products) == 30
+    assert all(len(p['specifications']) == 3 for p in products)
+    # page of products, COUNT for the total, specifications for the whole page
+    assert len(statements) == 3, statements
+
+
+def test_listing_statement_count_does_not_grow_with_page_size(client, catalog, count_statements):
+    catalog(products=30)
+
+    with count_statements() as small_page:
+        client.get('/products/?per_page=5')
+    with count_statements() as full_page:
+        client.get('/products/?per_page=30')
+
+    assert len(full_page) == len(small_page)
+
+
+def test_category_listing_loads_specs_in_one_query(client, catalog, count_statements):
+    catalog(products=30)
+    client.get('/products/category/Laptops?per_page=1')  # loads the taxonomy once per process
+
+    with count_statements() as statements:
+        response = client.get('/products/category/Laptops?per_page=30')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['products']) == 30
+    assert len(statements) == 3, statements
+
+
+def test_detail_view_issues_three_statements(client, catalog, count_statements):
+    product_id = catalog(products=1, specs_per_product=4, reviews_per_product=8)[0]
+
+    with count_statements() as statements:
+        response = client.get(f'/products/{product_id}/detail')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert len(body['product']['specifications']) == 4
+    assert body['review_count'] == 8
+    assert len(body['reviews']) == 5
+    # product joined with its specs, review count from product_review_stats, latest reviews
+    assert len(statements) == 3, statements
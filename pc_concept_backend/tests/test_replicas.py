@@ -0,0 +1,144 @@
+"""Read-replica routing: replica reads, read-your-writes, the cache bypass and lag fallback
+
+The replica is a second SQLite file holding a different copy of the same
+product, so each response shows which database served it.
+"""
+import threading
+import time
+import pytest
+from sqlalchemy import create_engine, insert, update
+from extensions import db, cache, replicas
+from models import Product, TableVersion
+from replicas import READ_PRIMARY_COOKIE, READ_PRIMARY_HEADER, READ_PRIMARY_FOR_HEADER
+
+FRONTEND = 'http://localhost:5173'
+
+
+def add_product(conn, name):
+    conn.execute(insert(Product).values(
+        product_id='R0001', name=name, brand='ASUS', category='Laptops', price=999,
+        image_url='https://example.com/R0001.jpg'
+    ))
+    conn.execute(insert(TableVersion).values(table_name='products', version=1))
+
+
+@pytest.fixture
+def replica_app(app, make_app, tmp_path):
+    """make(**config) -> an app whose primary and replica_0 hold different copies of product R0001"""
+    url = f'sqlite:///{tmp_path}/replica.db'
+    engine = create_engine(url)
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        add_product(conn, 'Replica copy')
+    engine.dispose()
+    with app.app_context():
+        add_product(db.session.connection(), 'Primary copy')
+        db.session.commit()
+
+    def make(**config):
+        config = {'SQLALCHEMY_BINDS': {'replica_0': {'url': url}}, 'REPLICA_CHECK_SECONDS': 3600, **config}
+        return make_app(**config)
+
+    yield make
+    replicas.reset()
+
+
+def product_name(client):
+    response = client.get('/products/R0001')
+    assert response.status_code == 200
+    return response.get_json()['name']
+
+
+def test_get_reads_from_healthy_replica(replica_app):
+    client = replica_app().test_client()
+    replicas.check()
+
+    assert replicas.status()['replica_0']['healthy']
+    assert product_name(client) == 'Replica copy'
+
+
+def test_reads_stick_to_primary_after_a_write(replica_app):
+    client = replica_app().test_client()
+    replicas.check()
+
+    response = client.post('/products/', json={
+        'product_id': 'W0001', 'name': 'New', 'category': 'Laptops', 'brand': 'ASUS',
+        'price': 10, 'image_url': 'https://example.com/W0001.jpg'
+    })
+
+    assert response.status_code == 201
+    assert client.get_cookie(READ_PRIMARY_COOKIE) is not None
+    assert product_name(client) == 'Primary copy'
+
+
+def test_cross_origin_client_reads_its_writes_through_the_header(replica_app):
+    client = replica_app(REPLICA_STICKY_SECONDS=7).test_client()
+    replicas.check()
+
+    # What the browser does for axios: no cookies cross-origin, preflight for the custom header
+    response = client.post('/products/', headers={'Origin': FRONTEND}, json={
+        'product_id': 'W0002', 'name': 'New', 'category': 'Laptops', 'brand': 'ASUS',
+        'price': 10, 'image_url': 'https://example.com/W0002.jpg'
+    })
+    assert response.status_code == 201
+    assert response.headers[READ_PRIMARY_FOR_HEADER] == '7'
+    assert READ_PRIMARY_FOR_HEADER in response.headers['Access-Control-Expose-Headers']
+
+    preflight = client.options('/products/R0001', headers={
+        'Origin': FRONTEND, 'Access-Control-Request-Method': 'GET',
+        'Access-Control-Request-Headers': READ_PRIMARY_HEADER.lower(),
+    })
+    assert READ_PRIMARY_HEADER.lower() in preflight.headers['Access-Control-Allow-Headers'].lower()
+
+    client.delete_cookie(READ_PRIMARY_COOKIE)
+    assert product_name(client) == 'Replica copy'
+    read = client.get('/products/R0001', headers={'Origin': FRONTEND, READ_PRIMARY_HEADER: '1'})
+    assert read.get_json()['name'] == 'Primary copy'
+    assert read.headers['Access-Control-Allow-Origin'] == FRONTEND
+
+
+def test_replica_responses_are_not_cached(replica_app):
+    client = replica_app(CACHE_TTL=60).test_client()
+    replicas.check()
+
+    assert product_name(client) == 'Replica copy'
+    assert cache.get('product:R0001') == (False, None)
+
+
+def test_read_primary_cookie_skips_the_cache(replica_app):
+    app = replica_app(CACHE_TTL=60)
+    cache.set('product:R0001', b'{"name": "Cached copy"}')
+    client = app.test_client()
+    client.set_cookie(READ_PRIMARY_COOKIE, '1')
+
+    assert product_name(client) == 'Primary copy'
+    assert cache.get('product:R0001') == (True, b'{"name": "Cached copy"}')
+
+
+def test_lagging_replica_falls_back_to_primary(replica_app, app):
+    client = replica_app(REPLICA_MAX_LAG_SECONDS=0).test_client()
+    replicas.check()
+    assert replicas.status()['replica_0']['healthy']
+
+    # A write on the primary the replica hasn't replayed
+    with app.app_context():
+        db.session.execute(update(TableVersion).where(TableVersion.table_name == 'products').values(version=2))
+        db.session.commit()
+    time.sleep(0.01)
+    replicas.check()
+
+    assert not replicas.status()['replica_0']['healthy']
+    assert product_name(client) == 'Primary copy'
+
+
+def test_slow_check_does_not_block_requests(replica_app, monkeypatch):
+    client = replica_app().test_client()
+    release = threading.Event()
+    monkeypatch.setattr(replicas, 'check', lambda: release.wait(10))
+
+    try:
+        started = time.monotonic()
+        assert product_name(client) == 'Primary copy'  # no verdict yet, so the primary
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
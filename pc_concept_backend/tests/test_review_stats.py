@@ -0,0 +1,59 @@
+"""Review stats rows: created on the first review, and safe when two first reviews race"""
+import pytest
+from sqlalchemy import delete, event, insert
+from extensions import db
+from models import CategoryReviewStats, ProductReviewStats
+
+REVIEW = {'user_alias': 'anna', 'review_text': 'Fast and quiet laptop', 'category': 'Laptops', 'brand': 'ASUS'}
+
+
+def stats(app, product_id):
+    with app.app_context():
+        return (
+            db.session.get(ProductReviewStats, product_id).review_count,
+            db.session.get(CategoryReviewStats, 'Laptops').review_count
+        )
+
+
+def drop_stats(app):
+    with app.app_context():
+        db.session.execute(delete(ProductReviewStats))
+        db.session.execute(delete(CategoryReviewStats))
+        db.session.commit()
+
+
+def test_first_review_creates_missing_stats_rows(app, client, catalog):
+    product_id = catalog(products=1)[0]
+    drop_stats(app)
+
+    assert client.post('/reviews/', json={**REVIEW, 'product_id': product_id}).status_code == 201
+    assert client.post('/reviews/', json={**REVIEW, 'product_id': product_id}).status_code == 201
+
+    assert stats(app, product_id) == (2, 2)
+
+
+@pytest.mark.postgres
+def test_racing_first_review_is_added_to_the_committed_row(pg_app, pg_catalog):
+    """Another first review commits its stats rows between our UPDATE (no row) and INSERT"""
+    product_id = pg_catalog(products=1)[0]
+    drop_stats(pg_app)
+    with pg_app.app_context():
+        engine = db.engine
+    raced = set()
+
+    def commit_competing_row(conn, cursor, statement, parameters, context, executemany):
+        for model, key in ((ProductReviewStats, {'product_id': product_id}), (CategoryReviewStats, {'category': 'Laptops'})):
+            if statement.startswith(f'INSERT INTO {model.__tablename__}') and model not in raced:
+                raced.add(model)
+                with engine.begin() as other:
+                    other.execute(insert(model).values(review_count=1, **key))
+
+    event.listen(engine, 'before_cursor_execute', commit_competing_row)
+    try:
+        response = pg_app.test_client().post('/reviews/', json={**REVIEW, 'product_id': product_id})
+    finally:
+        event.remove(engine, 'before_cursor_execute', commit_competing_row)
+
+    assert raced == {ProductReviewStats, CategoryReviewStats}
+    assert response.status_code == 201
+    assert stats(pg_app, product_id) == (2, 2)
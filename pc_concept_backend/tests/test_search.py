@@ -0,0 +1,46 @@
+"""Blog search: full-text on Postgres, with ILIKE for queries made only of stopwords"""
+from datetime import date
+import pytest
+from extensions import db
+from models import Blog
+
+
+def add_blogs(app):
+    with app.app_context():
+        db.session.add_all([
+            Blog(title='Choosing the right GPU', introduction='Intro', body='Gaming benchmarks',
+                 conclusion='Done', author='Anna', date_published=date(2025, 1, 1)),
+            Blog(title='Quiet cases', introduction='Intro', body='Airflow and noise',
+                 conclusion='Done', author='Anna', date_published=date(2025, 1, 2)),
+        ])
+        db.session.commit()
+
+
+def titles(response):
+    assert response.status_code == 200
+    return [b['title'] for b in response.get_json()['blogs']]
+
+
+def test_search_matches_title_and_content(app, client):
+    add_blogs(app)
+
+    assert titles(client.get('/blogs/search?q=gpu')) == ['Choosing the right GPU']
+    assert titles(client.get('/blogs/search?q=airflow')) == ['Quiet cases']
+
+
+@pytest.mark.postgres
+def test_postgres_search_is_full_text_with_prefixes(pg_app, pg_catalog):
+    add_blogs(pg_app)
+    client = pg_app.test_client()
+
+    assert titles(client.get('/blogs/search?q=gam')) == ['Choosing the right GPU']  # prefix of 'gaming'
+    assert titles(client.get('/blogs/search?q=the gpu')) == ['Choosing the right GPU']  # stopword dropped
+
+
+@pytest.mark.postgres
+def test_postgres_stopword_only_search_falls_back_to_ilike(pg_app, pg_catalog):
+    add_blogs(pg_app)
+    client = pg_app.test_client()
+
+    assert titles(client.get('/blogs/search?q=the')) == ['Choosing the right GPU']
+    assert titles(client.get('/blogs/search?q=and')) == ['Quiet cases']
@@ -0,0 +1,55 @@
+"""JSON providers and row serializers: orjson and stdlib must produce the same API responses"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from serialization import OrjsonProvider, StdlibProvider, format_timestamp, row_serializer
+from models import Review
+
+PAYLOAD = {'price': Decimal('1299.90'), 'published': date(2025, 3, 1),
+           'posted': datetime(2025, 3, 1, 14, 5, 9), 'name': 'Zephyrus', 'nested': [{'b': 1, 'a': None}]}
+
+READ_URLS = [
+    '/products/?per_page=5',
+    '/products/?per_page=5&card_mode=true',
+    '/products/P0001',
+    '/products/P0001/detail',
+    '/reviews/?include_product_name=true',
+    '/reviews/product/P0001',
+    '/blogs/',
+    '/blogs/1',
+]
+
+
+@pytest.mark.parametrize('provider', [OrjsonProvider, StdlibProvider])
+def test_providers_encode_database_types(app, provider):
+    encoded = json.loads(provider(app).dumps(PAYLOAD))
+
+    assert encoded == {'price': 1299.9, 'published': '2025-03-01', 'posted': '2025-03-01T14:05:09',
+                       'name': 'Zephyrus', 'nested': [{'a': None, 'b': 1}]}
+
+
+def test_providers_produce_the_same_text(app):
+    assert OrjsonProvider(app).dumps(PAYLOAD) == json.dumps(
+        json.loads(StdlibProvider(app).dumps(PAYLOAD)), sort_keys=True, separators=(',', ':')
+    )
+
+
+def test_row_serializer_converts_non_null_values():
+    serialize = row_serializer((Review.review_id, Review.brand, Review.date_posted), date_posted=format_timestamp)
+
+    assert serialize((7, None, datetime(2025, 1, 2, 3, 4, 5, 678))) == {
+        'review_id': 7, 'brand': None, 'date_posted': '2025-01-02 03:04:05'
+    }
+    assert serialize((8, 'ASUS', None))['date_posted'] is None
+
+
+def test_endpoints_match_across_providers(app, client, catalog, monkeypatch):
+    catalog(products=5, reviews_per_product=3, blogs=2)
+    with_orjson = {url: client.get(url) for url in READ_URLS}
+
+    monkeypatch.setattr(app, 'json', StdlibProvider(app))
+    for url in READ_URLS:
+        response = client.get(url)
+        assert response.status_code == with_orjson[url].status_code == 200, url
+        assert response.get_json() == with_orjson[url].get_json(), url
@@ -0,0 +1,84 @@
+"""Bulk specification insert: per-row outcomes for all-or-nothing, partial and racing imports"""
+import pytest
+from sqlalchemy import event, insert
+from extensions import db
+from models import ProductSpecification
+
+
+def statuses(response):
+    return [r['status'] for r in response.get_json()['results']]
+
+
+def spec_count(app):
+    with app.app_context():
+        return ProductSpecification.query.count()
+
+
+@pytest.fixture
+def product_id(catalog):
+    return catalog(products=1, specs_per_product=1)[0]  # has 'Spec 0'
+
+
+def test_invalid_row_rejects_batch_and_reports_valid_rows_not_inserted(app, client, product_id):
+    response = client.post('/specs/', json=[
+        {'product_id': product_id, 'spec_name': 'RAM', 'spec_value': '16GB'},
+        {'product_id': product_id, 'spec_name': 'CPU'},
+        {'product_id': 'NOPE', 'spec_name': 'GPU', 'spec_value': 'RTX'},
+    ])
+
+    assert response.status_code == 400
+    assert statuses(response) == ['not_inserted', 'invalid', 'invalid']
+    assert spec_count(app) == 1
+
+
+def test_duplicate_rejects_batch(app, client, product_id):
+    response = client.post('/specs/', json=[
+        {'product_id': product_id, 'spec_name': 'Spec 0', 'spec_value': 'again'},
+        {'product_id': product_id, 'spec_name': 'RAM', 'spec_value': '16GB'},
+    ])
+
+    assert response.status_code == 409
+    assert statuses(response) == ['duplicate', 'not_inserted']
+    assert spec_count(app) == 1
+
+
+def test_partial_inserts_valid_rows(app, client, product_id):
+    response = client.post('/specs/?partial=true', json=[
+        {'product_id': product_id, 'spec_name': 'Spec 0', 'spec_value': 'again'},
+        {'product_id': product_id, 'spec_name': 'RAM', 'spec_value': '16GB'},
+        {'product_id': product_id, 'spec_name': 'RAM', 'spec_value': '32GB'},
+    ])
+
+    assert response.status_code == 201
+    assert statuses(response) == ['duplicate', 'created', 'duplicate']
+    assert response.get_json()['count'] == 1
+    assert spec_count(app) == 2
+
+
+def test_spec_inserted_concurrently_is_reported_as_duplicate(app, client, product_id):
+    """Another request inserts the same spec between the duplicate check and the INSERT"""
+    with app.app_context():
+        engine = db.engine
+    raced = []
+
+    def insert_first(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT INTO product_specifications') and not raced:
+            raced.append(True)
+            with engine.begin() as other:
+                other.execute(insert(ProductSpecification).values(
+                    product_id=product_id, spec_name='RAM', spec_value='8GB'
+                ))
+
+    event.listen(engine, 'before_cursor_execute', insert_first)
+    try:
+        response = client.post('/specs/', json=[
+            {'product_id': product_id, 'spec_name': 'RAM', 'spec_value': '16GB'},
+            {'product_id': product_id, 'spec_name': 'CPU', 'spec_value': 'i7'},
+        ])
+    finally:
+        event.remove(engine, 'before_cursor_execute', insert_first)
+
+    assert raced
+    assert response.status_code == 201
+    assert statuses(response) == ['duplicate', 'created']
+    assert spec_count(app) == 3
@@ -0,0 +1,113 @@
+"""upload_to_cloudinary.py with LocalUploader: manifest skips, retries and the image_url write-back"""
+import pytest
+import upload_to_cloudinary
+from upload_to_cloudinary import LocalUploader, Manifest, collect_jobs, update_image_urls, upload_images
+from extensions import db
+from models import Blog, Product
+
+
+@pytest.fixture
+def images(tmp_path):
+    """An images dir with laptops/P0000.jpg, laptops/P0001.jpg and blogs/<blog_id>.jpg (same bytes as P0000)"""
+    def make(blog_id=1):
+        root = tmp_path / 'images'
+        (root / 'laptops').mkdir(parents=True, exist_ok=True)
+        (root / 'blogs').mkdir(exist_ok=True)
+        (root / 'laptops' / 'P0000.jpg').write_bytes(b'same image')
+        (root / 'laptops' / 'P0001.jpg').write_bytes(b'other image')
+        (root / 'blogs' / f'{blog_id}.jpg').write_bytes(b'same image')
+        return root
+    return make
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    delays = []
+    monkeypatch.setattr(upload_to_cloudinary.time, 'sleep', delays.append)
+    return delays
+
+
+def run(images_dir, uploader, manifest_path):
+    return upload_images(collect_jobs(str(images_dir)), uploader, Manifest(manifest_path), workers=4, retries=2)
+
+
+class FlakyUploader(LocalUploader):
+    """Fails the first `failures` uploads of every image"""
+
+    def __init__(self, target_dir, failures):
+        super().__init__(target_dir)
+        self.failures = failures
+        self.calls = {}
+
+    def upload(self, local_path, folder, public_id):
+        self.calls[public_id] = self.calls.get(public_id, 0) + 1
+        if self.calls[public_id] <= self.failures:
+            raise ConnectionError('upload timed out')
+        return super().upload(local_path, folder, public_id)
+
+
+def test_rerun_skips_unchanged_images_and_reuploads_changed_ones(images, tmp_path, capsys):
+    root = images()
+    manifest = tmp_path / 'manifest.json'
+    uploader = LocalUploader(tmp_path / 'cdn')
+
+    first = run(root, uploader, manifest)
+    (root / 'laptops' / 'P0001.jpg').write_bytes(b'new photo')
+    capsys.readouterr()
+    second = run(root, uploader, manifest)
+
+    assert second == first
+    assert 'uploaded=1 skipped (unchanged)=2 failed=0' in capsys.readouterr().out
+    assert (tmp_path / 'cdn' / 'products' / 'laptops' / 'P0001.jpg').read_bytes() == b'new photo'
+
+
+def test_manifest_entries_are_per_target_and_image(images, tmp_path, capsys):
+    root = images()
+    manifest = tmp_path / 'manifest.json'
+
+    run(root, LocalUploader(tmp_path / 'staging'), manifest)
+    capsys.readouterr()
+    urls = run(root, LocalUploader(tmp_path / 'cdn'), manifest)
+
+    # A different target uploads everything again, including the blog image with P0000's bytes
+    assert 'uploaded=3 skipped (unchanged)=0 failed=0' in capsys.readouterr().out
+    assert urls['products']['P0000'] == (tmp_path / 'cdn' / 'products' / 'laptops' / 'P0000.jpg').as_uri()
+    assert urls['blogs']['1'] == (tmp_path / 'cdn' / 'blogs' / '1.jpg').as_uri()
+
+
+def test_transient_failures_are_retried_with_backoff(images, tmp_path, no_backoff, capsys):
+    uploader = FlakyUploader(tmp_path / 'cdn', failures=2)
+
+    urls = run(images(), uploader, tmp_path / 'manifest.json')
+
+    assert uploader.calls == {'P0000': 3, 'P0001': 3, '1': 3}
+    assert len(urls['products']) == 2
+    # Two waits per image: 1s then 2s, each plus up to 1s of jitter
+    delays = sorted(no_backoff)
+    assert len(delays) == 6
+    assert all(1 <= d <= 2 for d in delays[:3]) and all(2 <= d <= 3 for d in delays[3:])
+    assert 'uploaded=3 skipped (unchanged)=0 failed=0' in capsys.readouterr().out
+
+
+def test_image_failing_every_retry_is_reported_and_not_recorded(images, tmp_path, capsys):
+    manifest = tmp_path / 'manifest.json'
+
+    urls = run(images(), FlakyUploader(tmp_path / 'cdn', failures=3), manifest)
+
+    assert urls == {'products': {}, 'blogs': {}}
+    assert 'uploaded=0 skipped (unchanged)=0 failed=3' in capsys.readouterr().out
+    assert Manifest(manifest).entries == {}
+
+
+def test_urls_are_written_back_to_products_and_blogs(app, catalog, images, tmp_path):
+    catalog(products=2, blogs=1)
+    with app.app_context():
+        blog_id = db.session.scalar(db.select(Blog.blog_id))
+    urls = run(images(blog_id), LocalUploader(tmp_path / 'cdn'), tmp_path / 'manifest.json')
+
+    update_image_urls(app.config['SQLALCHEMY_DATABASE_URI'], urls)
+
+    with app.app_context():
+        assert db.session.get(Product, 'P0000').image_url == urls['products']['P0000']
+        assert db.session.get(Product, 'P0001').image_url == urls['products']['P0001']
+        assert db.session.get(Blog, blog_id).image_url == urls['blogs'][str(blog_id)]
@@ -1,64 +1,239 @@
-#OPTIONAL ONLY (can be uploaded through this, or manually :)) 
+#OPTIONAL ONLY (can be uploaded through this, or manually :))
+#
+# Uploads product/blog images in parallel, skips files whose content is already
+# recorded in the manifest for the same target and image (so a --local-target
+# run never stands in for Cloudinary) and optionally writes the URLs back to
+# products.image_url / blogs.image_url. File names follow the existing
+# convention: <product_id>.jpg for products, <blog_id>.jpg for blogs.
+#
+#   python upload_to_cloudinary.py --images-dir ./images --workers 8 --update-db
+#   python upload_to_cloudinary.py --local-target ./uploaded   # no Cloudinary, for testing
 
-import cloudinary
-import cloudinary.uploader
-from dotenv import load_dotenv
+import argparse
+import hashlib
+import json
 import os
+import random
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
 
 # Load credentials
 load_dotenv()
 
-cloudinary.config(
-    cloud_name=os.getenv('dwtmr4wqt'),
-    api_key=os.getenv('187429251816365'),
-    api_secret=os.getenv('hdOmbVIXoR-LcSR0cG_3Pk8-hE0')
-)
-
 # Path to your local images folder
-LOCAL_IMAGES_PATH = r"C:\Users\aquarius12\Documents\images"
+LOCAL_IMAGES_PATH = os.getenv('LOCAL_IMAGES_PATH', r"C:\Users\aquarius12\Documents\images")
 
-# Categories to upload
+# Categories to upload: local folder -> (Cloudinary folder, table the stem refers to)
 categories = {
-    'laptops': 'products/laptops',
-    'desktops': 'products/desktops',
-    'components': 'products/components',
-    'accessories': 'products/accessories',
-    'speakers': 'products/speakers',
-    'blogs': 'blogs'
+    'laptops': ('products/laptops', 'products'),
+    'desktops': ('products/desktops', 'products'),
+    'components': ('products/components', 'products'),
+    'accessories': ('products/accessories', 'products'),
+    'speakers': ('products/speakers', 'products'),
+    'blogs': ('blogs', 'blogs')
 }
 
-def upload_images(local_folder, cloudinary_folder):
-    """Upload all images from local folder to Cloudinary folder"""
-    folder_path = os.path.join(LOCAL_IMAGES_PATH, local_folder)
-    
-    if not os.path.exists(folder_path):
-        print(f"❌ Folder not found: {folder_path}")
-        return
-    
-    images = [f for f in os.listdir(folder_path) if f.endswith(('.jpg', '.jpeg', '.png'))]
-    
-    print(f"\n📁 Uploading {len(images)} images from {local_folder}...")
-    
-    for image_file in images:
-        local_path = os.path.join(folder_path, image_file)
-        public_id = os.path.splitext(image_file)[0]  # Remove extension
-        
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+class CloudinaryUploader:
+    """Uploads to Cloudinary and returns the secure URL"""
+
+    def __init__(self):
+        import cloudinary
+        import cloudinary.uploader
+        self.target = f"cloudinary:{os.getenv('CLOUDINARY_CLOUD_NAME')}"
+        cloudinary.config(
+            cloud_name=os.getenv('CLOUDINARY_CLOUD_NAME'),
+            api_key=os.getenv('CLOUDINARY_API_KEY'),
+            api_secret=os.getenv('CLOUDINARY_API_SECRET'),
+            secure=True
+        )
+        self._upload = cloudinary.uploader.upload
+
+    def upload(self, local_path, folder, public_id):
+        result = self._upload(
+            local_path,
+            folder=folder,
+            public_id=public_id,
+            overwrite=True,
+            resource_type="image"
+        )
+        return result['secure_url']
+
+
+class LocalUploader:
+    """Stand-in that copies files into a directory; same interface as CloudinaryUploader"""
+
+    def __init__(self, target_dir):
+        self.target_dir = Path(target_dir)
+        self.target = f"local:{self.target_dir.resolve()}"
+
+    def upload(self, local_path, folder, public_id):
+        destination = self.target_dir / folder / (public_id + Path(local_path).suffix)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(local_path, destination)
+        return destination.resolve().as_uri()
+
+
+class Manifest:
+    """Thread-safe record of uploads, saved atomically as JSON
+
+    Keyed by uploader target and image ("<target>|<folder>/<public_id>"); each
+    entry holds the content hash that was uploaded and its secure_url.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.entries = json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    @staticmethod
+    def key(target, folder, public_id):
+        return f"{target}|{folder}/{public_id}"
+
+    def get(self, target, folder, public_id, content_hash):
+        """The recorded entry if this image was uploaded to target with the same content"""
+        with self._lock:
+            entry = self.entries.get(self.key(target, folder, public_id))
+        if entry and entry.get('sha256') == content_hash:
+            return entry
+        return None
+
+    def record(self, target, folder, public_id, content_hash, secure_url):
+        with self._lock:
+            self.entries[self.key(target, folder, public_id)] = {"sha256": content_hash, "secure_url": secure_url}
+
+    def save(self):
+        with self._lock:
+            tmp = self.path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(self.entries, indent=2, sort_keys=True))
+            os.replace(tmp, self.path)
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def upload_with_retry(uploader, local_path, folder, public_id, retries, base_delay=1.0):
+    """Retry transient failures with exponential backoff plus jitter"""
+    for attempt in range(retries + 1):
         try:
-            result = cloudinary.uploader.upload(
-                local_path,
-                folder=cloudinary_folder,
-                public_id=public_id,
-                overwrite=True,
-                resource_type="image"
-            )
-            print(f"  ✅ {image_file} → {result['secure_url']}")
-        except Exception as e:
-            print(f"  ❌ Failed to upload {image_file}: {str(e)}")
-
-# Upload all categories
-print("🚀 Starting Cloudinary upload...\n")
-
-for local_folder, cloudinary_folder in categories.items():
-    upload_images(local_folder, cloudinary_folder)
-
-print("\n✅ Upload complete!")
+            return uploader.upload(local_path, folder, public_id)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(base_delay * (2 ** attempt) + random.uniform(0, base_delay))
+
+
+def collect_jobs(images_path):
+    """List (local_path, cloudinary_folder, public_id, table) for every image"""
+    jobs = []
+    for local_folder, (cloudinary_folder, table) in categories.items():
+        folder_path = os.path.join(images_path, local_folder)
+        if not os.path.exists(folder_path):
+            print(f"❌ Folder not found: {folder_path}")
+            continue
+        for image_file in sorted(os.listdir(folder_path)):
+            if image_file.lower().endswith(IMAGE_EXTENSIONS):
+                public_id = os.path.splitext(image_file)[0]  # Remove extension
+                jobs.append((os.path.join(folder_path, image_file), cloudinary_folder, public_id, table))
+    return jobs
+
+
+def process(job, uploader, manifest, retries):
+    """Upload one image unless the manifest has this content for it on the same target"""
+    local_path, folder, public_id, table = job
+    content_hash = file_hash(local_path)
+    entry = manifest.get(uploader.target, folder, public_id, content_hash)
+    if entry:
+        return job, entry['secure_url'], True
+
+    secure_url = upload_with_retry(uploader, local_path, folder, public_id, retries)
+    manifest.record(uploader.target, folder, public_id, content_hash, secure_url)
+    return job, secure_url, False
+
+
+def upload_images(jobs, uploader, manifest, workers, retries, save_every=25):
+    """Upload in parallel; returns {table: {row id: secure_url}}"""
+    urls = {'products': {}, 'blogs': {}}
+    uploaded = skipped = failed = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(process, job, uploader, manifest, retries): job for job in jobs}
+        for future in as_completed(futures):
+            local_path, _, public_id, table = futures[future]
+            image_file = os.path.basename(local_path)
+            try:
+                _, secure_url, was_skipped = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"  ❌ Failed to upload {image_file}: {str(e)}")
+                continue
+
+            urls[table][public_id] = secure_url
+            if was_skipped:
+                skipped += 1
+            else:
+                uploaded += 1
+                print(f"  ✅ {image_file} → {secure_url}")
+                if uploaded % save_every == 0:
+                    manifest.save()
+
+    manifest.save()
+    print(f"\n📊 uploaded={uploaded} skipped (unchanged)={skipped} failed={failed}")
+    return urls
+
+
+def update_image_urls(database_url, urls):
+    """Write URLs back with one batched UPDATE per table, touching only changed rows"""
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        product_rows = [{"id": k, "url": v} for k, v in urls['products'].items()]
+        if product_rows:
+            conn.execute(text(
+                "UPDATE products SET image_url = :url WHERE product_id = :id AND image_url IS DISTINCT FROM :url"
+            ), product_rows)
+
+        blog_rows = [{"id": int(k), "url": v} for k, v in urls['blogs'].items() if k.isdigit()]
+        if blog_rows:
+            conn.execute(text(
+                "UPDATE blogs SET image_url = :url WHERE blog_id = :id AND image_url IS DISTINCT FROM :url"
+            ), blog_rows)
+    print(f"🗄️  Synced image_url for {len(product_rows)} product(s) and {len(blog_rows)} blog(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload product/blog images to Cloudinary")
+    parser.add_argument('--images-dir', default=LOCAL_IMAGES_PATH)
+    parser.add_argument('--workers', type=int, default=8, help='Parallel uploads')
+    parser.add_argument('--retries', type=int, default=4, help='Retries per image')
+    parser.add_argument('--manifest', default='upload_manifest.json', help='Record of uploaded content and URLs')
+    parser.add_argument('--update-db', action='store_true', help='Write URLs to products/blogs.image_url')
+    parser.add_argument('--local-target', help='Copy into this directory instead of uploading')
+    args = parser.parse_args()
+
+    uploader = LocalUploader(args.local_target) if args.local_target else CloudinaryUploader()
+    manifest = Manifest(args.manifest)
+    jobs = collect_jobs(args.images_dir)
+
+    print(f"🚀 Starting upload of {len(jobs)} images with {args.workers} workers...\n")
+    urls = upload_images(jobs, uploader, manifest, args.workers, args.retries)
+
+    if args.update_db:
+        update_image_urls(os.getenv('DATABASE_URL'), urls)
+
+    print("\n✅ Upload complete!")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,9 +8,17 @@ const api = axios.create({
   },
 });
 
+// Read-your-writes: after a write the API names how many seconds to read from
+// its primary database (replicas may lag). Its cookie isn't sent cross-origin,
+// so the hint goes back as a header.
+let readPrimaryUntil = 0;
+
 api.interceptors.request.use(
   (config) => {
     console.log('API Request:', config.url);
+    if (Date.now() < readPrimaryUntil) {
+      config.headers['X-Read-Primary'] = '1';
+    }
     return config;
   },
   (error) => {
@@ -19,7 +27,13 @@ api.interceptors.request.use(
 );
 
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const seconds = Number(response.headers['x-read-primary-for']);
+    if (seconds > 0) {
+      readPrimaryUntil = Date.now() + seconds * 1000;
+    }
+    return response;
+  },
   (error) => {
     console.error('API Error:', error.response?.data || error.message);
     return Promise.reject(error);
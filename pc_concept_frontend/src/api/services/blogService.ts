@@ -8,6 +8,7 @@ export interface Blog {
   body: string;              // ✅ Correct field name
   conclusion: string;        // ✅ Correct field name
   image_url: string | null;  // ✅ Can be null
+  image_srcset?: string | null;  // Responsive widths (/blogs/latest)
   author: string;            // ✅ Required, not optional
   date_published: string;    // ✅ Correct field name (Date as string from API)
 }
@@ -1,11 +1,13 @@
 import api from '../axiosConfig';
+import type { Review } from './reviewService';
 
 // Product interface for CARD MODE (minimal data)
 export interface ProductCard {
   product_id: string;
   name: string;
   price: number;
-  image_url: string;
+  image_url: string;          // Card-sized variant in card mode
+  image_srcset?: string | null;  // Responsive widths for <img srcSet>
 }
 
 // Specification interface
@@ -83,6 +85,30 @@ export const getProductById = async (productId: string): Promise<Product> => {
   }
 };
 
+// Product detail bundle: product + specifications + review summary in one request
+export interface ProductDetailResponse {
+  product: Product;
+  review_count: number;
+  reviews: Review[];
+}
+
+export const getProductDetail = async (
+  productId: string,
+  reviewsLimit: number = 5
+): Promise<ProductDetailResponse> => {
+  try {
+    const response = await api.get(`/products/${productId}/detail`, {
+      params: {
+        reviews_limit: reviewsLimit
+      }
+    });
+    return response.data;
+  } catch (error) {
+    console.error('Error loading product detail:', error);
+    throw error;
+  }
+};
+
 // Get products by category
 export const getProductsByCategory = async (
   category: string,
@@ -34,6 +34,9 @@ const ProductCard: React.FC<ProductCardProps> = ({ product, onOpenInfo, onWriteR
         {product.image_url ? (
           <img
             src={product.image_url}
+            srcSet={('image_srcset' in product && product.image_srcset) || undefined}
+            sizes="(min-width: 1024px) 25vw, (min-width: 640px) 50vw, 100vw"
+            loading="lazy"
             alt={product.name}
             className="w-full h-full object-cover transition-transform duration-300 ease-in-out group-hover:scale-110"
             onError={(e) => {